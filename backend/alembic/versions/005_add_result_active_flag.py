@@ -0,0 +1,49 @@
+"""Add is_active flag and partial index on active results
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "005"
+down_revision: str = "004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "results",
+        sa.Column("is_active",
+                  sa.Boolean(),
+                  nullable=False,
+                  server_default=sa.true()),
+    )
+
+    # Backfill: results still attributed to a soft-deleted upload are inactive
+    op.execute("""
+        UPDATE results
+        SET is_active = false
+        WHERE upload_id IN (
+            SELECT id FROM upload_logs WHERE deleted_at IS NOT NULL
+        )
+    """)
+
+    op.create_index(
+        "ix_results_active_constituency_votes",
+        "results",
+        ["constituency_id", "votes"],
+        postgresql_where=sa.text("is_active IS true"),
+        sqlite_where=sa.text("is_active IS 1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_results_active_constituency_votes", table_name="results")
+    op.drop_column("results", "is_active")
@@ -0,0 +1,35 @@
+"""Add results_version counter
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "006"
+down_revision: str = "005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "results_version",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    op.execute("INSERT INTO results_version (id, version) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    op.drop_table("results_version")
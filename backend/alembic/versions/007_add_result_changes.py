@@ -0,0 +1,52 @@
+"""Add result_changes change log
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "007"
+down_revision: str = "006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "result_changes",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column(
+            "constituency_id",
+            sa.Integer(),
+            sa.ForeignKey("constituencies.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "upload_id",
+            sa.Integer(),
+            sa.ForeignKey("upload_logs.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index("ix_result_changes_id", "result_changes", ["id"])
+    op.create_index("ix_result_changes_version_constituency",
+                    "result_changes", ["version", "constituency_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_result_changes_version_constituency",
+                  table_name="result_changes")
+    op.drop_index("ix_result_changes_id", table_name="result_changes")
+    op.drop_table("result_changes")
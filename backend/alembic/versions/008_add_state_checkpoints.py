@@ -0,0 +1,52 @@
+"""Add state_checkpoints and latest-history index
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "008"
+down_revision: str = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_result_history_result_latest",
+        "result_history",
+        ["result_id", sa.text("id DESC")],
+        postgresql_include=["upload_id", "votes"],
+    )
+    op.create_table(
+        "state_checkpoints",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "upload_id",
+            sa.Integer(),
+            sa.ForeignKey("upload_logs.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("result_count", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index("ix_state_checkpoints_id", "state_checkpoints", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_state_checkpoints_id", table_name="state_checkpoints")
+    op.drop_table("state_checkpoints")
+    op.drop_index("ix_result_history_result_latest",
+                  table_name="result_history")
@@ -0,0 +1,48 @@
+"""Add result_history_archive
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "009"
+down_revision: str = "008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "result_history_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("first_upload_id", sa.Integer(), nullable=False),
+        sa.Column("last_upload_id", sa.Integer(), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index("ix_result_history_archive_id", "result_history_archive",
+                    ["id"])
+    op.create_index(
+        "ix_result_history_archive_uploads",
+        "result_history_archive",
+        ["first_upload_id", "last_upload_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_result_history_archive_uploads",
+                  table_name="result_history_archive")
+    op.drop_index("ix_result_history_archive_id",
+                  table_name="result_history_archive")
+    op.drop_table("result_history_archive")
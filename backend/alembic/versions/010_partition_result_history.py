@@ -0,0 +1,88 @@
+"""Range-partition result_history by upload_id (PostgreSQL)
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+from app.config import settings
+
+revision: str = "010"
+down_revision: str = "009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# A partitioned table's unique constraints must include the partition key,
+# and upload_id is nullable, so the partitioned table has no primary key;
+# ids still come from the same sequence.
+_COLUMNS = """
+    id integer NOT NULL DEFAULT nextval('result_history_id_seq'),
+    result_id integer NOT NULL
+        REFERENCES results (id) ON DELETE CASCADE,
+    upload_id integer REFERENCES upload_logs (id) ON DELETE SET NULL,
+    votes integer NOT NULL
+        CONSTRAINT ck_history_votes_non_negative CHECK (votes >= 0),
+    created_at timestamp with time zone DEFAULT now()
+"""
+
+
+def _create_indexes() -> None:
+    op.execute("CREATE INDEX ix_result_history_result_id "
+               "ON result_history (result_id)")
+    op.execute("CREATE INDEX ix_result_history_upload_id "
+               "ON result_history (upload_id)")
+    op.execute("CREATE INDEX ix_result_history_result_latest "
+               "ON result_history (result_id, id DESC) "
+               "INCLUDE (upload_id, votes)")
+
+
+def _swap_in(new_table: str) -> None:
+    op.execute(f"INSERT INTO {new_table} "
+               "(id, result_id, upload_id, votes, created_at) "
+               "SELECT id, result_id, upload_id, votes, created_at "
+               "FROM result_history")
+    op.execute(f"ALTER SEQUENCE result_history_id_seq "
+               f"OWNED BY {new_table}.id")
+    op.execute("DROP TABLE result_history")
+    op.execute(f"ALTER TABLE {new_table} RENAME TO result_history")
+    for column in ("result_id", "upload_id"):
+        op.execute(f"ALTER TABLE result_history RENAME CONSTRAINT "
+                   f"{new_table}_{column}_fkey "
+                   f"TO result_history_{column}_fkey")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Fixed from here on: later partitions take their width from these
+    width = settings.HISTORY_PARTITION_UPLOADS
+    last_upload = op.get_bind().exec_driver_sql(
+        "SELECT coalesce(max(id), 0) FROM upload_logs").scalar()
+
+    op.execute(f"CREATE TABLE result_history_partitioned ({_COLUMNS}) "
+               "PARTITION BY RANGE (upload_id)")
+    op.execute("CREATE TABLE result_history_default "
+               "PARTITION OF result_history_partitioned DEFAULT")
+    # Every existing upload, plus the range ingestion writes to next
+    for lower in range(1, last_upload + width + 1, width):
+        op.execute(f"CREATE TABLE result_history_u{lower} "
+                   "PARTITION OF result_history_partitioned "
+                   f"FOR VALUES FROM ({lower}) TO ({lower + width})")
+    _swap_in("result_history_partitioned")
+    _create_indexes()
+    op.execute("CREATE INDEX ix_result_history_id ON result_history (id)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(f"CREATE TABLE result_history_plain ({_COLUMNS}, "
+               "PRIMARY KEY (id))")
+    # Dropping the partitioned table drops every partition with it
+    _swap_in("result_history_plain")
+    op.execute("ALTER TABLE result_history RENAME CONSTRAINT "
+               "result_history_plain_pkey TO result_history_pkey")
+    _create_indexes()
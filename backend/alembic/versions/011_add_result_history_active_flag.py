@@ -0,0 +1,53 @@
+"""Keep history of soft-deleted uploads, flagged inactive
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "011"
+down_revision: str = "010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Adding a column to a partitioned table adds it to every partition
+    op.add_column(
+        "result_history",
+        sa.Column("is_active",
+                  sa.Boolean(),
+                  nullable=False,
+                  server_default=sa.true()),
+    )
+    # Replays only read active rows, so the latest-row index skips the rest
+    op.drop_index("ix_result_history_result_latest",
+                  table_name="result_history")
+    op.create_index(
+        "ix_result_history_result_latest",
+        "result_history",
+        ["result_id", sa.text("id DESC")],
+        postgresql_include=["upload_id", "votes"],
+        postgresql_where=sa.text("is_active IS true"),
+        sqlite_where=sa.text("is_active IS 1"),
+    )
+
+
+def downgrade() -> None:
+    # Without the flag, inactive rows would replay as live ones
+    op.execute("DELETE FROM result_history WHERE is_active IS false")
+    op.drop_index("ix_result_history_result_latest",
+                  table_name="result_history")
+    op.create_index(
+        "ix_result_history_result_latest",
+        "result_history",
+        ["result_id", sa.text("id DESC")],
+        postgresql_include=["upload_id", "votes"],
+    )
+    op.drop_column("result_history", "is_active")
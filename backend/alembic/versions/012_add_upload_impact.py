@@ -0,0 +1,26 @@
+"""Store an impact summary with each upload
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "012"
+down_revision: str = "011"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Filled in by ingestion; earlier uploads keep NULL
+    op.add_column("upload_logs", sa.Column("impact", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("upload_logs", "impact")
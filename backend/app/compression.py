@@ -0,0 +1,288 @@
+"""gzip/brotli response compression.
+
+Cached API bodies and static files are compressed once (per results
+version, or per file modification) and the stored variant is served to
+every client that accepts it. ``CompressionMiddleware`` covers the
+remaining, uncached responses, and ``encoded_stream`` compresses streamed
+bodies chunk by chunk. Brotli is used when the optional ``brotli`` package
+is installed; gzip is always available.
+"""
+import gzip
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# Fast settings for bodies compressed on the request path, maximum
+# compression for bodies compressed once and reused
+DYNAMIC_LEVELS = {GZIP: 6, BROTLI: 5}
+STATIC_LEVELS = {GZIP: 9, BROTLI: 11}
+
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Supported encodings, most preferred first."""
+    return (BROTLI, GZIP) if brotli is not None else (GZIP, )
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Pick the best supported encoding the client accepts, if any."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    content_type = content_type.split(";")[0].strip().lower()
+    return (content_type.startswith(_COMPRESSIBLE_TYPES)
+            or content_type.endswith("+json"))
+
+
+def compress(body: bytes, encoding: str, levels: dict = DYNAMIC_LEVELS
+             ) -> bytes:
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=levels[BROTLI])
+    return gzip.compress(body, compresslevel=levels[GZIP], mtime=0)
+
+
+class EncodedBody:
+    """A response body with its compressed variants, built once.
+
+    Bodies under ``COMPRESSION_MIN_BYTES`` carry no variants. ``len()`` is
+    the combined size of all stored variants, for cache accounting.
+    """
+
+    __slots__ = ("identity", "variants")
+
+    def __init__(self, identity: bytes, levels: dict = DYNAMIC_LEVELS):
+        self.identity = identity
+        self.variants: dict[str, bytes] = {}
+        if len(identity) >= settings.COMPRESSION_MIN_BYTES:
+            for encoding in available_encodings():
+                self.variants[encoding] = compress(identity, encoding,
+                                                   levels)
+
+    def __len__(self) -> int:
+        return len(self.identity) + sum(map(len, self.variants.values()))
+
+    def select(self, accept_encoding: str) -> tuple[bytes, str | None]:
+        encoding = negotiate(accept_encoding) if self.variants else None
+        if encoding is None:
+            return self.identity, None
+        return self.variants[encoding], encoding
+
+
+def encoded_response(request: Request,
+                     body: EncodedBody,
+                     media_type: str = "application/json",
+                     headers: dict | None = None) -> Response:
+    """Serve the variant of ``body`` that best suits the request."""
+    content, encoding = body.select(
+        request.headers.get("accept-encoding", ""))
+    response = Response(content=content,
+                        media_type=media_type,
+                        headers=headers)
+    if body.variants:
+        response.headers.add_vary_header("Accept-Encoding")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def weak_etag(tag: str) -> str:
+    """``ETag`` for an ``encoded_response`` body.
+
+    Weak, since every encoding of the body shares it.
+    """
+    return f'W/"{tag}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's ``If-None-Match`` matches ``etag``, compared
+    weakly as RFC 9110 requires for that header."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque
+               for candidate in header.split(","))
+
+
+def compress_chunks(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body as it is produced."""
+    if encoding == BROTLI:
+        compressor = brotli.Compressor(quality=DYNAMIC_LEVELS[BROTLI])
+        compress_chunk, finish = compressor.process, compressor.finish
+    else:
+        # wbits 31: a gzip header and trailer around the deflate stream
+        compressor = zlib.compressobj(DYNAMIC_LEVELS[GZIP], zlib.DEFLATED, 31)
+        compress_chunk, finish = compressor.compress, compressor.flush
+    for chunk in chunks:
+        compressed = compress_chunk(chunk)
+        if compressed:
+            yield compressed
+    yield finish()
+
+
+def encoded_stream(request: Request,
+                   chunks: Iterable[bytes],
+                   media_type: str,
+                   headers: dict | None = None) -> StreamingResponse:
+    """Stream ``chunks``, compressed on the fly if the client accepts it.
+
+    ``CompressionMiddleware`` leaves streamed bodies alone, so large
+    exports are compressed here instead, without buffering the body.
+    """
+    encoding = negotiate(request.headers.get("accept-encoding", ""))
+    response = StreamingResponse(
+        chunks if encoding is None else compress_chunks(chunks, encoding),
+        media_type=media_type,
+        headers=headers)
+    response.headers.add_vary_header("Accept-Encoding")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+class CompressionMiddleware:
+    """Compress complete, uncompressed responses above a size threshold.
+
+    Streamed bodies (SSE, file chunks) and responses that already carry a
+    ``Content-Encoding`` pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start_message, start = start, None
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (message.get("more_body", False)
+                    or start_message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or len(body) < self.minimum_size
+                    or not is_compressible(headers.get("content-type"))):
+                await send(start_message)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """``StaticFiles`` that serves compressed variants built once per file.
+
+    Variants are compressed at maximum level on first request and reused
+    until the file's modification time or size changes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._variants: dict[str, tuple[tuple, EncodedBody]] = {}
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if (not isinstance(response, FileResponse)
+                or response.status_code != 200
+                or not is_compressible(response.media_type)):
+            return response
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        if negotiate(accept_encoding) is None:
+            return response
+
+        body = await anyio.to_thread.run_sync(self._encoded, response.path,
+                                              response.stat_result)
+        content, encoding = body.select(accept_encoding)
+        if encoding is None:
+            return response
+        headers = {
+            "Content-Encoding": encoding,
+            "Vary": "Accept-Encoding",
+            # Weak: same resource, different bytes than the identity ETag
+            "ETag": f"W/{response.headers['etag']}",
+            "Last-Modified": response.headers["last-modified"],
+        }
+        return Response(content=content,
+                        media_type=response.media_type,
+                        headers=headers)
+
+    def _encoded(self, path: str, stat_result) -> EncodedBody:
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            cached = self._variants.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with open(path, "rb") as f:
+            body = EncodedBody(f.read(), STATIC_LEVELS)
+        with self._lock:
+            self._variants[path] = (key, body)
+        return body
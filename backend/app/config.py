@@ -5,6 +5,41 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "postgresql://postgres:postgres@db:5432/election"
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]
     MAX_UPLOAD_SIZE_BYTES: int = 100 * 1024 * 1024  # 100MB
+    # Versions kept in result_changes before clients must fully resync
+    CHANGE_LOG_RETENTION_VERSIONS: int = 1000
+    # Per-client buffered events on /api/live before the client must resync
+    LIVE_QUEUE_SIZE: int = 16
+    LIVE_HEARTBEAT_SECONDS: float = 15.0
+    # Results version poll interval where LISTEN/NOTIFY is unavailable
+    # (SQLite); 0 disables polling
+    RESULTS_POLL_SECONDS: float = 2.0
+    # Memory-mapped results snapshot shared by all workers on a host
+    # (e.g. /dev/shm/election-results.snapshot); empty disables it
+    RESULTS_SNAPSHOT_PATH: str = ""
+    # Memory cap for pre-encoded read responses, per worker
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64MB
+    # Responses smaller than this are sent uncompressed
+    COMPRESSION_MIN_BYTES: int = 1024
+    # Fingerprinted copies of static/ served at /assets; empty means
+    # backend/static-build
+    STATIC_BUILD_DIR: str = ""
+    # Full results checkpoint every N completed uploads, bounding history
+    # replays for time-travel queries and rollbacks; 0 turns this off
+    CHECKPOINT_EVERY_UPLOADS: int = 20
+    # Also checkpoint the first upload completed this many minutes after the
+    # last checkpoint; 0 turns this off, and both 0 disables checkpoints
+    CHECKPOINT_INTERVAL_MINUTES: int = 10
+    # Archive history rows that repeat the previous votes, up to the latest
+    # checkpoint, this often; 0 disables the background compaction
+    HISTORY_COMPACTION_MINUTES: int = 60
+    # Uploads per result_history partition on PostgreSQL when migration 010
+    # creates them; later partitions keep the width of the existing ones
+    HISTORY_PARTITION_UPLOADS: int = 50
+    # Create the next result_history partitions ahead of uploads this often;
+    # 0 creates them only at startup
+    HISTORY_PARTITION_MINUTES: int = 5
+    # Upload diffs changing more constituencies than this stream as NDJSON
+    UPLOAD_DIFF_STREAM_CONSTITUENCIES: int = 100
 
     model_config = {"env_file": ".env"}
 
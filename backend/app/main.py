@@ -1,15 +1,40 @@
+import asyncio
 from contextlib import asynccontextmanager
-from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
+from app.compression import CompressionMiddleware, PrecompressedStaticFiles
 from app.config import settings
 from app.database import Base, engine
-from app.routers import constituencies, geography, totals, upload
-
-STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+from app.routers import (
+    assets,
+    constituencies,
+    export,
+    geography,
+    live,
+    totals,
+    upload,
+)
+from app.services.compaction_service import history_compactor
+from app.services.geography_index import get_geography_index
+from app.services.history_partitions import history_partitioner
+from app.services.live_service import broadcaster
+from app.services.results_cache import expire_caches
+from app.services.results_watcher import results_watcher
+from app.services.single_flight import read_flight
+from app.services.snapshot_service import snapshot_publisher
+from app.services.version_service import (
+    add_results_listener,
+    remove_results_listener,
+)
+from app.static_assets import (
+    ASSETS_URL_PATH,
+    STATIC_DIR,
+    FingerprintedStaticFiles,
+    asset_build_dir,
+    load_asset_manifest,
+)
 
 
 @asynccontextmanager
@@ -17,7 +42,26 @@ async def lifespan(app: FastAPI):
     # Fallback table creation for development;
     # Alembic handles production migrations
     Base.metadata.create_all(bind=engine)
+    await asyncio.to_thread(load_asset_manifest)
+    await asyncio.to_thread(get_geography_index)
+    await broadcaster.start()
+    add_results_listener(expire_caches)
+    add_results_listener(broadcaster.notify)
+    snapshot_publisher.start()
+    add_results_listener(snapshot_publisher.notify)
+    # Relays versions committed by other workers to the listeners above
+    await results_watcher.start()
+    await history_partitioner.start()
+    await history_compactor.start()
     yield
+    await history_compactor.stop()
+    await history_partitioner.stop()
+    await results_watcher.stop()
+    remove_results_listener(snapshot_publisher.notify)
+    snapshot_publisher.stop()
+    remove_results_listener(broadcaster.notify)
+    remove_results_listener(expire_caches)
+    await broadcaster.stop()
 
 
 app = FastAPI(
@@ -34,16 +78,27 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware,
+                   minimum_size=settings.COMPRESSION_MIN_BYTES)
 
 app.include_router(upload.router)
 app.include_router(constituencies.router)
 app.include_router(totals.router)
 app.include_router(geography.router)
+app.include_router(live.router)
+app.include_router(assets.router)
+app.include_router(export.router)
 
 if STATIC_DIR.is_dir():
-    app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+    app.mount("/static",
+              PrecompressedStaticFiles(directory=str(STATIC_DIR)),
+              name="static")
+    app.mount(ASSETS_URL_PATH,
+              FingerprintedStaticFiles(directory=str(asset_build_dir()),
+                                       check_dir=False),
+              name="assets")
 
 
 @app.get("/api/health")
 def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "coalescing": read_flight.stats()}
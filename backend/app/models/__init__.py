@@ -5,7 +5,21 @@ init config file for models module
 from app.models.constituency import Constituency
 from app.models.region import Region
 from app.models.result import Result
+from app.models.result_change import ResultChange
 from app.models.result_history import ResultHistory
+from app.models.result_history_archive import ResultHistoryArchive
+from app.models.results_version import ResultsVersion
+from app.models.state_checkpoint import StateCheckpoint
 from app.models.upload_log import UploadLog
 
-__all__ = ["Constituency", "Region", "Result", "ResultHistory", "UploadLog"]
+__all__ = [
+    "Constituency",
+    "Region",
+    "Result",
+    "ResultChange",
+    "ResultHistory",
+    "ResultHistoryArchive",
+    "ResultsVersion",
+    "StateCheckpoint",
+    "UploadLog",
+]
@@ -1,12 +1,15 @@
 from sqlalchemy import (
+    Boolean,
     CheckConstraint,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
     func,
+    true,
 )
 from sqlalchemy.orm import relationship
 
@@ -36,6 +39,13 @@ class Result(Base):
         nullable=True,
         index=True,
     )
+    # False once the upload that last wrote this result is soft-deleted.
+    # Maintained by ingestion and soft_delete_upload so reads can filter
+    # on this column instead of joining upload_logs.
+    is_active = Column(Boolean,
+                       nullable=False,
+                       default=True,
+                       server_default=true())
 
     constituency = relationship("Constituency", back_populates="results")
     upload_log = relationship("UploadLog", back_populates="results")
@@ -48,4 +58,11 @@ class Result(Base):
                          "party_code",
                          name="uq_constituency_party"),
         CheckConstraint("votes >= 0", name="ck_votes_non_negative"),
+        Index(
+            "ix_results_active_constituency_votes",
+            "constituency_id",
+            "votes",
+            postgresql_where=is_active.is_(True),
+            sqlite_where=is_active.is_(True),
+        ),
     )
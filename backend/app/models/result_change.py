@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, func
+
+from app.database import Base
+
+
+class ResultChange(Base):
+    """Change log entry: a constituency's results changed at ``version``."""
+    __tablename__ = "result_changes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False)
+    constituency_id = Column(
+        Integer,
+        ForeignKey("constituencies.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    upload_id = Column(
+        Integer,
+        ForeignKey("upload_logs.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("ix_result_changes_version_constituency",
+                            "version", "constituency_id"), )
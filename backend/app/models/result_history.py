@@ -1,10 +1,13 @@
 from sqlalchemy import (
+    Boolean,
     CheckConstraint,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     func,
+    true,
 )
 from sqlalchemy.orm import relationship
 
@@ -12,6 +15,9 @@ from app.database import Base
 
 
 class ResultHistory(Base):
+    # On PostgreSQL, migration 010 range-partitions this table by upload_id
+    # (see history_partitions); it then has no primary key, only an index
+    # on id
     __tablename__ = "result_history"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -28,10 +34,27 @@ class ResultHistory(Base):
         index=True,
     )
     votes = Column(Integer, nullable=False)
+    # False while the upload that wrote this row is soft-deleted; kept so
+    # the upload can be restored. Replays only read active rows.
+    is_active = Column(Boolean,
+                       nullable=False,
+                       default=True,
+                       server_default=true())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     result = relationship("Result", back_populates="history")
     upload_log = relationship("UploadLog", back_populates="result_history")
 
-    __table_args__ = (CheckConstraint("votes >= 0",
-                                      name="ck_history_votes_non_negative"), )
+    __table_args__ = (
+        CheckConstraint("votes >= 0", name="ck_history_votes_non_negative"),
+        # Latest active row per result (rollback, time travel) is an index
+        # seek; on PostgreSQL the included columns make it index-only
+        Index(
+            "ix_result_history_result_latest",
+            result_id,
+            id.desc(),
+            postgresql_include=["upload_id", "votes"],
+            postgresql_where=is_active.is_(True),
+            sqlite_where=is_active.is_(True),
+        ),
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, func
+
+from app.database import Base
+
+
+class ResultHistoryArchive(Base):
+    """A compressed chunk of ``result_history`` rows moved out by compaction.
+
+    ``data`` holds the rows' ids, result ids, upload ids and votes as
+    zlib-compressed int32 columns (see ``compaction_service``). The upload
+    range tells a rollback which chunks it has to restore first.
+    """
+    __tablename__ = "result_history_archive"
+
+    id = Column(Integer, primary_key=True, index=True)
+    first_upload_id = Column(Integer, nullable=False)
+    last_upload_id = Column(Integer, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("ix_result_history_archive_uploads",
+                            first_upload_id, last_upload_id), )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Integer, func
+
+from app.database import Base
+
+
+class ResultsVersion(Base):
+    """Single-row counter bumped in every transaction that changes results.
+
+    Version-keyed caches and change feeds compare against this value. The
+    row lock taken by the increment serialises writers, so versions become
+    visible in commit order.
+    """
+    __tablename__ = "results_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True),
+                        server_default=func.now(),
+                        onupdate=func.now())
@@ -0,0 +1,31 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    func,
+)
+
+from app.database import Base
+
+
+class StateCheckpoint(Base):
+    """Every active result's votes as of an upload.
+
+    ``data`` packs ``(result_id, votes, upload_id)`` triples as native int32
+    (see ``checkpoint_service``), so a whole checkpoint is one row. History
+    replays start from the nearest checkpoint instead of the first upload.
+    """
+    __tablename__ = "state_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(
+        Integer,
+        ForeignKey("upload_logs.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    result_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
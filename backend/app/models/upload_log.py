@@ -17,6 +17,9 @@ class UploadLog(Base):
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
     deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    # What the upload changed when it was ingested (see impact_service);
+    # NULL for failed uploads and those ingested before migration 012
+    impact = Column(JSON, nullable=True)
 
     results = relationship("Result", back_populates="upload_log")
     result_history = relationship("ResultHistory", back_populates="upload_log")
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Response
+
+from app.schemas.assets import AssetManifestResponse
+from app.static_assets import asset_manifest
+
+router = APIRouter(prefix="/api/assets", tags=["assets"])
+
+
+@router.get("/manifest", response_model=AssetManifestResponse)
+def get_asset_manifest(response: Response):
+    """Map static asset names to their fingerprinted, immutable URLs.
+
+    Asset URLs change whenever the file content does, so clients fetch this
+    manifest (which is never cached) and can cache the assets forever.
+    """
+    response.headers["Cache-Control"] = "no-cache"
+    return {"assets": asset_manifest}
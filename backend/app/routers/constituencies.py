@@ -1,25 +1,36 @@
+from datetime import datetime
 from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
+from app.compression import encoded_response, etag_matches, weak_etag
 from app.database import get_db
 from app.schemas.constituency import (
+    ConstituencyChangesResponse,
     ConstituencyListResponse,
     ConstituencyResponse,
     ConstituencySummaryListResponse,
 )
 from app.services.constituency_service import (
+    COLUMNAR_MEDIA_TYPE,
     get_all_constituencies,
     get_all_constituencies_summary,
+    get_columnar_summary,
+    get_constituency_as_of,
     get_constituency_by_id,
+    get_constituency_changes,
 )
+from app.services.history_service import resolve_upload_as_of
+from app.services.response_cache import cached_body, cached_json
+from app.services.version_service import get_results_version
 
 router = APIRouter(prefix="/api/constituencies", tags=["constituencies"])
 
 
 @router.get("", response_model=ConstituencyListResponse)
 def list_constituencies(
+        request: Request,
         search: str | None = Query(None,
                                    description="Search constituency by name"),
         region_ids: str | None = Query(
@@ -36,6 +47,7 @@ def list_constituencies(
 
     Supports pagination, optional name search
     (case-insensitive partial match), region filtering, and sorting.
+    Encoded pages are cached per results version and query.
     """
     # Parse region_ids from comma-separated string
     parsed_region_ids = None
@@ -47,28 +59,126 @@ def list_constituencies(
         except ValueError:
             parsed_region_ids = None
 
-    return get_all_constituencies(db,
-                                  search=search,
-                                  region_ids=parsed_region_ids,
-                                  page=page,
-                                  page_size=page_size,
-                                  sort_by=sort_by,
-                                  sort_dir=sort_dir)
+    version = get_results_version(db)
+    key = ("constituencies", search,
+           tuple(parsed_region_ids) if parsed_region_ids else None, page,
+           page_size, sort_by, sort_dir)
+    body, coalesced = cached_json(
+        version, key, lambda: get_all_constituencies(
+            db,
+            search=search,
+            region_ids=parsed_region_ids,
+            page=page,
+            page_size=page_size,
+            sort_by=sort_by,
+            sort_dir=sort_dir))
+    return encoded_response(request,
+                            body,
+                            headers={"X-Coalesced-Callers": str(coalesced)})
 
 
-@router.get("/summary", response_model=ConstituencySummaryListResponse)
-def list_constituencies_summary(db: Session = Depends(get_db)):
+@router.get(
+    "/summary",
+    response_model=ConstituencySummaryListResponse,
+    responses={200: {
+        "content": {
+            COLUMNAR_MEDIA_TYPE: {}
+        }
+    }},
+)
+def list_constituencies_summary(
+        request: Request,
+        response_format: Literal["objects", "columnar"]
+    | None = Query(None,
+                   alias="format",
+                   description="Payload layout; overrides the Accept header"),
+        db: Session = Depends(get_db),
+):
     """Return all constituencies with id, name, and winning party code.
 
-    Lightweight unpaginated endpoint for the choropleth map.
+    Lightweight unpaginated endpoint for the choropleth map. Pass
+    ``?format=columnar`` or ``Accept: application/vnd.election.columnar+json``
+    for a dictionary-encoded columnar payload, served from a cache keyed by
+    the results version. Object-format bodies are cached the same way and
+    concurrent misses share one computation (see ``X-Coalesced-Callers``).
+    """
+    if response_format is None:
+        accept = request.headers.get("accept", "")
+        response_format = ("columnar"
+                           if COLUMNAR_MEDIA_TYPE in accept else "objects")
+    if response_format == "objects":
+        version = get_results_version(db)
+        body, coalesced = cached_json(
+            version, "summary", lambda: get_all_constituencies_summary(db))
+        return encoded_response(request,
+                                body,
+                                headers={
+                                    "X-Coalesced-Callers": str(coalesced),
+                                    "Vary": "Accept"
+                                })
+
+    version = get_results_version(db)
+    headers = {
+        "ETag": weak_etag(f"summary-columnar-{version}"),
+        "Vary": "Accept"
+    }
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    body, _ = cached_body(version, "summary-columnar",
+                          lambda: get_columnar_summary(db, version))
+    return encoded_response(request,
+                            body,
+                            media_type=COLUMNAR_MEDIA_TYPE,
+                            headers=headers)
+
+
+@router.get("/changes", response_model=ConstituencyChangesResponse)
+def list_constituency_changes(
+        since: int = Query(...,
+                           ge=0,
+                           description="Results version the client holds"),
+        db: Session = Depends(get_db),
+):
+    """Return constituencies whose results changed after ``since``.
+
+    Polling clients send the ``version`` from their previous response. If
+    that version has aged out of the change log, ``resync`` is true and every
+    constituency is returned.
     """
-    return get_all_constituencies_summary(db)
+    return get_constituency_changes(db, since)
 
 
 @router.get("/{constituency_id}", response_model=ConstituencyResponse)
-def get_constituency(constituency_id: int, db: Session = Depends(get_db)):
-    """Get detailed results for a single constituency."""
-    result = get_constituency_by_id(db, constituency_id)
-    if not result:
-        raise HTTPException(status_code=404, detail="Constituency not found")
-    return result
+def get_constituency(
+        constituency_id: int,
+        request: Request,
+        as_of: datetime | None = Query(
+            None, description="Reconstruct the results as of this time"),
+        db: Session = Depends(get_db),
+):
+    """Get detailed results for a single constituency.
+
+    With ``as_of`` the results are rebuilt from the history as they stood
+    after the last upload completed by then (``X-As-Of-Upload``).
+    """
+    upload_id = (resolve_upload_as_of(db, as_of)
+                 if as_of is not None else None)
+
+    def load_constituency() -> dict:
+        if upload_id is None:
+            result = get_constituency_by_id(db, constituency_id)
+        else:
+            result = get_constituency_as_of(db, constituency_id, upload_id)
+        if not result:
+            # Raised inside the flight so a 404 is never cached
+            raise HTTPException(status_code=404,
+                                detail="Constituency not found")
+        return result
+
+    version = get_results_version(db)
+    key = ("constituency", constituency_id, upload_id)
+    body, coalesced = cached_json(version, key, load_constituency)
+    headers = {"X-Coalesced-Callers": str(coalesced)}
+    if upload_id is not None:
+        headers["X-As-Of-Upload"] = str(upload_id)
+    return encoded_response(request, body, headers=headers)
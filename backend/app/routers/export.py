@@ -0,0 +1,64 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from app.compression import encoded_stream
+from app.database import SessionLocal, get_db
+from app.services.change_log_service import (
+    can_replay_since,
+    changed_constituency_ids,
+)
+from app.services.export_service import EXPORT_MEDIA_TYPES, export_results
+from app.services.version_service import get_results_version
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+
+@router.get("/results.{export_format}")
+def export_all_results(
+        export_format: Literal["csv", "ndjson"],
+        request: Request,
+        since_version: int | None = Query(
+            None,
+            ge=0,
+            description="Only constituencies changed after this version"),
+        db: Session = Depends(get_db),
+):
+    """Stream every constituency's active results as CSV or NDJSON.
+
+    For bulk consumers that would otherwise page through
+    ``/api/constituencies``. The export includes every change up to
+    ``X-Results-Version``, read before the rows; sending it back as
+    ``since_version`` exports only the constituencies changed since. When
+    the change log no longer covers ``since_version``, ``X-Resync`` is true
+    and everything is exported.
+
+    Note: Rows are read by the generator's own session because FastAPI
+    cleans up Depends(get_db) before StreamingResponse bodies execute.
+    """
+    version = get_results_version(db)
+    filename = f"results-{version}.{export_format}"
+    headers = {
+        "X-Results-Version": str(version),
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    constituency_ids = None
+    if since_version is not None:
+        resync = not can_replay_since(since_version, version)
+        headers["X-Resync"] = str(resync).lower()
+        if not resync:
+            constituency_ids = changed_constituency_ids(
+                db, since_version, version)
+
+    def chunks():
+        gen_db = SessionLocal()
+        try:
+            yield from export_results(gen_db, export_format, constituency_ids)
+        finally:
+            gen_db.close()
+
+    return encoded_stream(request,
+                          chunks(),
+                          media_type=EXPORT_MEDIA_TYPES[export_format],
+                          headers=headers)
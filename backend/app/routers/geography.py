@@ -1,9 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
+from app.compression import encoded_response, etag_matches, weak_etag
 from app.database import get_db
-from app.schemas.geography import RegionDetail, RegionListResponse
-from app.services.geography_service import get_all_regions, get_region_detail
+from app.schemas.geography import (
+    ConstituencyNeighboursResponse,
+    RegionDetail,
+    RegionListResponse,
+    RegionResultsResponse,
+    ViewportResponse,
+)
+from app.services.geography_service import (
+    get_all_regions,
+    get_constituency_neighbours,
+    get_region_detail,
+    get_region_members,
+    get_region_results,
+    get_viewport_codes,
+)
+from app.services.response_cache import cached_json
+from app.services.topology_service import get_region_topology
+from app.services.version_service import get_results_version
 
 router = APIRouter(prefix="/api/geography", tags=["geography"])
 
@@ -14,6 +33,21 @@ def list_regions(db: Session = Depends(get_db)):
     return get_all_regions(db)
 
 
+@router.get("/regions/results", response_model=RegionResultsResponse)
+def list_region_results(request: Request, db: Session = Depends(get_db)):
+    """Party votes and seats for every region.
+
+    Computed in one grouped query over active results and cached per
+    results version; concurrent misses share one computation.
+    """
+    version = get_results_version(db)
+    body, coalesced = cached_json(version, "region-results",
+                                  lambda: get_region_results(db))
+    return encoded_response(request,
+                            body,
+                            headers={"X-Coalesced-Callers": str(coalesced)})
+
+
 @router.get("/regions/{region_id}", response_model=RegionDetail)
 def get_region(region_id: int, db: Session = Depends(get_db)):
     """Get region detail with all constituencies and pcon24 codes."""
@@ -21,3 +55,59 @@ def get_region(region_id: int, db: Session = Depends(get_db)):
     if not result:
         raise HTTPException(status_code=404, detail="Region not found")
     return result
+
+
+@router.get("/regions/{region_id}/topojson",
+            responses={200: {
+                "content": {
+                    "application/json": {}
+                }
+            }})
+def get_region_topojson(
+        region_id: int,
+        request: Request,
+        resolution: Literal["low", "medium", "high"] = Query(
+            "medium", description="Geometry detail level"),
+        db: Session = Depends(get_db),
+):
+    """TopoJSON of one region's constituencies at the given resolution.
+
+    Slices are cut from the national map, simplified and quantised once,
+    then cached in memory and on disk. The ``ETag`` identifies the slice.
+    """
+    members = get_region_members(db, region_id)
+    if members is None:
+        raise HTTPException(status_code=404, detail="Region not found")
+    key, body = get_region_topology(resolution, *members)
+    headers = {
+        "ETag": weak_etag(f"topology-{key}"),
+        "Cache-Control": "no-cache"
+    }
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return encoded_response(request, body, headers=headers)
+
+
+@router.get("/constituencies/{constituency_id}/neighbours",
+            response_model=ConstituencyNeighboursResponse)
+def get_neighbours(constituency_id: int, db: Session = Depends(get_db)):
+    """Constituencies sharing a border with this one, with its bbox and
+    centroid, from the precomputed geography index."""
+    result = get_constituency_neighbours(db, constituency_id)
+    if not result:
+        raise HTTPException(status_code=404,
+                            detail="Constituency not found")
+    return result
+
+
+@router.get("/viewport", response_model=ViewportResponse)
+def get_viewport(bbox: str = Query(
+    ..., description="Comma-separated west,south,east,north in degrees")):
+    """pcon24 codes of constituencies whose bounds intersect ``bbox``."""
+    try:
+        west, south, east, north = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=422,
+            detail="bbox must be west,south,east,north") from None
+    return get_viewport_codes(west, south, east, north)
@@ -0,0 +1,51 @@
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.services.live_service import broadcaster, format_sse
+
+router = APIRouter(prefix="/api/live", tags=["live"])
+
+
+@router.get("")
+async def live_results():
+    """Push committed result changes over SSE.
+
+    Returns a text/event-stream with events:
+      - hello: the results version the stream starts from
+      - results: new version, changed constituencies with their winners
+        and vote totals, and updated national totals
+      - resync: the client fell behind; refetch full state
+
+    A comment line is sent every LIVE_HEARTBEAT_SECONDS to keep proxies
+    from closing idle connections.
+    """
+    subscription = broadcaster.subscribe()
+
+    async def event_generator():
+        try:
+            yield format_sse("hello",
+                             {"version": broadcaster.published_version})
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(),
+                        timeout=settings.LIVE_HEARTBEAT_SECONDS)
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield message
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
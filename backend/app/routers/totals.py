@@ -1,18 +1,50 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 
+from app.compression import encoded_response
 from app.database import get_db
 from app.schemas.totals import TotalResultsResponse
-from app.services.totals_service import get_total_results
+from app.services.response_cache import cached_json
+from app.services.totals_service import (
+    get_total_results,
+    get_total_results_as_of,
+)
+from app.services.version_service import get_results_version
 
 router = APIRouter(prefix="/api/totals", tags=["totals"])
 
 
 @router.get("", response_model=TotalResultsResponse)
-def total_results(db: Session = Depends(get_db)):
+def total_results(
+        request: Request,
+        as_of_upload: int | None = Query(
+            None,
+            ge=0,
+            description="Reconstruct the results as of this upload ID"),
+        db: Session = Depends(get_db),
+):
     """Get national aggregated election results.
 
     Returns total votes per party and seat (MP) counts based on
-    first-past-the-post in each constituency.
+    first-past-the-post in each constituency. The encoded body is cached
+    per results version and concurrent misses share one computation;
+    ``X-Coalesced-Callers`` reports how many other requests shared it.
+    With ``as_of_upload`` the results are rebuilt from the history as they
+    stood after that upload.
     """
-    return get_total_results(db)
+    version = get_results_version(db)
+    if as_of_upload is not None:
+        body, coalesced = cached_json(
+            version, ("totals-as-of", as_of_upload),
+            lambda: get_total_results_as_of(db, as_of_upload))
+        return encoded_response(request,
+                                body,
+                                headers={
+                                    "X-Coalesced-Callers": str(coalesced),
+                                    "X-As-Of-Upload": str(as_of_upload),
+                                })
+    body, coalesced = cached_json(version, "totals",
+                                  lambda: get_total_results(db))
+    return encoded_response(request,
+                            body,
+                            headers={"X-Coalesced-Callers": str(coalesced)})
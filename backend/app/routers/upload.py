@@ -1,24 +1,48 @@
 import json
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.compression import encoded_response
 from app.config import settings
 from app.database import SessionLocal, get_db
 from app.models.upload_log import UploadLog
 from app.schemas.upload import (
+    BatchDeleteRequest,
+    UploadDiffResponse,
+    UploadImpactResponse,
     UploadListResponse,
     UploadLogEntry,
     UploadResponse,
     UploadStatsResponse,
 )
+from app.services.impact_service import (
+    NDJSON_MEDIA_TYPE,
+    diff_lines,
+    upload_diff,
+)
 from app.services.ingestion import ingest_file, ingest_file_streaming
+from app.services.response_cache import cached_json
 from app.services.upload_service import (
+    get_upload_impact,
     get_upload_stats,
+    restore_upload,
+    restore_upload_streaming,
     soft_delete_upload,
     soft_delete_upload_streaming,
+    soft_delete_uploads,
+    soft_delete_uploads_streaming,
 )
+from app.services.version_service import get_results_version
 
 router = APIRouter(prefix="/api", tags=["upload"])
 
@@ -126,16 +150,61 @@ def upload_stats(db: Session = Depends(get_db)):
     return get_upload_stats(db)
 
 
+@router.get(
+    "/uploads/diff",
+    response_model=UploadDiffResponse,
+    responses={200: {
+        "content": {
+            NDJSON_MEDIA_TYPE: {}
+        }
+    }},
+)
+def diff_uploads(
+        request: Request,
+        from_upload_id: int = Query(..., alias="from", ge=0),
+        to_upload_id: int = Query(..., alias="to", ge=0),
+        db: Session = Depends(get_db),
+):
+    """Vote and seat changes between the results as of two uploads.
+
+    Upload 0 is the state before any upload. Diffs changing more than
+    ``UPLOAD_DIFF_STREAM_CONSTITUENCIES`` constituencies, or requested with
+    ``Accept: application/x-ndjson``, stream as NDJSON: the summary line,
+    then one line per constituency.
+    """
+    wanted = {from_upload_id, to_upload_id} - {0}
+    found = db.query(UploadLog.id).filter(UploadLog.id.in_(wanted)).count()
+    if found != len(wanted):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    diff = upload_diff(db, from_upload_id, to_upload_id)
+    if (len(diff["constituencies"])
+            > settings.UPLOAD_DIFF_STREAM_CONSTITUENCIES
+            or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")):
+        return StreamingResponse(diff_lines(diff),
+                                 media_type=NDJSON_MEDIA_TYPE,
+                                 headers={"Vary": "Accept"})
+    return diff
+
+
 @router.get("/uploads", response_model=UploadListResponse)
 def list_uploads(
         page: int = Query(default=1, ge=1),
         page_size: int = Query(default=20, ge=1, le=100),
         status: str | None = Query(default=None),
         search: str | None = Query(default=None),
+        deleted: bool = Query(default=False),
         db: Session = Depends(get_db),
 ):
-    """List all upload logs, ordered newest first."""
-    query = db.query(UploadLog).filter(UploadLog.deleted_at.is_(None))
+    """List all upload logs, ordered newest first.
+
+    With ``deleted`` set, lists the soft-deleted uploads instead, which can
+    be restored.
+    """
+    query = db.query(UploadLog)
+    if deleted:
+        query = query.filter(UploadLog.deleted_at.is_not(None))
+    else:
+        query = query.filter(UploadLog.deleted_at.is_(None))
 
     if status:
         query = query.filter(UploadLog.status == status)
@@ -154,6 +223,38 @@ def list_uploads(
     )
 
 
+@router.get("/uploads/{upload_id}", response_model=UploadLogEntry)
+def get_upload(upload_id: int, db: Session = Depends(get_db)):
+    """Return one upload log entry, deleted or not, with its impact
+    summary."""
+    upload = db.get(UploadLog, upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+@router.get("/uploads/{upload_id}/impact", response_model=UploadImpactResponse)
+def upload_impact(upload_id: int,
+                  request: Request,
+                  db: Session = Depends(get_db)):
+    """Preview what deleting an upload would change, without deleting it.
+
+    Lists the constituencies that would revert or lose their results and
+    the resulting vote and seat changes per party. Cached per results
+    version like the other reads.
+    """
+    upload = (db.query(UploadLog).filter(
+        UploadLog.id == upload_id, UploadLog.deleted_at.is_(None)).first())
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    version = get_results_version(db)
+    body, coalesced = cached_json(version, ("upload-impact", upload_id),
+                                  lambda: get_upload_impact(db, upload_id))
+    return encoded_response(request,
+                            body,
+                            headers={"X-Coalesced-Callers": str(coalesced)})
+
+
 @router.delete("/uploads/{upload_id}")
 def delete_upload(upload_id: int, db: Session = Depends(get_db)):
     """Soft-delete an upload log entry."""
@@ -205,3 +306,114 @@ def delete_upload_stream(upload_id: int, db: Session = Depends(get_db)):
             "X-Accel-Buffering": "no",
         },
     )
+
+
+@router.post("/uploads/batch-delete")
+def batch_delete_uploads(body: BatchDeleteRequest,
+                         db: Session = Depends(get_db)):
+    """Soft-delete several uploads in one rollback pass.
+
+    All or nothing: if any upload is missing or already deleted, none is.
+    """
+    uploads = soft_delete_uploads(db, body.upload_ids)
+    if uploads is None:
+        raise HTTPException(status_code=404,
+                            detail="One or more uploads not found")
+    return {
+        "message": "Uploads deleted",
+        "upload_ids": sorted(upload.id for upload in uploads),
+    }
+
+
+@router.post("/uploads/batch-delete/stream")
+def batch_delete_uploads_stream(body: BatchDeleteRequest,
+                                db: Session = Depends(get_db)):
+    """Batch soft-delete with SSE progress streaming.
+
+    Returns a text/event-stream with events:
+      - started: upload_ids and total_affected count
+      - progress: rollback percentage
+      - complete: final result with rolled_back count
+      - error: failure details; nothing is deleted
+
+    Uses its own session in the generator, like the streaming delete.
+    """
+    live = db.query(UploadLog.id).filter(UploadLog.id.in_(
+        body.upload_ids), UploadLog.deleted_at.is_(None)).count()
+    if live != len(set(body.upload_ids)):
+        raise HTTPException(status_code=404,
+                            detail="One or more uploads not found")
+
+    def event_generator():
+        gen_db = SessionLocal()
+        try:
+            gen = soft_delete_uploads_streaming(gen_db, body.upload_ids)
+            if gen is None:
+                # Race condition: deleted between check and generator start
+                return
+            for event_data in gen:
+                event_type = event_data.get("event", "message")
+                yield f"event: {event_type}\ndata: {json.dumps(event_data)}\n\n"
+        finally:
+            gen_db.close()
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.post("/uploads/{upload_id}/restore")
+def restore_deleted_upload(upload_id: int, db: Session = Depends(get_db)):
+    """Restore a soft-deleted upload and re-apply its results."""
+    upload = restore_upload(db, upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Deleted upload not found")
+    return {"message": "Upload restored"}
+
+
+@router.post("/uploads/{upload_id}/restore/stream")
+def restore_deleted_upload_stream(upload_id: int,
+                                  db: Session = Depends(get_db)):
+    """Restore with SSE progress streaming.
+
+    Returns a text/event-stream with events:
+      - started: upload_id and total_affected count
+      - progress: restore percentage
+      - complete: final result with restored count
+      - error: failure details
+
+    Uses its own session in the generator, like the streaming delete.
+    """
+    upload = (db.query(UploadLog).filter(
+        UploadLog.id == upload_id, UploadLog.deleted_at.is_not(None)).first())
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Deleted upload not found")
+
+    def event_generator():
+        gen_db = SessionLocal()
+        try:
+            gen = restore_upload_streaming(gen_db, upload_id)
+            if gen is None:
+                # Restored by another request in the meantime
+                return
+            for event_data in gen:
+                event_type = event_data.get("event", "message")
+                yield f"event: {event_type}\ndata: {json.dumps(event_data)}\n\n"
+        finally:
+            gen_db.close()
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
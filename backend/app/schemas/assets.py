@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+
+class AssetManifestResponse(BaseModel):
+    assets: dict[str, str]
@@ -34,3 +34,20 @@ class ConstituencySummary(BaseModel):
 class ConstituencySummaryListResponse(BaseModel):
     total: int
     constituencies: list[ConstituencySummary]
+
+
+class ConstituencyChange(BaseModel):
+    id: int
+    name: str
+    pcon24_code: str | None
+    region_id: int | None
+    region_name: str | None
+    winning_party_code: str | None
+    total_votes: int
+
+
+class ConstituencyChangesResponse(BaseModel):
+    version: int
+    since: int
+    resync: bool
+    constituencies: list[ConstituencyChange]
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from app.schemas.totals import PartyTotals
+
 
 class RegionSummary(BaseModel):
     id: int
@@ -12,6 +14,19 @@ class RegionListResponse(BaseModel):
     regions: list[RegionSummary]
 
 
+class RegionResults(BaseModel):
+    id: int
+    name: str
+    sort_order: int
+    constituency_count: int
+    total_votes: int
+    parties: list[PartyTotals]
+
+
+class RegionResultsResponse(BaseModel):
+    regions: list[RegionResults]
+
+
 class RegionConstituency(BaseModel):
     id: int
     name: str
@@ -24,3 +39,22 @@ class RegionDetail(BaseModel):
     name: str
     pcon24_codes: list[str]
     constituencies: list[RegionConstituency]
+
+
+class ConstituencyNeighbour(BaseModel):
+    id: int
+    name: str
+    pcon24_code: str
+
+
+class ConstituencyNeighboursResponse(BaseModel):
+    id: int
+    name: str
+    pcon24_code: str | None
+    bbox: list[float] | None
+    centroid: list[float] | None
+    neighbours: list[ConstituencyNeighbour]
+
+
+class ViewportResponse(BaseModel):
+    pcon24_codes: list[str]
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UploadResponse(BaseModel):
@@ -13,6 +13,22 @@ class UploadResponse(BaseModel):
     errors: list[Any] | None
 
 
+class PartyChangeSummary(BaseModel):
+    party_code: str
+    party_name: str
+    vote_delta: int
+    seats_gained: int
+    seats_lost: int
+
+
+class UploadImpactSummary(BaseModel):
+    constituencies_touched: int
+    constituencies_changed: int
+    results_changed: int
+    seats_flipped: int
+    parties: list[PartyChangeSummary]
+
+
 class UploadLogEntry(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -26,6 +42,11 @@ class UploadLogEntry(BaseModel):
     started_at: datetime | None
     completed_at: datetime | None
     deleted_at: datetime | None = None
+    impact: UploadImpactSummary | None = None
+
+
+class BatchDeleteRequest(BaseModel):
+    upload_ids: list[int] = Field(min_length=1, max_length=100)
 
 
 class UploadListResponse(BaseModel):
@@ -41,3 +62,54 @@ class UploadStatsResponse(BaseModel):
     failed: int
     success_rate: float
     total_lines_processed: int
+
+
+class ConstituencyImpact(BaseModel):
+    constituency_id: int
+    constituency_name: str
+    change: Literal["reverted", "removed"]
+    winning_party_code_before: str | None
+    winning_party_code_after: str | None
+
+
+class PartyImpact(BaseModel):
+    party_code: str
+    party_name: str
+    vote_delta: int
+    seat_delta: int
+
+
+class UploadImpactResponse(BaseModel):
+    upload_id: int
+    results_reverted: int
+    results_removed: int
+    constituencies_reverted: int
+    constituencies_removed: int
+    seats_flipped: int
+    constituencies: list[ConstituencyImpact]
+    parties: list[PartyImpact]
+
+
+class PartyVoteChange(BaseModel):
+    party_code: str
+    votes_before: int | None
+    votes_after: int | None
+    vote_delta: int
+
+
+class ConstituencyDiff(BaseModel):
+    constituency_id: int
+    constituency_name: str
+    winning_party_code_before: str | None
+    winning_party_code_after: str | None
+    parties: list[PartyVoteChange]
+
+
+class UploadDiffResponse(BaseModel):
+    from_upload_id: int
+    to_upload_id: int
+    constituencies_changed: int
+    results_changed: int
+    seats_flipped: int
+    parties: list[PartyChangeSummary]
+    constituencies: list[ConstituencyDiff]
@@ -0,0 +1,49 @@
+from collections.abc import Iterable
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.result_change import ResultChange
+from app.services.version_service import bump_results_version
+
+
+def record_result_changes(db: Session,
+                          constituency_ids: Iterable[int],
+                          upload_id: int | None = None) -> int:
+    """Bump the results version and log which constituencies changed.
+
+    Runs inside the caller's transaction, so the log rows commit atomically
+    with the result writes. Entries older than the retention window are
+    pruned. Returns the new version.
+    """
+    version = bump_results_version(db)
+    rows = [{
+        "version": version,
+        "constituency_id": constituency_id,
+        "upload_id": upload_id,
+    } for constituency_id in sorted(set(constituency_ids))]
+    if rows:
+        db.execute(insert(ResultChange), rows)
+    db.execute(
+        delete(ResultChange).where(
+            ResultChange.version <= version -
+            settings.CHANGE_LOG_RETENTION_VERSIONS))
+    return version
+
+
+def can_replay_since(since: int, current_version: int) -> bool:
+    """Whether every change after ``since`` is still in the change log."""
+    oldest_replayable = (current_version -
+                         settings.CHANGE_LOG_RETENTION_VERSIONS)
+    return oldest_replayable <= since <= current_version
+
+
+def changed_constituency_ids(db: Session, since: int,
+                             until: int) -> list[int]:
+    """Constituencies with a change in versions ``(since, until]``."""
+    return list(
+        db.execute(
+            select(ResultChange.constituency_id).where(
+                ResultChange.version > since,
+                ResultChange.version <= until).distinct()).scalars())
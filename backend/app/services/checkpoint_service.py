@@ -0,0 +1,117 @@
+"""Full-state checkpoints of the results, taken every few uploads.
+
+Rebuilding the results as of an earlier upload means finding, for every
+result, its latest ``result_history`` row up to that upload. A checkpoint
+stores that answer once, so a rebuild only replays the history written
+since the nearest checkpoint. Rolling back a deleted upload is the same
+rebuild for the results it wrote, as of the upload before it.
+
+Checkpoints are taken every ``CHECKPOINT_EVERY_UPLOADS`` uploads, or on
+the first upload ``CHECKPOINT_INTERVAL_MINUTES`` after the last one, so a
+slow trickle of uploads still bounds the replay.
+
+Soft-deleting an upload flags its history rows inactive, and restoring it
+flags them active again; either changes every state from that upload
+onwards, so checkpoints taken since are discarded.
+"""
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.result import Result
+from app.models.state_checkpoint import StateCheckpoint
+from app.models.upload_log import UploadLog
+
+# Triples of (result_id, votes, upload_id); upload_id 0 stands for NULL
+_TYPECODE = "i"
+
+
+def encode_state(rows) -> bytes:
+    """Pack ``(result_id, votes, upload_id)`` rows."""
+    packed = array(_TYPECODE)
+    for result_id, votes, upload_id in rows:
+        packed.extend((result_id, votes, upload_id or 0))
+    return packed.tobytes()
+
+
+def decode_state(data: bytes) -> dict[int, tuple[int, int | None]]:
+    """Map result_id to ``(votes, upload_id)``."""
+    packed = array(_TYPECODE)
+    packed.frombytes(data)
+    return {
+        packed[i]: (packed[i + 1], packed[i + 2] or None)
+        for i in range(0, len(packed), 3)
+    }
+
+
+def write_checkpoint(db: Session, upload_id: int) -> StateCheckpoint:
+    """Checkpoint the active results in the caller's transaction."""
+    # Sessions don't autoflush; pending result writes must be included
+    db.flush()
+    rows = db.execute(
+        select(Result.id, Result.votes, Result.upload_id).where(
+            Result.is_active.is_(True)).order_by(Result.id)).all()
+    checkpoint = StateCheckpoint(upload_id=upload_id,
+                                 result_count=len(rows),
+                                 data=encode_state(rows))
+    db.add(checkpoint)
+    db.flush()
+    return checkpoint
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive UTC timestamps
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def maybe_checkpoint(db: Session, upload_id: int) -> StateCheckpoint | None:
+    """Checkpoint if ``CHECKPOINT_EVERY_UPLOADS`` uploads have completed
+    since the last checkpoint, counting ``upload_id`` itself, or if
+    ``CHECKPOINT_INTERVAL_MINUTES`` have passed since it was taken."""
+    every = settings.CHECKPOINT_EVERY_UPLOADS
+    interval = settings.CHECKPOINT_INTERVAL_MINUTES
+    if every <= 0 and interval <= 0:
+        return None
+    db.flush()
+    last = db.execute(
+        select(StateCheckpoint).order_by(
+            StateCheckpoint.upload_id.desc()).limit(1)).scalar()
+    since, first_completed = db.execute(
+        select(func.count(UploadLog.id),
+               func.min(UploadLog.completed_at)).where(
+                   UploadLog.id > (last.upload_id if last else 0),
+                   UploadLog.id <= upload_id,
+                   UploadLog.status == "completed",
+                   UploadLog.deleted_at.is_(None),
+               )).one()
+    if since == 0:
+        return None
+    if every > 0 and since >= every:
+        return write_checkpoint(db, upload_id)
+    # Without a checkpoint yet, the clock starts at the first upload
+    started = last.created_at if last else first_completed
+    if interval > 0 and started is not None:
+        elapsed = datetime.now(timezone.utc) - _as_utc(started)
+        if elapsed >= timedelta(minutes=interval):
+            return write_checkpoint(db, upload_id)
+    return None
+
+
+def nearest_checkpoint(db: Session, upload_id: int) -> StateCheckpoint | None:
+    """Latest checkpoint taken at or before ``upload_id``."""
+    return db.execute(
+        select(StateCheckpoint).where(
+            StateCheckpoint.upload_id <= upload_id).order_by(
+                StateCheckpoint.upload_id.desc()).limit(1)).scalar()
+
+
+def invalidate_checkpoints(db: Session, upload_id: int) -> int:
+    """Drop checkpoints that include ``upload_id``; returns how many."""
+    return db.execute(
+        delete(StateCheckpoint).where(
+            StateCheckpoint.upload_id >= upload_id)).rowcount
@@ -0,0 +1,247 @@
+"""Compaction of ``result_history`` into a compressed archive.
+
+Every upload appends a history row for each result it writes, changed or
+not, so refresh cycles leave long runs of identical votes per result. Any
+row that repeats the votes of the row before it is redundant for
+point-in-time queries: the earlier row already gives those votes. Such rows
+are moved, a chunk of results at a time, into ``result_history_archive``.
+
+Rollback still needs them. Deleting upload X restores each result it wrote
+to the latest other write, including which upload made it, and that can be
+an archived row. Rollback reads its starting state from the nearest
+checkpoint before X plus the history since, so only rows from uploads
+at or before the latest checkpoint are compacted. Deleting X also takes
+away the row an archived row after X may repeat, leaving the archived row
+the only record of its votes. Before a rollback every chunk with rows after
+that checkpoint is therefore restored (see ``restore_archived``); the
+checkpoints from X on are gone by then, so compaction only archives them
+again where they still repeat an active row.
+
+Rows of soft-deleted uploads are inactive and never archived, and are not
+the previous row of anything. Restoring upload X can therefore turn an
+archived row after X back into a change, so every chunk with rows after X
+is restored first (see ``restore_archived_after``).
+"""
+import asyncio
+import logging
+import zlib
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.result_history import ResultHistory
+from app.models.result_history_archive import ResultHistoryArchive
+from app.models.state_checkpoint import StateCheckpoint
+from app.services.checkpoint_service import nearest_checkpoint
+
+logger = logging.getLogger(__name__)
+
+# Results whose history is compacted into one archive chunk per transaction
+RESULTS_PER_CHUNK = 1000
+# Rough on-disk size of one result_history row on PostgreSQL: a 48-byte
+# heap tuple with its line pointer, plus entries in its five indexes
+HISTORY_ROW_BYTES = 160
+_TYPECODE = "i"
+_COLUMNS = 4
+
+
+@dataclass
+class CompactionReport:
+    """What one compaction pass moved into the archive."""
+    horizon_upload_id: int = 0
+    rows_archived: int = 0
+    chunks: int = 0
+    archive_bytes: int = 0
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        """Estimated hot-table bytes freed, less the archive written."""
+        return self.rows_archived * HISTORY_ROW_BYTES - self.archive_bytes
+
+
+def encode_history(rows) -> bytes:
+    """Compress ``(id, result_id, upload_id, votes)`` rows column-wise."""
+    columns = [array(_TYPECODE) for _ in range(_COLUMNS)]
+    for row in rows:
+        for column, value in zip(columns, row, strict=True):
+            column.append(value)
+    return zlib.compress(b"".join(column.tobytes() for column in columns))
+
+
+def decode_history(data: bytes) -> list[tuple[int, int, int, int]]:
+    """Rows packed by ``encode_history``."""
+    packed = array(_TYPECODE)
+    packed.frombytes(zlib.decompress(data))
+    count = len(packed) // _COLUMNS
+    columns = [packed[i * count:(i + 1) * count] for i in range(_COLUMNS)]
+    return list(zip(*columns, strict=True))
+
+
+def _redundant_rows(horizon: int, first_result: int, last_result: int):
+    """Active history rows repeating the previous active row's votes for the
+    same result, among uploads up to ``horizon`` and results in the given
+    id range."""
+    ranked = select(
+        ResultHistory.id,
+        ResultHistory.result_id,
+        ResultHistory.upload_id,
+        ResultHistory.votes,
+        func.lag(ResultHistory.votes).over(
+            partition_by=ResultHistory.result_id,
+            order_by=ResultHistory.id).label("previous_votes"),
+    ).where(
+        ResultHistory.result_id.between(first_result, last_result),
+        ResultHistory.is_active.is_(True),
+        or_(ResultHistory.upload_id <= horizon,
+            ResultHistory.upload_id.is_(None)),
+    ).subquery("ranked_history")
+    # Rows without an upload are a result's starting state; never archived
+    return select(ranked.c.id, ranked.c.result_id, ranked.c.upload_id,
+                  ranked.c.votes).where(
+                      ranked.c.votes == ranked.c.previous_votes,
+                      ranked.c.upload_id.is_not(None))
+
+
+def _lock_checkpoint(db: Session, upload_id: int) -> bool:
+    """Lock the checkpoint at ``upload_id``; False if it is gone."""
+    # Deleting an upload at or before the horizon discards this checkpoint,
+    # so holding it keeps that rollback from running mid-chunk; concurrent
+    # compactions queue on it too
+    locked = select(StateCheckpoint.id).where(
+        StateCheckpoint.upload_id == upload_id).with_for_update()
+    return db.execute(locked).scalar() is not None
+
+
+def compact_history(
+        db: Session,
+        results_per_chunk: int = RESULTS_PER_CHUNK) -> CompactionReport:
+    """Archive redundant history up to the latest checkpoint.
+
+    Commits once per chunk of ``results_per_chunk`` results.
+    """
+    horizon = db.execute(select(func.max(StateCheckpoint.upload_id))).scalar()
+    if horizon is None:
+        return CompactionReport()
+    report = CompactionReport(horizon_upload_id=horizon)
+    first, last = db.execute(
+        select(func.min(ResultHistory.result_id),
+               func.max(ResultHistory.result_id)).where(
+                   ResultHistory.upload_id <= horizon)).one()
+    if first is None:
+        return report
+    for start in range(first, last + 1, results_per_chunk):
+        end = start + results_per_chunk - 1
+        if not _lock_checkpoint(db, horizon):
+            db.rollback()
+            break
+        redundant = _redundant_rows(horizon, start, end)
+        rows = db.execute(redundant.order_by(
+            redundant.selected_columns.id)).all()
+        if rows:
+            data = encode_history(rows)
+            uploads = [row.upload_id for row in rows]
+            db.add(
+                ResultHistoryArchive(first_upload_id=min(uploads),
+                                     last_upload_id=max(uploads),
+                                     row_count=len(rows),
+                                     data=data))
+            db.execute(
+                delete(ResultHistory).where(
+                    ResultHistory.id.in_(select(redundant.subquery().c.id))))
+            report.rows_archived += len(rows)
+            report.chunks += 1
+            report.archive_bytes += len(data)
+        db.commit()
+    return report
+
+
+def _unarchive(db: Session, *conditions) -> int:
+    """Move the chunks matching ``conditions`` back into the history."""
+    chunks = db.execute(
+        select(ResultHistoryArchive).where(*conditions)).scalars().all()
+    restored = 0
+    for chunk in chunks:
+        rows = decode_history(chunk.data)
+        db.execute(insert(ResultHistory), [{
+            "id": history_id,
+            "result_id": result_id,
+            "upload_id": row_upload_id,
+            "votes": votes,
+        } for history_id, result_id, row_upload_id, votes in rows])
+        db.delete(chunk)
+        restored += len(rows)
+    return restored
+
+
+def restore_archived(db: Session, upload_id: int) -> int:
+    """Move archived history back for a rollback of ``upload_id``.
+
+    The rollback replays history from the nearest checkpoint before the
+    upload, and a later archived row may repeat votes only the upload wrote,
+    so every chunk with rows after that checkpoint returns to
+    ``result_history``. Returns the rows restored.
+    """
+    checkpoint = nearest_checkpoint(db, upload_id - 1)
+    floor = checkpoint.upload_id if checkpoint is not None else 0
+    return _unarchive(db, ResultHistoryArchive.last_upload_id > floor)
+
+
+def restore_archived_after(db: Session, upload_id: int) -> int:
+    """Move archived history back before restoring deleted ``upload_id``.
+
+    Every chunk with rows from later uploads returns to ``result_history``.
+    Returns the rows restored.
+    """
+    return _unarchive(db, ResultHistoryArchive.last_upload_id > upload_id)
+
+
+class HistoryCompactor:
+    """Background task running ``compact_history`` every
+    ``HISTORY_COMPACTION_MINUTES``."""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if settings.HISTORY_COMPACTION_MINUTES > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def compact(self) -> CompactionReport:
+        db = self.session_factory()
+        try:
+            return compact_history(db)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.HISTORY_COMPACTION_MINUTES * 60)
+            try:
+                report = await asyncio.to_thread(self.compact)
+            except Exception:  # noqa: BLE001
+                logger.exception("History compaction failed")
+                continue
+            if report.rows_archived:
+                logger.info(
+                    "Archived %d history rows up to upload %d in %d chunks "
+                    "(%d bytes, ~%d bytes reclaimed)", report.rows_archived,
+                    report.horizon_upload_id, report.chunks,
+                    report.archive_bytes, report.bytes_reclaimed)
+
+
+history_compactor = HistoryCompactor(SessionLocal)
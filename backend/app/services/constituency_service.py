@@ -1,18 +1,29 @@
-from sqlalchemy import func, or_, select
+import json
+
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session, joinedload, subqueryload
 
 from app.constants import PARTY_CODE_MAP
 from app.models.constituency import Constituency
+from app.models.region import Region
 from app.models.result import Result
-from app.models.upload_log import UploadLog
+from app.services.change_log_service import (
+    can_replay_since,
+    changed_constituency_ids,
+)
+from app.services.history_service import latest_history
+from app.services.result_queries import (
+    active_result_filter,
+    constituency_leaders,
+)
+from app.services.version_service import get_results_version
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.election.columnar+json"
 
 
 def _active_results(results):
     """Exclude results whose upload has been soft-deleted."""
-    return [
-        r for r in results if r.upload_id is None or r.upload_log is None
-        or r.upload_log.deleted_at is None
-    ]
+    return [r for r in results if r.is_active]
 
 
 def _build_sort_clause(sort_by: str | None, sort_dir: str):
@@ -20,24 +31,19 @@ def _build_sort_clause(sort_by: str | None, sort_dir: str):
     is_desc = sort_dir == "desc"
 
     if sort_by == "total_votes":
-        sub = (select(func.coalesce(func.sum(
-            Result.votes), 0)).select_from(Result).outerjoin(
-                UploadLog, Result.upload_id == UploadLog.id).where(
-                    Result.constituency_id == Constituency.id,
-                    or_(Result.upload_id.is_(None),
-                        UploadLog.deleted_at.is_(None)),
-                ).correlate(Constituency).scalar_subquery())
+        sub = (select(func.coalesce(func.sum(Result.votes), 0)).where(
+            Result.constituency_id == Constituency.id,
+            active_result_filter(),
+        ).correlate(Constituency).scalar_subquery())
         return sub.desc() if is_desc else sub.asc()
 
     if sort_by == "winning_party":
         # Subquery: party_code of the result with the most votes
-        sub = (select(Result.party_code).select_from(Result).outerjoin(
-            UploadLog, Result.upload_id == UploadLog.id).where(
-                Result.constituency_id == Constituency.id,
-                or_(Result.upload_id.is_(None),
-                    UploadLog.deleted_at.is_(None)),
-            ).correlate(Constituency).order_by(
-                Result.votes.desc()).limit(1).scalar_subquery())
+        sub = (select(Result.party_code).where(
+            Result.constituency_id == Constituency.id,
+            active_result_filter(),
+        ).correlate(Constituency).order_by(
+            Result.votes.desc()).limit(1).scalar_subquery())
         return sub.desc() if is_desc else sub.asc()
 
     # Default: sort by name
@@ -55,7 +61,7 @@ def get_all_constituencies(
     sort_dir: str = "asc",
 ) -> dict:
     query = db.query(Constituency).options(
-        subqueryload(Constituency.results).joinedload(Result.upload_log),
+        subqueryload(Constituency.results),
         joinedload(Constituency.region),
     )
 
@@ -88,35 +94,37 @@ def get_all_constituencies(
     }
 
 
+def _summary_query(constituency_ids: list[int] | None = None,
+                   with_total_votes: bool = False):
+    """Select the summary columns for constituencies in one statement.
+
+    The winner comes from ``constituency_leaders``, so no ``Result`` or
+    ``Region`` objects are hydrated.
+    """
+    leaders = constituency_leaders()
+    columns = [
+        Constituency.id,
+        Constituency.name,
+        Constituency.pcon24_code,
+        Constituency.region_id,
+        Region.name.label("region_name"),
+        leaders.c.winning_party_code,
+    ]
+    if with_total_votes:
+        columns.append(
+            func.coalesce(leaders.c.total_votes, 0).label("total_votes"))
+    query = (select(*columns).outerjoin(
+        Region, Constituency.region_id == Region.id).outerjoin(
+            leaders, leaders.c.constituency_id == Constituency.id).order_by(
+                Constituency.name.asc()))
+    if constituency_ids is not None:
+        query = query.where(Constituency.id.in_(constituency_ids))
+    return query
+
+
 def get_all_constituencies_summary(db: Session) -> dict:
     """Return all constituencies with just id, name, and winning party code."""
-    constituencies = (db.query(Constituency).options(
-        subqueryload(Constituency.results).joinedload(Result.upload_log),
-        joinedload(Constituency.region),
-    ).order_by(Constituency.name.asc()).all())
-
-    summaries = []
-    for c in constituencies:
-        winner_code = None
-        max_votes = -1
-        is_tied = False
-        for r in _active_results(c.results):
-            if r.votes > max_votes:
-                max_votes = r.votes
-                winner_code = r.party_code
-                is_tied = False
-            elif r.votes == max_votes:
-                is_tied = True
-        if is_tied:
-            winner_code = None
-        summaries.append({
-            "id": c.id,
-            "name": c.name,
-            "pcon24_code": c.pcon24_code,
-            "region_id": c.region_id,
-            "region_name": c.region.name if c.region else None,
-            "winning_party_code": winner_code,
-        })
+    summaries = [row._asdict() for row in db.execute(_summary_query())]
 
     return {
         "total": len(summaries),
@@ -124,9 +132,92 @@ def get_all_constituencies_summary(db: Session) -> dict:
     }
 
 
+def _encode_columnar(rows, version: int) -> bytes:
+    """Dictionary-encode summary rows into parallel arrays.
+
+    Party codes and regions are stored once in lookup tables; the ``winner``
+    and ``region`` columns hold indexes into them (``null`` when absent).
+    """
+    party_codes: list[str] = []
+    party_index: dict[str, int] = {}
+    region_ids: list[int] = []
+    region_names: list[str] = []
+    region_index: dict[int, int] = {}
+    columns: dict[str, list] = {
+        "id": [],
+        "name": [],
+        "pcon24_code": [],
+        "region": [],
+        "winner": [],
+    }
+
+    for row in rows:
+        winner = None
+        if row.winning_party_code is not None:
+            winner = party_index.get(row.winning_party_code)
+            if winner is None:
+                winner = party_index[row.winning_party_code] = len(party_codes)
+                party_codes.append(row.winning_party_code)
+        region = None
+        if row.region_id is not None:
+            region = region_index.get(row.region_id)
+            if region is None:
+                region = region_index[row.region_id] = len(region_ids)
+                region_ids.append(row.region_id)
+                region_names.append(row.region_name)
+        columns["id"].append(row.id)
+        columns["name"].append(row.name)
+        columns["pcon24_code"].append(row.pcon24_code)
+        columns["region"].append(region)
+        columns["winner"].append(winner)
+
+    payload = {
+        "version": version,
+        "total": len(columns["id"]),
+        "party_codes": party_codes,
+        "regions": {
+            "id": region_ids,
+            "name": region_names
+        },
+        **columns,
+    }
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def get_columnar_summary(db: Session, version: int) -> bytes:
+    """Return the columnar summary at results ``version`` encoded as JSON."""
+    return _encode_columnar(db.execute(_summary_query()), version)
+
+
+def get_constituency_changes(db: Session, since: int) -> dict:
+    """Return constituencies whose results changed after version ``since``.
+
+    When the change log no longer covers ``since`` (or ``since`` is ahead of
+    the server), every constituency is returned with ``resync`` set so the
+    client replaces its state instead of patching it.
+    """
+    version = get_results_version(db)
+    resync = not can_replay_since(since, version)
+    if resync:
+        query = _summary_query(with_total_votes=True)
+    elif since == version:
+        query = None
+    else:
+        changed = changed_constituency_ids(db, since, version)
+        query = _summary_query(changed, with_total_votes=True)
+
+    rows = [] if query is None else db.execute(query)
+    return {
+        "version": version,
+        "since": since,
+        "resync": resync,
+        "constituencies": [row._asdict() for row in rows],
+    }
+
+
 def get_constituency_by_id(db: Session, constituency_id: int) -> dict | None:
     constituency = (db.query(Constituency).options(
-        subqueryload(Constituency.results).joinedload(Result.upload_log),
+        subqueryload(Constituency.results),
         joinedload(Constituency.region),
     ).filter(Constituency.id == constituency_id).first())
     if not constituency:
@@ -134,9 +225,35 @@ def get_constituency_by_id(db: Session, constituency_id: int) -> dict | None:
     return _format_constituency(constituency)
 
 
-def _format_constituency(constituency: Constituency) -> dict:
-    """Format a constituency with computed vote percentages and winner."""
-    active = _active_results(constituency.results)
+def get_constituency_as_of(db: Session, constituency_id: int,
+                           upload_id: int) -> dict | None:
+    """A constituency's results as they stood after ``upload_id``.
+
+    Only this constituency's results are replayed, each with one seek on
+    the latest-history index.
+    """
+    constituency = (db.query(Constituency).options(
+        joinedload(Constituency.region)).filter(
+            Constituency.id == constituency_id).first())
+    if not constituency:
+        return None
+    history = latest_history(upload_id,
+                             constituency_id=constituency_id).subquery()
+    rows = db.execute(
+        select(Result.party_code, history.c.votes).join(
+            history, history.c.result_id == Result.id).order_by(
+                Result.id)).all()
+    return _format_constituency(constituency, rows)
+
+
+def _format_constituency(constituency: Constituency, results=None) -> dict:
+    """Format a constituency with computed vote percentages and winner.
+
+    ``results`` defaults to the constituency's active results; any rows
+    with ``party_code`` and ``votes`` may be given instead.
+    """
+    active = (_active_results(constituency.results)
+              if results is None else results)
     total_votes = sum(r.votes for r in active)
 
     parties = []
@@ -0,0 +1,97 @@
+"""Bulk export of the current results as CSV or NDJSON.
+
+One row per active result, and one row with empty party fields for each
+constituency without any, so a consumer replacing a constituency's rows
+sees it emptied. Rows come straight from a server-side cursor
+(``yield_per``) as plain tuples, never ORM objects, and are encoded a batch
+at a time, so memory stays flat however large the export is.
+"""
+import csv
+import io
+from collections.abc import Collection, Iterator
+from typing import Literal
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.constants import PARTY_CODE_MAP
+from app.models.constituency import Constituency
+from app.models.region import Region
+from app.models.result import Result
+from app.services.impact_service import NDJSON_MEDIA_TYPE
+from app.services.response_cache import encode_json
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_COLUMNS = (
+    "constituency_id",
+    "pcon24_code",
+    "constituency_name",
+    "region_name",
+    "party_code",
+    "party_name",
+    "votes",
+)
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": NDJSON_MEDIA_TYPE,
+}
+# Rows fetched from the cursor and encoded per chunk
+EXPORT_BATCH_ROWS = 2000
+
+
+def _export_query(constituency_ids: Collection[int] | None):
+    active = and_(Result.constituency_id == Constituency.id,
+                  Result.is_active.is_(True))
+    query = select(
+        Constituency.id,
+        Constituency.pcon24_code,
+        Constituency.name,
+        Region.name,
+        Result.party_code,
+        Result.votes,
+    ).select_from(Constituency).outerjoin(
+        Region, Region.id == Constituency.region_id).outerjoin(
+            Result, active).order_by(Constituency.id, Result.party_code)
+    if constituency_ids is not None:
+        query = query.where(Constituency.id.in_(constituency_ids))
+    return query
+
+
+def _with_party_names(batch) -> Iterator[tuple]:
+    for (constituency_id, code, name, region, party_code, votes) in batch:
+        party_name = (PARTY_CODE_MAP.get(party_code, party_code)
+                      if party_code is not None else None)
+        yield (constituency_id, code, name, region, party_code, party_name,
+               votes)
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _ndjson_chunk(rows) -> bytes:
+    return b"".join(
+        encode_json(dict(zip(EXPORT_COLUMNS, row))) + b"\n" for row in rows)
+
+
+def export_results(
+        db: Session,
+        export_format: ExportFormat,
+        constituency_ids: Collection[int] | None = None) -> Iterator[bytes]:
+    """Encoded chunks of the export, ordered by constituency and party.
+
+    ``constituency_ids`` limits it to those constituencies. CSV starts with
+    a header row. Every row comes from one statement, so the export is a
+    consistent snapshot even while uploads commit.
+    """
+    encode = _csv_chunk if export_format == "csv" else _ndjson_chunk
+    if export_format == "csv":
+        yield _csv_chunk([EXPORT_COLUMNS])
+    rows = db.connection().execute(
+        _export_query(constituency_ids).execution_options(
+            yield_per=EXPORT_BATCH_ROWS))
+    for batch in rows.partitions():
+        yield encode(_with_party_names(batch))
@@ -0,0 +1,252 @@
+"""Constituency adjacency, bounding boxes and centroids.
+
+Two constituencies are neighbours when their geometries share an arc in the
+national TopoJSON. The index is derived once per source file, stored next to
+the fingerprinted assets and loaded at startup, so neighbour and viewport
+queries only read arrays.
+
+Entries are keyed by ``pcon24_code``. The map's ``pcon19cd`` property holds
+the same codes (see ``itl1_constituencies_config.json``).
+
+File layout (native byte order, every section 8-byte aligned)::
+
+    header        magic, format, constituency count, adjacency length,
+                  code block length
+    codes         ASCII, newline separated, ascending
+    float64[4n]   bounding boxes as west, south, east, north
+    float64[2n]   area-weighted centroids as longitude, latitude
+    int32[n+1]    offsets into the adjacency array
+    int32[m]      neighbour indexes, ascending per constituency
+"""
+import bisect
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+
+from app.services.topology_service import (
+    TOPOLOGY_FILE,
+    decode_arcs,
+    geometry_arcs,
+)
+from app.static_assets import STATIC_DIR, asset_build_dir
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ENGI"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("=4sHxxIII4x")
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (_align(len(data)) - len(data))
+
+
+class GeographyIndex:
+    """Read-only adjacency graph with per-constituency bbox and centroid."""
+
+    def __init__(self, codes: list[str], bboxes: array, centroids: array,
+                 offsets: array, neighbours: array):
+        self.codes = codes
+        self.bboxes = bboxes
+        self.centroids = centroids
+        self.offsets = offsets
+        self.neighbour_indexes = neighbours
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _index(self, code: str) -> int | None:
+        i = bisect.bisect_left(self.codes, code)
+        if i == len(self.codes) or self.codes[i] != code:
+            return None
+        return i
+
+    def __contains__(self, code: str) -> bool:
+        return self._index(code) is not None
+
+    def neighbours(self, code: str) -> list[str]:
+        """Codes of the constituencies sharing a border with ``code``."""
+        i = self._index(code)
+        if i is None:
+            return []
+        indexes = self.neighbour_indexes[self.offsets[i]:self.offsets[i + 1]]
+        return [self.codes[j] for j in indexes]
+
+    def bbox(self, code: str) -> tuple[float, float, float, float] | None:
+        i = self._index(code)
+        if i is None:
+            return None
+        return tuple(self.bboxes[4 * i:4 * i + 4])
+
+    def centroid(self, code: str) -> tuple[float, float] | None:
+        i = self._index(code)
+        if i is None:
+            return None
+        return tuple(self.centroids[2 * i:2 * i + 2])
+
+    def within(self, west: float, south: float, east: float,
+               north: float) -> list[str]:
+        """Codes whose bounding box intersects the given box."""
+        b = self.bboxes
+        return [
+            code for i, code in enumerate(self.codes)
+            if b[4 * i] <= east and b[4 * i + 2] >= west
+            and b[4 * i + 1] <= north and b[4 * i + 3] >= south
+        ]
+
+
+def _ring_points(ring: list[int], arcs: list[list]) -> list:
+    points = []
+    for index in ring:
+        arc = arcs[index] if index >= 0 else arcs[~index][::-1]
+        points.extend(arc if not points else arc[1:])
+    return points
+
+
+def _geometry_rings(geometry: dict) -> list[list[int]]:
+    if geometry["type"] == "Polygon":
+        return geometry["arcs"]
+    if geometry["type"] == "MultiPolygon":
+        return [ring for polygon in geometry["arcs"] for ring in polygon]
+    return []
+
+
+def _centroid(geometry: dict, arcs: list[list],
+              bbox: list[float]) -> tuple[float, float]:
+    # Shoelace over every ring, each polygon's holes subtracted
+    total = cx = cy = 0.0
+    polygons = (geometry["arcs"] if geometry["type"] == "MultiPolygon" else
+                [geometry["arcs"]] if geometry["type"] == "Polygon" else [])
+    for polygon in polygons:
+        for n, ring in enumerate(polygon):
+            points = _ring_points(ring, arcs)
+            area = x = y = 0.0
+            for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                cross = x0 * y1 - x1 * y0
+                area += cross
+                x += (x0 + x1) * cross
+                y += (y0 + y1) * cross
+            sign = 1 if (area >= 0) == (n == 0) else -1
+            if area:
+                total += sign * abs(area)
+                cx += sign * abs(area) * x / (3 * area)
+                cy += sign * abs(area) * y / (3 * area)
+    if total <= 0:
+        return (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2
+    return cx / total, cy / total
+
+
+def build_geography_index(topology: dict) -> GeographyIndex:
+    """Derive the index from a topology's shared arcs."""
+    arcs = decode_arcs(topology)
+    geometries = {}
+    for collection in topology["objects"].values():
+        for geometry in collection.get("geometries", []):
+            code = (geometry.get("properties") or {}).get("pcon19cd")
+            if code and _geometry_rings(geometry):
+                geometries[code] = geometry
+    codes = sorted(geometries)
+
+    owners: dict[int, list[int]] = {}
+    bboxes = array("d")
+    centroids = array("d")
+    for i, code in enumerate(codes):
+        geometry = geometries[code]
+        used = set()
+        for index in geometry_arcs(geometry):
+            used.add(index if index >= 0 else ~index)
+        for index in used:
+            owners.setdefault(index, []).append(i)
+        xs = [p[0] for index in used for p in arcs[index]]
+        ys = [p[1] for index in used for p in arcs[index]]
+        bbox = [min(xs), min(ys), max(xs), max(ys)]
+        bboxes.extend(bbox)
+        centroids.extend(_centroid(geometry, arcs, bbox))
+
+    adjacency = [set() for _ in codes]
+    for sharing in owners.values():
+        for i in sharing:
+            adjacency[i].update(j for j in sharing if j != i)
+    offsets = array("i", [0])
+    neighbours = array("i")
+    for linked in adjacency:
+        neighbours.extend(sorted(linked))
+        offsets.append(len(neighbours))
+    return GeographyIndex(codes, bboxes, centroids, offsets, neighbours)
+
+
+def encode_index(index: GeographyIndex) -> bytes:
+    codes = "\n".join(index.codes).encode()
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(index.codes),
+                          len(index.neighbour_indexes), len(codes))
+    sections = (index.bboxes, index.centroids, index.offsets,
+                index.neighbour_indexes)
+    return b"".join([header, _pad(codes)] +
+                    [_pad(section.tobytes()) for section in sections])
+
+
+def decode_index(data: bytes) -> GeographyIndex:
+    magic, fmt, count, adjacency, codes_size = _HEADER.unpack_from(data)
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        raise ValueError("Not a geography index")
+    offset = _HEADER.size
+    codes = data[offset:offset + codes_size].decode()
+    offset += _align(codes_size)
+
+    def take(typecode: str, length: int) -> array:
+        nonlocal offset
+        section = array(typecode)
+        size = section.itemsize * length
+        section.frombytes(data[offset:offset + size])
+        offset += _align(size)
+        return section
+
+    return GeographyIndex(
+        codes.split("\n") if codes else [],
+        take("d", 4 * count),
+        take("d", 2 * count),
+        take("i", count + 1),
+        take("i", adjacency),
+    )
+
+
+def load_geography_index(source: Path, build_dir: Path) -> GeographyIndex:
+    """Read the index for ``source``, building and storing it if missing."""
+    content = source.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    path = build_dir / f"geography-index.{digest}.bin"
+    try:
+        return decode_index(path.read_bytes())
+    except FileNotFoundError:
+        pass
+    except (ValueError, struct.error):
+        logger.warning("Rebuilding unreadable geography index at %s", path)
+    index = build_geography_index(json.loads(content))
+    build_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(encode_index(index))
+    os.replace(tmp_path, path)
+    return index
+
+
+_index: GeographyIndex | None = None
+_lock = threading.Lock()
+
+
+def get_geography_index() -> GeographyIndex:
+    """The index of the national map, loaded on first use or at startup."""
+    global _index
+    with _lock:
+        if _index is None:
+            _index = load_geography_index(STATIC_DIR / TOPOLOGY_FILE,
+                                          asset_build_dir())
+        return _index
@@ -3,15 +3,14 @@ from sqlalchemy.orm import Session, joinedload
 
 from app.models.constituency import Constituency
 from app.models.region import Region
-from app.models.result import Result
+from app.services.geography_index import get_geography_index
+from app.services.result_queries import region_party_totals
+from app.services.totals_service import build_totals
 
 
 def _active_results(results):
     """Exclude results whose upload has been soft-deleted."""
-    return [
-        r for r in results if r.upload_id is None or r.upload_log is None
-        or r.upload_log.deleted_at is None
-    ]
+    return [r for r in results if r.is_active]
 
 
 def get_all_regions(db: Session) -> dict:
@@ -32,11 +31,32 @@ def get_all_regions(db: Session) -> dict:
     }
 
 
+def get_region_results(db: Session) -> dict:
+    """Party votes and seats for every region.
+
+    One grouped statement over the active results covers all regions;
+    regions without results have an empty party list.
+    """
+    rows_by_region = {}
+    for row in db.execute(region_party_totals()):
+        rows_by_region.setdefault(row.region_id, []).append(
+            (row.party_code, row.total_votes, row.seats))
+    regions = []
+    for region in get_all_regions(db)["regions"]:
+        totals = build_totals(rows_by_region.get(region["id"], []),
+                              region["constituency_count"])
+        regions.append({
+            **region,
+            "total_votes": totals["total_votes"],
+            "parties": totals["parties"],
+        })
+    return {"regions": regions}
+
+
 def get_region_detail(db: Session, region_id: int) -> dict | None:
     region = (db.query(Region).options(
         joinedload(Region.constituencies).subqueryload(
-            Constituency.results).joinedload(
-                Result.upload_log)).filter(Region.id == region_id).first())
+            Constituency.results)).filter(Region.id == region_id).first())
     if not region:
         return None
 
@@ -73,3 +93,58 @@ def get_region_detail(db: Session, region_id: int) -> dict | None:
         "pcon24_codes": pcon24_codes,
         "constituencies": constituencies,
     }
+
+
+def get_region_members(db: Session,
+                       region_id: int) -> tuple[set[str], set[str]] | None:
+    """pcon24 codes and names of a region's constituencies."""
+    if db.get(Region, region_id) is None:
+        return None
+    rows = (db.query(Constituency.pcon24_code, Constituency.name).filter(
+        Constituency.region_id == region_id).all())
+    return {r.pcon24_code for r in rows if r.pcon24_code}, {r.name for r in rows}
+
+
+def get_constituency_neighbours(db: Session,
+                                constituency_id: int) -> dict | None:
+    """A constituency's bounding box, centroid and bordering constituencies.
+
+    Adjacency comes from the precomputed geography index; only the
+    neighbours' names are read from the database.
+    """
+    constituency = db.get(Constituency, constituency_id)
+    if constituency is None:
+        return None
+    index = get_geography_index()
+    code = constituency.pcon24_code
+    neighbour_codes = index.neighbours(code) if code else []
+    neighbours = []
+    if neighbour_codes:
+        rows = (db.query(Constituency.id, Constituency.name,
+                         Constituency.pcon24_code).filter(
+                             Constituency.pcon24_code.in_(neighbour_codes)).
+                order_by(Constituency.name).all())
+        neighbours = [{
+            "id": r.id,
+            "name": r.name,
+            "pcon24_code": r.pcon24_code,
+        } for r in rows]
+    bbox = index.bbox(code) if code else None
+    centroid = index.centroid(code) if code else None
+    return {
+        "id": constituency.id,
+        "name": constituency.name,
+        "pcon24_code": code,
+        "bbox": list(bbox) if bbox else None,
+        "centroid": list(centroid) if centroid else None,
+        "neighbours": neighbours,
+    }
+
+
+def get_viewport_codes(west: float, south: float, east: float,
+                       north: float) -> dict:
+    """pcon24 codes of the constituencies visible in a lon/lat box."""
+    return {
+        "pcon24_codes":
+        get_geography_index().within(west, south, east, north)
+    }
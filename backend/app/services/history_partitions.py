@@ -0,0 +1,244 @@
+"""Range partitions of ``result_history`` by upload on PostgreSQL.
+
+Migration 010 partitions the table by ``RANGE (upload_id)``, each partition
+holding ``HISTORY_PARTITION_UPLOADS`` consecutive uploads, with a default
+partition for rows without an upload. Partitions created later keep the
+width of the existing ones, read from their bounds. Queries filtering on
+``upload_id`` (a rollback's rows for one upload, the history replayed since
+a checkpoint) then only scan the partitions in range. Deletes, restores and
+compaction still work row by row: a deleted upload's rows are flagged
+inactive and kept for a restore, and compaction archives single rows, so no
+partition is ever detached or dropped.
+
+``CREATE TABLE ... PARTITION OF`` locks the whole parent table, so it never
+runs on the upload path. A background task (``history_partitioner``) keeps
+``PARTITIONS_AHEAD`` partitions beyond the one holding the latest upload,
+at startup and every ``HISTORY_PARTITION_MINUTES``. It takes its locks in
+the order uploads do and gives up after ``_LOCK_TIMEOUT`` rather than
+queueing uploads behind it; the next pass tries again. Rows for an
+upload without a partition land in the default partition, which stays
+correct but keeps that range from being partitioned: such a range is
+skipped, and the ranges after it are still created, each under its own
+savepoint.
+
+Everywhere else (SQLite, or a database created by ``create_all`` without
+the migration) the table is a plain one and these helpers do nothing.
+"""
+import asyncio
+import logging
+import re
+import threading
+from collections.abc import Callable
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.upload_log import UploadLog
+
+logger = logging.getLogger(__name__)
+
+PARTITIONS_AHEAD = 2
+# Serialises partition creation across workers
+_PARTITION_LOCK_KEY = 0x52485054  # "RHPT"
+# Below PostgreSQL's default deadlock_timeout, so a pass blocked by uploads
+# gives up before the uploads' deadlock checks run
+_LOCK_TIMEOUT = "500ms"
+
+# A range partition's bound, as pg_get_expr renders it
+_RANGE_BOUND = re.compile(r"FROM \('?(\d+)'?\) TO \('?(\d+)'?\)")
+
+_state_lock = threading.Lock()
+_partitioned: dict[str, bool] = {}
+
+
+def partition_bounds(upload_id: int,
+                     width: int | None = None) -> tuple[int, int]:
+    """``[lower, upper)`` upload ids of the partition holding ``upload_id``,
+    ``width`` uploads wide (by default ``HISTORY_PARTITION_UPLOADS``)."""
+    width = width or settings.HISTORY_PARTITION_UPLOADS
+    lower = (upload_id - 1) // width * width + 1
+    return lower, lower + width
+
+
+def partition_name(upload_id: int, width: int | None = None) -> str:
+    """Table name of the partition holding ``upload_id``."""
+    return _name(partition_bounds(upload_id, width)[0])
+
+
+def _name(lower: int) -> str:
+    return f"result_history_u{lower}"
+
+
+def is_partitioned(bind: Engine | Connection) -> bool:
+    """Whether ``result_history`` is a partitioned table on ``bind``."""
+    if bind.dialect.name != "postgresql":
+        return False
+    engine = bind.engine
+    key = str(engine.url)
+    with _state_lock:
+        if key in _partitioned:
+            return _partitioned[key]
+    with engine.connect() as conn:
+        partitioned = conn.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                 "WHERE partrelid = 'result_history'::regclass)")).scalar()
+    with _state_lock:
+        _partitioned[key] = partitioned
+    return partitioned
+
+
+def _existing_ranges(conn: Connection) -> dict[str, tuple[int, int]]:
+    """``[lower, upper)`` of each range partition, by table name."""
+    rows = conn.execute(
+        text("SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+             "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+             "WHERE i.inhparent = 'result_history'::regclass"))
+    ranges = {}
+    for name, bound in rows:
+        match = _RANGE_BOUND.search(bound)
+        if match is not None:
+            ranges[name] = (int(match[1]), int(match[2]))
+    return ranges
+
+
+def partition_width(ranges: dict[str, tuple[int, int]]) -> int:
+    """Uploads per partition, from the latest existing range partition.
+
+    ``HISTORY_PARTITION_UPLOADS`` only applies before there is one; once
+    migration 010 has run, a different setting would give ranges that
+    overlap the existing ones, so it is reported and ignored.
+    """
+    width = settings.HISTORY_PARTITION_UPLOADS
+    if not ranges:
+        return width
+    lower, upper = max(ranges.values())
+    if upper - lower != width:
+        logger.error(
+            "HISTORY_PARTITION_UPLOADS is %d but result_history partitions "
+            "hold %d uploads each; creating partitions of %d", width,
+            upper - lower, upper - lower)
+    return upper - lower
+
+
+def _in_default(conn: Connection, lower: int, upper: int) -> bool:
+    """Whether the default partition holds rows of uploads in the range."""
+    return conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM result_history_default "
+             "WHERE upload_id >= :lower AND upload_id < :upper)"), {
+                 "lower": lower,
+                 "upper": upper
+             }).scalar()
+
+
+def _create_partition(conn: Connection, lower: int, upper: int) -> None:
+    conn.execute(
+        text(f"CREATE TABLE IF NOT EXISTS {_name(lower)} "
+             f"PARTITION OF result_history "
+             f"FOR VALUES FROM ({lower}) TO ({upper})"))
+
+
+def _create_partitions(conn: Connection,
+                       ranges: list[tuple[int, int]]) -> list[str]:
+    """Create a partition for each range the default partition has no rows
+    of, each under a savepoint so a failure leaves the others to be
+    created. Returns the partitions created."""
+    created = []
+    for lower, upper in ranges:
+        if _in_default(conn, lower, upper):
+            logger.warning(
+                "Uploads %d-%d have history in result_history_default; "
+                "leaving that range unpartitioned", lower, upper - 1)
+            continue
+        try:
+            with conn.begin_nested():
+                _create_partition(conn, lower, upper)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to create result_history partition %s",
+                             _name(lower))
+            continue
+        created.append(_name(lower))
+    return created
+
+
+def ensure_history_partitions(db: Session) -> list[str]:
+    """Create any missing partitions up to ``PARTITIONS_AHEAD`` past the
+    latest upload.
+
+    Runs in a transaction of its own and returns the partitions created.
+    Raises if the parent table's lock is not granted within
+    ``_LOCK_TIMEOUT``; the next pass tries again.
+    """
+    bind = db.get_bind()
+    if not is_partitioned(bind):
+        return []
+    latest = db.scalar(select(func.coalesce(func.max(UploadLog.id), 0)))
+    with bind.engine.begin() as conn:
+        existing = _existing_ranges(conn)
+        width = partition_width(existing)
+        wanted = [
+            partition_bounds(latest + 1 + ahead * width, width)
+            for ahead in range(PARTITIONS_AHEAD + 1)
+        ]
+        wanted = [(lower, upper) for lower, upper in wanted
+                  if _name(lower) not in existing]
+        if not wanted:
+            return []
+        conn.execute(select(func.pg_advisory_xact_lock(_PARTITION_LOCK_KEY)))
+        conn.execute(text(f"SET LOCAL lock_timeout = '{_LOCK_TIMEOUT}'"))
+        # The new partition's foreign keys lock the tables they reference;
+        # take every lock up front, in the order uploads write the tables
+        conn.execute(
+            text(
+                "LOCK TABLE upload_logs, results IN SHARE ROW EXCLUSIVE MODE"))
+        conn.execute(
+            text("LOCK TABLE result_history IN ACCESS EXCLUSIVE MODE"))
+        return _create_partitions(conn, wanted)
+
+
+class HistoryPartitioner:
+    """Background task running ``ensure_history_partitions`` at startup and
+    every ``HISTORY_PARTITION_MINUTES``, or only at startup when that is 0."""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def ensure(self) -> list[str]:
+        db = self.session_factory()
+        try:
+            return ensure_history_partitions(db)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                created = await asyncio.to_thread(self.ensure)
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to create result_history partitions")
+            else:
+                if created:
+                    logger.info("Created result_history partitions %s",
+                                ", ".join(created))
+            if settings.HISTORY_PARTITION_MINUTES <= 0:
+                return
+            await asyncio.sleep(settings.HISTORY_PARTITION_MINUTES * 60)
+
+
+history_partitioner = HistoryPartitioner(SessionLocal)
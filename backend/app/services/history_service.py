@@ -0,0 +1,189 @@
+"""Point-in-time reconstruction of results from ``result_history``.
+
+Every upload appends one history row per result it writes, and deleting an
+upload flags its rows inactive (restoring it flags them active again), so
+the results as of upload N are each result's latest active row from uploads
+up to N. ``ix_result_history_result_latest``
+(``result_id, id DESC``) makes that a seek per result. Full-state rebuilds
+and rollbacks start from the nearest checkpoint and only replay rows
+written after it.
+"""
+from collections.abc import Collection
+from datetime import datetime
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.result import Result
+from app.models.result_history import ResultHistory
+from app.models.upload_log import UploadLog
+from app.services.checkpoint_service import decode_state, nearest_checkpoint
+
+# Upload diffs seek results one by one when there are fewer than
+# 1/SEEK_SHARE as many as the nearest checkpoint holds
+SEEK_SHARE = 10
+
+
+def latest_history(upload_id: int,
+                   after_upload_id: int | None = None,
+                   constituency_id: int | None = None,
+                   result_ids=None):
+    """Latest active history row per result among uploads up to
+    ``upload_id``.
+
+    Columns: ``result_id``, ``votes`` and ``upload_id``. With
+    ``after_upload_id`` only rows from later uploads are considered;
+    otherwise rows without an upload count as the starting state.
+    ``result_ids`` is a select of ids to restrict the rows to.
+    """
+    conditions = [ResultHistory.upload_id <= upload_id]
+    if after_upload_id is None:
+        conditions = [or_(conditions[0], ResultHistory.upload_id.is_(None))]
+    else:
+        conditions.append(ResultHistory.upload_id > after_upload_id)
+    conditions.append(ResultHistory.is_active.is_(True))
+    if constituency_id is not None:
+        conditions.append(
+            ResultHistory.result_id.in_(
+                select(Result.id).where(
+                    Result.constituency_id == constituency_id)))
+    if result_ids is not None:
+        conditions.append(ResultHistory.result_id.in_(result_ids))
+    ranked = select(
+        ResultHistory.result_id,
+        ResultHistory.votes,
+        ResultHistory.upload_id,
+        func.row_number().over(
+            partition_by=ResultHistory.result_id,
+            order_by=ResultHistory.id.desc()).label("recency"),
+    ).where(*conditions).subquery("ranked_history")
+    return select(ranked.c.result_id, ranked.c.votes,
+                  ranked.c.upload_id).where(ranked.c.recency == 1)
+
+
+def results_state_as_of(db: Session, upload_id: int) -> dict[int, int]:
+    """Votes per result_id as of ``upload_id``."""
+    checkpoint = nearest_checkpoint(db, upload_id)
+    if checkpoint is None:
+        state = {}
+        delta = latest_history(upload_id)
+    else:
+        state = {
+            result_id: votes
+            for result_id, (votes, _) in decode_state(checkpoint.data).items()
+        }
+        delta = latest_history(upload_id, after_upload_id=checkpoint.upload_id)
+    for row in db.execute(delta):
+        state[row.result_id] = row.votes
+    return state
+
+
+def _replay_values(db: Session, written, as_of: int,
+                   floor: int) -> dict[int, tuple[int, int | None]]:
+    """Latest ``(votes, upload_id)`` as of ``as_of`` for the results in
+    ``written``, from the nearest checkpoint at or before ``floor``."""
+    checkpoint = nearest_checkpoint(db, floor)
+    if checkpoint is None:
+        values = {}
+        delta = latest_history(as_of, result_ids=written)
+    else:
+        affected = set(db.execute(written).scalars())
+        values = {
+            result_id: value
+            for result_id, value in decode_state(checkpoint.data).items()
+            if result_id in affected
+        }
+        delta = latest_history(as_of,
+                               after_upload_id=checkpoint.upload_id,
+                               result_ids=written)
+    for row in db.execute(delta):
+        values[row.result_id] = (row.votes, row.upload_id)
+    return values
+
+
+def previous_values(db: Session,
+                    upload_id: int) -> dict[int, tuple[int, int | None]]:
+    """What the results last written by ``upload_id`` held before it.
+
+    Maps result_id to ``(votes, upload_id)``; results the upload created
+    are absent. Rollback restores these when the upload is deleted.
+    """
+    # An upload is the latest writer of these, so their earlier state is
+    # the state as of the upload before it
+    written = select(Result.id).where(Result.upload_id == upload_id)
+    return _replay_values(db, written, upload_id - 1, upload_id - 1)
+
+
+def surviving_values(
+        db: Session,
+        upload_ids: Collection[int]) -> dict[int, tuple[int, int | None]]:
+    """What the results last written by any of ``upload_ids`` hold once
+    all of them are deleted.
+
+    Their history must already be inactive. Maps result_id to ``(votes,
+    upload_id)``; results only these uploads wrote are absent. Every value
+    comes from one replay, starting at the checkpoint before the first.
+    """
+    written = select(Result.id).where(Result.upload_id.in_(upload_ids))
+    return _replay_values(db, written, max(upload_ids), min(upload_ids) - 1)
+
+
+def votes_between(db: Session, result_ids, from_upload_id: int,
+                  to_upload_id: int) -> tuple[dict[int, int], dict[int, int]]:
+    """Votes per result_id as of two uploads, ``from_upload_id`` first.
+
+    ``result_ids`` is a select of the results to compare, which must cover
+    every result with active history between the two uploads. Only the
+    earlier state is replayed, from the nearest checkpoint; the later one
+    overlays the rows written in between, read by a range scan on
+    ``upload_id``. Results without a value at one of the two uploads are
+    absent from that side.
+    """
+    low, high = sorted((from_upload_id, to_upload_id))
+    wanted = set(db.execute(result_ids).scalars())
+    checkpoint = nearest_checkpoint(db, low)
+    if checkpoint is None:
+        before = {}
+        delta = latest_history(low, result_ids=result_ids)
+    else:
+        before = {
+            result_id: votes
+            for result_id, (votes, _) in decode_state(checkpoint.data).items()
+            if result_id in wanted
+        }
+        # A few results are cheaper to seek one by one, through their whole
+        # history; many are cheaper to pick out of a range scan of every
+        # row since the checkpoint
+        few = len(wanted) * SEEK_SHARE < checkpoint.result_count
+        delta = latest_history(low,
+                               after_upload_id=checkpoint.upload_id,
+                               result_ids=result_ids if few else None)
+    for row in db.execute(delta):
+        if row.result_id in wanted:
+            before[row.result_id] = row.votes
+    after = dict(before)
+    if high > low:
+        for row in db.execute(latest_history(high, after_upload_id=low)):
+            if row.result_id in wanted:
+                after[row.result_id] = row.votes
+    if from_upload_id > to_upload_id:
+        return after, before
+    return before, after
+
+
+def set_history_active(db: Session, upload_ids: Collection[int],
+                       active: bool) -> None:
+    """Flag the history rows of some uploads active or inactive."""
+    db.execute(
+        update(ResultHistory).where(
+            ResultHistory.upload_id.in_(upload_ids)).values(is_active=active))
+
+
+def resolve_upload_as_of(db: Session, as_of: datetime) -> int:
+    """Latest live upload completed at or before ``as_of``; 0 if none."""
+    return db.execute(
+        select(func.max(UploadLog.id)).where(
+            UploadLog.status == "completed",
+            UploadLog.deleted_at.is_(None),
+            UploadLog.completed_at <= as_of,
+        )).scalar() or 0
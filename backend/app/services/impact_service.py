@@ -0,0 +1,220 @@
+"""Vote and seat changes between two states of some constituencies.
+
+The delete preview, the summary stored with each upload and the diff
+between two uploads all compare the votes per party of the constituencies
+involved, before and after, and derive per-party vote deltas and the seats
+that change hands.
+"""
+from collections.abc import Collection, Iterator
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.constants import PARTY_CODE_MAP
+from app.models.constituency import Constituency
+from app.models.result import Result
+from app.models.result_history import ResultHistory
+from app.services.history_service import votes_between
+from app.services.response_cache import encode_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+VotesByConstituency = dict[int, dict[str, int]]
+# (constituency_id, winner before, winner after)
+WinnerChange = tuple[int, str | None, str | None]
+
+
+@dataclass
+class VoteChanges:
+    """What differs between two states of the same constituencies."""
+    # Constituencies where any votes changed
+    constituencies: list[WinnerChange] = field(default_factory=list)
+    vote_deltas: dict[str, int] = field(default_factory=dict)
+    seats_gained: dict[str, int] = field(default_factory=dict)
+    seats_lost: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def seats_flipped(self) -> int:
+        return sum(before != after for _, before, after in self.constituencies)
+
+    def seat_delta(self, party_code: str) -> int:
+        return (self.seats_gained.get(party_code, 0) -
+                self.seats_lost.get(party_code, 0))
+
+    def party_codes(self) -> list[str]:
+        """Parties whose votes or seats changed."""
+        voted = {code for code, delta in self.vote_deltas.items() if delta}
+        return sorted(voted | self.seats_gained.keys()
+                      | self.seats_lost.keys())
+
+
+def sole_winner(votes: dict[str, int]) -> str | None:
+    """Party with the most votes; None when first place is tied or empty."""
+    if not votes:
+        return None
+    top = max(votes.values())
+    leaders = [code for code, count in votes.items() if count == top]
+    return leaders[0] if len(leaders) == 1 else None
+
+
+def active_votes(db: Session,
+                 constituency_ids: Collection[int]) -> VotesByConstituency:
+    """Active votes per party of each constituency, in one query."""
+    votes: VotesByConstituency = {
+        constituency_id: {}
+        for constituency_id in constituency_ids
+    }
+    if not votes:
+        return votes
+    rows = db.execute(
+        select(Result.constituency_id, Result.party_code, Result.votes).where(
+            Result.constituency_id.in_(votes),
+            Result.is_active.is_(True),
+        ))
+    for constituency_id, party_code, count in rows:
+        votes[constituency_id][party_code] = count
+    return votes
+
+
+def compare_votes(before: VotesByConstituency,
+                  after: VotesByConstituency) -> VoteChanges:
+    """Vote deltas and seat changes from ``before`` to ``after``."""
+    changes = VoteChanges()
+    for constituency_id, old in before.items():
+        new = after.get(constituency_id, {})
+        if new == old:
+            continue
+        deltas = changes.vote_deltas
+        for code in old.keys() | new.keys():
+            delta = new.get(code, 0) - old.get(code, 0)
+            deltas[code] = deltas.get(code, 0) + delta
+        old_winner, new_winner = sole_winner(old), sole_winner(new)
+        if old_winner != new_winner:
+            if old_winner is not None:
+                changes.seats_lost[old_winner] = (
+                    changes.seats_lost.get(old_winner, 0) + 1)
+            if new_winner is not None:
+                changes.seats_gained[new_winner] = (
+                    changes.seats_gained.get(new_winner, 0) + 1)
+        changes.constituencies.append(
+            (constituency_id, old_winner, new_winner))
+    return changes
+
+
+def _party_changes(changes: VoteChanges) -> list[dict]:
+    """Per-party vote deltas and seats, largest net seat change first."""
+    parties = [{
+        "party_code": code,
+        "party_name": PARTY_CODE_MAP.get(code, code),
+        "vote_delta": changes.vote_deltas.get(code, 0),
+        "seats_gained": changes.seats_gained.get(code, 0),
+        "seats_lost": changes.seats_lost.get(code, 0),
+    } for code in changes.party_codes()]
+    parties.sort(key=lambda p: (-abs(p["seats_gained"] - p["seats_lost"]),
+                                -abs(p["vote_delta"]), p["party_code"]))
+    return parties
+
+
+def upload_summary(before: VotesByConstituency,
+                   after: VotesByConstituency) -> dict:
+    """The impact summary stored with an upload at ingest.
+
+    ``before`` and ``after`` hold the active votes of the constituencies
+    the upload touched, read just before and after it wrote them.
+    """
+    changes = compare_votes(before, after)
+    results_changed = sum(before[constituency_id].get(code) != count
+                          for constituency_id, new in after.items()
+                          for code, count in new.items())
+    return {
+        "constituencies_touched": len(after),
+        "constituencies_changed": len(changes.constituencies),
+        "results_changed": results_changed,
+        "seats_flipped": changes.seats_flipped,
+        "parties": _party_changes(changes),
+    }
+
+
+def upload_diff(db: Session, from_upload_id: int, to_upload_id: int) -> dict:
+    """Vote and seat changes from the results as of ``from_upload_id`` to
+    the results as of ``to_upload_id``.
+
+    Only results of constituencies with active history from the uploads in
+    between are compared: a range scan on ``upload_id`` finds them, the
+    earlier state is replayed for those results alone from the nearest
+    checkpoint, and the later one overlays the rows in range. Either upload
+    may come first; upload 0 is the state before any upload.
+    """
+    low, high = sorted((from_upload_id, to_upload_id))
+    in_range = select(ResultHistory.result_id).where(
+        ResultHistory.upload_id > low,
+        ResultHistory.upload_id <= high,
+        ResultHistory.is_active.is_(True),
+    )
+    result_ids = select(Result.id).where(
+        Result.constituency_id.in_(
+            select(Result.constituency_id).where(Result.id.in_(in_range))))
+    before_votes, after_votes = votes_between(db, result_ids, from_upload_id,
+                                              to_upload_id)
+
+    names: dict[int, str] = {}
+    before: VotesByConstituency = {}
+    after: VotesByConstituency = {}
+    rows = db.execute(
+        select(Result.id, Result.constituency_id, Constituency.name,
+               Result.party_code).join(
+                   Constituency,
+                   Constituency.id == Result.constituency_id).where(
+                       Result.id.in_(result_ids)))
+    for result_id, constituency_id, name, party_code in rows:
+        names[constituency_id] = name
+        old = before.setdefault(constituency_id, {})
+        new = after.setdefault(constituency_id, {})
+        if result_id in before_votes:
+            old[party_code] = before_votes[result_id]
+        if result_id in after_votes:
+            new[party_code] = after_votes[result_id]
+
+    changes = compare_votes(before, after)
+    constituencies = []
+    results_changed = 0
+    for constituency_id, old_winner, new_winner in changes.constituencies:
+        old, new = before[constituency_id], after[constituency_id]
+        parties = [{
+            "party_code": code,
+            "votes_before": old.get(code),
+            "votes_after": new.get(code),
+            "vote_delta": new.get(code, 0) - old.get(code, 0),
+        } for code in sorted(old.keys() | new.keys())
+                   if old.get(code) != new.get(code)]
+        results_changed += len(parties)
+        constituencies.append({
+            "constituency_id": constituency_id,
+            "constituency_name": names[constituency_id],
+            "winning_party_code_before": old_winner,
+            "winning_party_code_after": new_winner,
+            "parties": parties,
+        })
+    constituencies.sort(key=lambda c: c["constituency_name"])
+    return {
+        "from_upload_id": from_upload_id,
+        "to_upload_id": to_upload_id,
+        "constituencies_changed": len(constituencies),
+        "results_changed": results_changed,
+        "seats_flipped": changes.seats_flipped,
+        "parties": _party_changes(changes),
+        "constituencies": constituencies,
+    }
+
+
+def diff_lines(diff: dict) -> Iterator[bytes]:
+    """An upload diff as NDJSON: the summary without ``constituencies``,
+    then one line per constituency, each encoded as it is sent."""
+    summary = {
+        key: value
+        for key, value in diff.items() if key != "constituencies"
+    }
+    yield encode_json(summary) + b"\n"
+    for constituency in diff["constituencies"]:
+        yield encode_json(constituency) + b"\n"
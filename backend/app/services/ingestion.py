@@ -10,6 +10,13 @@ from app.models.constituency import Constituency
 from app.models.result import Result
 from app.models.result_history import ResultHistory
 from app.models.upload_log import UploadLog
+from app.services.change_log_service import record_result_changes
+from app.services.checkpoint_service import maybe_checkpoint
+from app.services.impact_service import (
+    VotesByConstituency,
+    active_votes,
+    upload_summary,
+)
 from app.services.parser import ParsedConstituencyResult, parse_file
 
 PROGRESS_BATCH_SIZE = 10
@@ -71,6 +78,21 @@ class ConstituencyMatcher:
         return None
 
 
+def _votes_before(
+        db: Session, matcher: ConstituencyMatcher,
+        results: list[ParsedConstituencyResult]) -> VotesByConstituency:
+    """Active votes of the constituencies the upload will write, read once
+    before it writes any."""
+    matched = (matcher.find(parsed.constituency_name) for parsed in results)
+    return active_votes(db, {c.id for c in matched if c is not None})
+
+
+def _impact_summary(db: Session, before: VotesByConstituency) -> dict:
+    # Sessions don't autoflush; the result writes must be visible
+    db.flush()
+    return upload_summary(before, active_votes(db, before))
+
+
 def ingest_file(db: Session,
                 content: str,
                 filename: str | None = None) -> UploadLog:
@@ -97,6 +119,8 @@ def ingest_file(db: Session,
 
     try:
         matcher = ConstituencyMatcher(db)
+        before = _votes_before(db, matcher, results)
+        touched: set[int] = set()
 
         for parsed in results:
             constituency = matcher.find(parsed.constituency_name)
@@ -113,10 +137,14 @@ def ingest_file(db: Session,
                 continue
 
             _upsert_results(db, constituency, parsed, upload_log.id)
+            touched.add(constituency.id)
             upload_log.processed_lines += 1
 
         upload_log.status = "completed"
         upload_log.completed_at = func.now()
+        upload_log.impact = _impact_summary(db, before)
+        record_result_changes(db, touched, upload_log.id)
+        maybe_checkpoint(db, upload_log.id)
         db.commit()
     except Exception:  # noqa: BLE001
         db.rollback()
@@ -180,6 +208,8 @@ def ingest_file_streaming(
 
     try:
         matcher = ConstituencyMatcher(db)
+        before = _votes_before(db, matcher, results)
+        touched: set[int] = set()
         processed_count = 0
 
         for i, parsed in enumerate(results):
@@ -196,6 +226,7 @@ def ingest_file_streaming(
                 flag_modified(upload_log, "errors")
             else:
                 _upsert_results(db, constituency, parsed, upload_log.id)
+                touched.add(constituency.id)
                 upload_log.processed_lines += 1
 
             processed_count += 1
@@ -212,6 +243,9 @@ def ingest_file_streaming(
 
         upload_log.status = "completed"
         upload_log.completed_at = func.now()
+        upload_log.impact = _impact_summary(db, before)
+        record_result_changes(db, touched, upload_log.id)
+        maybe_checkpoint(db, upload_log.id)
         db.commit()
 
         yield {
@@ -267,6 +301,7 @@ def _upsert_results(db: Session,
                     "votes": votes,
                     "updated_at": func.now(),
                     "upload_id": upload_id,
+                    "is_active": True,
                 },
             )
             db.execute(stmt)
@@ -298,6 +333,7 @@ def _upsert_results(db: Session,
             else:
                 result.votes = votes
                 result.upload_id = upload_id
+                result.is_active = True
             db.add(
                 ResultHistory(result_id=result.id,
                               upload_id=upload_id,
@@ -0,0 +1,168 @@
+"""Fan-out of committed result changes to live (SSE) subscribers.
+
+One producer task per process turns "version N committed" notifications
+into a single pre-encoded event, then hands the same string to every
+subscriber's bounded queue. A subscriber whose queue is full is not waited
+on: its backlog is discarded and replaced by a ``resync`` event telling the
+client to refetch full state.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections.abc import Callable
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.constituency_service import get_constituency_changes
+from app.services.totals_service import get_total_results
+from app.services.version_service import get_results_version
+
+logger = logging.getLogger(__name__)
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def build_results_event(db: Session, since: int) -> tuple[int, str]:
+    """Encode the changes after ``since`` as one SSE message.
+
+    Returns the version the message brings a client up to.
+    """
+    changes = get_constituency_changes(db, since)
+    version = changes["version"]
+    if changes["resync"]:
+        return version, format_sse("resync", {"version": version})
+    totals = get_total_results(db)
+    return version, format_sse(
+        "results", {
+            "version":
+            version,
+            "since":
+            since,
+            "constituencies": [{
+                "id": c["id"],
+                "pcon24_code": c["pcon24_code"],
+                "winning_party_code": c["winning_party_code"],
+                "total_votes": c["total_votes"],
+            } for c in changes["constituencies"]],
+            "totals":
+            totals,
+        })
+
+
+class Subscription:
+    """A live client's bounded queue of pre-encoded SSE messages."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, message: str, resync_message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow consumer: drop its backlog rather than block the fan-out
+            self.dropped += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(resync_message)
+
+
+class LiveBroadcaster:
+    """Single producer fanning result events out to all subscribers."""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self._subscribers: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._lock = threading.Lock()
+        self._target_version = 0
+        self.published_version = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.published_version = await asyncio.to_thread(self._read_version)
+        with self._lock:
+            self._target_version = max(self._target_version,
+                                       self.published_version)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._loop = None
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(settings.LIVE_QUEUE_SIZE)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def notify(self, version: int) -> None:
+        """Record that ``version`` was committed. Safe from any thread."""
+        with self._lock:
+            if version <= self._target_version:
+                return
+            self._target_version = version
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def publish(self, message: str) -> None:
+        """Offer a pre-encoded message to every subscriber."""
+        resync = format_sse("resync", {"version": self.published_version})
+        for subscription in list(self._subscribers):
+            subscription.offer(message, resync)
+
+    def _read_version(self) -> int:
+        db = self.session_factory()
+        try:
+            return get_results_version(db)
+        finally:
+            db.close()
+
+    def _build(self, since: int) -> tuple[int, str]:
+        db = self.session_factory()
+        try:
+            return build_results_event(db, since)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                target = self._target_version
+            if target <= self.published_version:
+                continue
+            try:
+                version, message = await asyncio.to_thread(
+                    self._build, self.published_version)
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to build live results event")
+                continue
+            if version <= self.published_version:
+                continue
+            self.published_version = version
+            self.publish(message)
+
+
+broadcaster = LiveBroadcaster(SessionLocal)
@@ -0,0 +1,91 @@
+"""Shared SQLAlchemy Core building blocks over active results.
+
+These return selectables rather than executing anything, so services can
+compose them into a single statement.
+"""
+from sqlalchemy import and_, case, func, select
+
+from app.models.constituency import Constituency
+from app.models.result import Result
+
+
+def active_result_filter():
+    """Filter condition: result's upload is not soft-deleted."""
+    return Result.is_active.is_(True)
+
+
+def ranked_active_results(name: str = "ranked"):
+    """Active results ranked by votes within their constituency.
+
+    Columns: ``constituency_id``, ``party_code``, ``votes``, ``vote_rank``
+    (``RANK()`` by votes descending) and ``leader_count``.
+
+    ``leader_count`` is ``COUNT(*)`` over the same ordered window; its
+    default ``RANGE ... CURRENT ROW`` frame includes ties, so on a rank-1 row
+    it is the number of parties sharing first place.
+    """
+    window = {
+        "partition_by": Result.constituency_id,
+        "order_by": Result.votes.desc(),
+    }
+    return (select(
+        Result.constituency_id,
+        Result.party_code,
+        Result.votes,
+        func.rank().over(**window).label("vote_rank"),
+        func.count().over(**window).label("leader_count"),
+    ).where(active_result_filter()).subquery(name))
+
+
+def constituency_leaders(name: str = "leaders"):
+    """One row per constituency with active results.
+
+    Columns: ``constituency_id``, ``winning_party_code`` (NULL when first
+    place is tied) and ``total_votes``.
+    """
+    ranked = ranked_active_results()
+    is_first = ranked.c.vote_rank == 1
+    first_place_count = func.sum(case((is_first, 1), else_=0))
+    return (select(
+        ranked.c.constituency_id,
+        case((first_place_count == 1,
+              func.max(case((is_first, ranked.c.party_code), else_=None))),
+             else_=None).label("winning_party_code"),
+        func.sum(ranked.c.votes).label("total_votes"),
+    ).group_by(ranked.c.constituency_id).subquery(name))
+
+
+def party_totals():
+    """Single-pass aggregate of votes and seats per party.
+
+    Columns: ``party_code``, ``total_votes`` and ``seats``. A sole winner is
+    a rank-1 row with a leader count of 1 (see ``ranked_active_results``),
+    so the GROUP BY sums votes and counts seats without re-joining
+    ``results``.
+    """
+    ranked = ranked_active_results()
+    is_sole_winner = and_(ranked.c.vote_rank == 1, ranked.c.leader_count == 1)
+    return (select(
+        ranked.c.party_code,
+        func.sum(ranked.c.votes).label("total_votes"),
+        func.sum(case((is_sole_winner, 1), else_=0)).label("seats"),
+    ).group_by(ranked.c.party_code))
+
+
+def region_party_totals():
+    """Votes and seats per party within each region, in one GROUP BY.
+
+    Columns: ``region_id``, ``party_code``, ``total_votes`` and ``seats``,
+    with seats counted as in ``party_totals``. Constituencies without a
+    region are left out.
+    """
+    ranked = ranked_active_results()
+    is_sole_winner = and_(ranked.c.vote_rank == 1, ranked.c.leader_count == 1)
+    return (select(
+        Constituency.region_id,
+        ranked.c.party_code,
+        func.sum(ranked.c.votes).label("total_votes"),
+        func.sum(case((is_sole_winner, 1), else_=0)).label("seats"),
+    ).join(Constituency, Constituency.id == ranked.c.constituency_id).where(
+        Constituency.region_id.is_not(None)).group_by(
+            Constituency.region_id, ranked.c.party_code))
@@ -0,0 +1,116 @@
+import threading
+from collections import OrderedDict
+from typing import Any
+
+_caches: list = []
+
+
+class VersionedCache:
+    """Thread-safe cache holding entries for a single results version.
+
+    Storing an entry for a newer version drops everything cached for the
+    previous one, so readers never see values derived from stale results.
+    Entries for versions older than the current one are ignored.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._entries: dict[Any, Any] = {}
+        _caches.append(self)
+
+    def get(self, version: int, key: Any) -> Any | None:
+        with self._lock:
+            if version != self._version:
+                return None
+            return self._entries.get(key)
+
+    def put(self, version: int, key: Any, value: Any) -> None:
+        with self._lock:
+            if self._version is not None and version < self._version:
+                return
+            if version != self._version:
+                self._version = version
+                self._entries = {}
+            self._entries[key] = value
+
+    def expire(self, version: int) -> None:
+        """Drop entries cached for versions older than ``version``."""
+        with self._lock:
+            if self._version is not None and self._version < version:
+                self._version = None
+                self._entries = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version = None
+            self._entries = {}
+
+
+class ResponseCache:
+    """Thread-safe LRU of encoded response bodies for one results version.
+
+    Like ``VersionedCache``, a newer version replaces everything cached for
+    the previous one. Within a version, the least recently used bodies are
+    evicted once their combined ``len()`` exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._entries: OrderedDict[Any, Any] = OrderedDict()
+        self.size = 0
+        _caches.append(self)
+
+    def get(self, version: int, key: Any) -> Any | None:
+        with self._lock:
+            if version != self._version:
+                return None
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, version: int, key: Any, body: Any) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if self._version is not None and version < self._version:
+                return
+            if version != self._version:
+                self._reset(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def expire(self, version: int) -> None:
+        with self._lock:
+            if self._version is not None and self._version < version:
+                self._reset(None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset(None)
+
+    def _reset(self, version: int | None) -> None:
+        self._version = version
+        self._entries = OrderedDict()
+        self.size = 0
+
+
+def clear_caches() -> None:
+    """Drop every registered cache (e.g. after the database is reset)."""
+    for cache in _caches:
+        cache.clear()
+
+
+def expire_caches(version: int) -> None:
+    """Results listener freeing entries made stale by ``version``."""
+    for cache in _caches:
+        cache.expire(version)
@@ -0,0 +1,127 @@
+"""Propagation of committed results versions across API workers.
+
+Each worker process runs one watcher. On PostgreSQL it LISTENs on the
+channel that ``bump_results_version`` NOTIFYs inside every writer's
+transaction, so a commit made by any worker reaches the results listeners
+(caches, live broadcaster) of all of them. Other databases (SQLite in tests
+and local runs) fall back to polling the results version.
+"""
+import asyncio
+import logging
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import engine as default_engine
+from app.services.version_service import (
+    RESULTS_CHANNEL,
+    get_results_version,
+    notify_results_listeners,
+)
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 5.0
+
+
+class ResultsWatcher:
+    """Background task relaying committed results versions to listeners."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.seen_version = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def uses_notify(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    async def start(self) -> None:
+        if self.uses_notify:
+            self._task = asyncio.create_task(self._listen())
+        elif settings.RESULTS_POLL_SECONDS > 0:
+            self.seen_version = await asyncio.to_thread(self._read_version)
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def dispatch(self, version: int) -> None:
+        """Forward ``version`` to the results listeners if it is new."""
+        if version <= self.seen_version:
+            return
+        self.seen_version = version
+        notify_results_listeners(version)
+
+    def _read_version(self) -> int:
+        with Session(self.engine) as db:
+            return get_results_version(db)
+
+    async def _check_version(self) -> None:
+        try:
+            version = await asyncio.to_thread(self._read_version)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to read results version")
+            return
+        self.dispatch(version)
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(settings.RESULTS_POLL_SECONDS)
+            await self._check_version()
+
+    def _open_listener(self):
+        # Detached so the LISTENing connection never goes back to the pool
+        connection = self.engine.raw_connection()
+        connection.detach()
+        driver_connection = connection.dbapi_connection
+        driver_connection.autocommit = True
+        with driver_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {RESULTS_CHANNEL}")
+        return driver_connection
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                connection = await asyncio.to_thread(self._open_listener)
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to LISTEN on %s", RESULTS_CHANNEL)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+                continue
+            try:
+                # Anything committed while we were not listening was missed
+                await self._check_version()
+                await self._drain(connection)
+            except Exception:  # noqa: BLE001
+                logger.exception("Lost LISTEN connection on %s",
+                                 RESULTS_CHANNEL)
+            finally:
+                connection.close()
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def _drain(self, connection) -> None:
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        fd = connection.fileno()
+        loop.add_reader(fd, readable.set)
+        try:
+            while True:
+                await readable.wait()
+                readable.clear()
+                connection.poll()
+                versions = [int(n.payload) for n in connection.notifies]
+                connection.notifies.clear()
+                if versions:
+                    self.dispatch(max(versions))
+        finally:
+            loop.remove_reader(fd)
+
+
+results_watcher = ResultsWatcher(default_engine)
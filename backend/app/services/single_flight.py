@@ -0,0 +1,77 @@
+"""Coalescing of concurrent identical reads.
+
+Sync routes run on the threadpool, so when many dashboards poll at once the
+same expensive read can be running dozens of times in parallel. A
+``SingleFlight`` lets the first caller for a key (the leader) do the work
+while callers arriving before it finishes wait and share its result.
+"""
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time.
+
+    ``executions`` counts computations actually run and ``coalesced`` the
+    callers that shared another caller's result instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple[Any, int]:
+        """Return ``fn()``, sharing one call among concurrent callers.
+
+        Returns the value and how many other callers shared it. An
+        exception raised by the leader is re-raised in every follower.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executions += 1
+            else:
+                flight.followers += 1
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, flight.followers
+
+        try:
+            flight.value = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value, flight.followers
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+            }
+
+
+read_flight = SingleFlight()
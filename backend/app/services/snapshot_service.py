@@ -0,0 +1,312 @@
+"""Shared, memory-mapped snapshot of the latest election results.
+
+After each committed results version one process rebuilds the snapshot and
+atomically replaces the file at ``RESULTS_SNAPSHOT_PATH``. Every worker
+maps that file read-only and reads its arrays in place, so N workers share
+one copy of the derived state instead of each querying for their own. Put
+the path on a tmpfs such as ``/dev/shm`` so the file never touches disk.
+
+Layout (native byte order, every section 8-byte aligned)::
+
+    header        magic, format, results version, constituency count,
+                  party count, total votes, party code block length
+    party codes   UTF-8, newline separated
+    int64[n]      total votes per constituency
+    int64[p]      votes per party
+    int32[n]      constituency ids, ascending
+    int32[p]      seats per party
+    int16[n]      winner as an index into the party codes, -1 if none
+"""
+import bisect
+import logging
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections.abc import Callable, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.constituency import Constituency
+from app.services.result_queries import constituency_leaders, party_totals
+from app.services.version_service import get_results_version
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, single worker only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ENRS"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("=4sHxxQIIQI4x")
+NO_WINNER = -1
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (_align(len(data)) - len(data))
+
+
+class ResultsSnapshot:
+    """Read-only view over an encoded snapshot.
+
+    The array attributes are ``memoryview`` casts straight into the
+    underlying buffer; nothing is copied except the party codes.
+    """
+
+    def __init__(self, buffer):
+        (magic, fmt, self.version, count, party_count, self.total_votes,
+         codes_size) = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError("Not a results snapshot")
+        view = memoryview(buffer)
+        offset = _HEADER.size
+        codes = bytes(view[offset:offset + codes_size]).decode()
+        self.party_codes = codes.split("\n") if codes else []
+        offset += _align(codes_size)
+
+        def take(typecode: str, length: int) -> memoryview:
+            nonlocal offset
+            size = array(typecode).itemsize * length
+            section = view[offset:offset + size].cast(typecode)
+            offset += _align(size)
+            return section
+
+        self.constituency_votes = take("q", count)
+        self.party_votes = take("q", party_count)
+        self.constituency_ids = take("i", count)
+        self.party_seats = take("i", party_count)
+        self.winners = take("h", count)
+
+    @property
+    def total_constituencies(self) -> int:
+        return len(self.constituency_ids)
+
+    def party_rows(self) -> Iterator[tuple[str, int, int]]:
+        """Yield ``(party_code, total_votes, seats)`` per party."""
+        return zip(self.party_codes, self.party_votes, self.party_seats)
+
+    def winner(self, constituency_id: int) -> str | None:
+        """Winning party code for a constituency, or None."""
+        i = bisect.bisect_left(self.constituency_ids, constituency_id)
+        if i == len(self.constituency_ids) or (self.constituency_ids[i]
+                                               != constituency_id):
+            return None
+        index = self.winners[i]
+        return None if index == NO_WINNER else self.party_codes[index]
+
+
+def encode_snapshot(version: int, constituencies, parties) -> bytes:
+    """Encode a snapshot.
+
+    ``constituencies`` are ``(id, winning_party_code, total_votes)`` rows
+    ordered by id; ``parties`` are ``(party_code, total_votes, seats)`` rows.
+    """
+    party_codes = [p[0] for p in parties]
+    party_index = {code: i for i, code in enumerate(party_codes)}
+    codes = "\n".join(party_codes).encode()
+    total_votes = sum(p[1] or 0 for p in parties)
+    sections = (
+        array("q", (c[2] or 0 for c in constituencies)),
+        array("q", (p[1] or 0 for p in parties)),
+        array("i", (c[0] for c in constituencies)),
+        array("i", (p[2] or 0 for p in parties)),
+        array("h", (party_index.get(c[1], NO_WINNER) for c in constituencies)),
+    )
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, version,
+                          len(constituencies), len(parties), total_votes,
+                          len(codes))
+    return b"".join([header, _pad(codes)] +
+                    [_pad(section.tobytes()) for section in sections])
+
+
+def build_snapshot(db: Session) -> bytes:
+    """Encode the current results as a snapshot.
+
+    The version is read first, so under READ COMMITTED the data is never
+    older than the version it is labelled with.
+    """
+    version = get_results_version(db)
+    leaders = constituency_leaders()
+    constituencies = db.execute(
+        select(
+            Constituency.id,
+            leaders.c.winning_party_code,
+            leaders.c.total_votes,
+        ).outerjoin(leaders,
+                    leaders.c.constituency_id == Constituency.id).order_by(
+                        Constituency.id)).all()
+    parties = db.execute(party_totals()).all()
+    return encode_snapshot(version, constituencies, parties)
+
+
+def snapshot_file_version(path: str) -> int | None:
+    """Results version stored in the snapshot at ``path``, if any."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < _HEADER.size:
+        return None
+    magic, fmt, version, *_ = _HEADER.unpack(header)
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        return None
+    return version
+
+
+def write_snapshot(path: str, data: bytes) -> None:
+    """Atomically replace the snapshot; readers keep their old mapping."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class SnapshotReader:
+    """Maps the snapshot file, remapping only when it has been replaced."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._key = None
+        self._snapshot: ResultsSnapshot | None = None
+        self._lock = threading.Lock()
+
+    def read(self) -> ResultsSnapshot | None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key != self._key:
+                try:
+                    with open(self.path, "rb") as f:
+                        mapped = mmap.mmap(f.fileno(),
+                                           0,
+                                           access=mmap.ACCESS_READ)
+                    self._snapshot = ResultsSnapshot(mapped)
+                except (OSError, ValueError, struct.error):
+                    logger.exception("Unreadable results snapshot at %s",
+                                     self.path)
+                    self._snapshot = None
+                self._key = key
+            return self._snapshot
+
+
+_readers: dict[str, SnapshotReader] = {}
+
+
+def read_snapshot() -> ResultsSnapshot | None:
+    """The shared snapshot, or None when disabled or not yet published.
+
+    Callers must compare ``version`` with the results version they need.
+    """
+    path = settings.RESULTS_SNAPSHOT_PATH
+    if not path:
+        return None
+    reader = _readers.get(path)
+    if reader is None:
+        reader = _readers.setdefault(path, SnapshotReader(path))
+    return reader.read()
+
+
+class SnapshotPublisher:
+    """Rebuilds the shared snapshot after each committed results version.
+
+    Every worker runs a publisher, but rebuilds are serialised by a file
+    lock and skipped when the file is already current, so each version is
+    written by a single process.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self.path = ""
+        self._condition = threading.Condition()
+        self._target_version = 0
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self.path = settings.RESULTS_SNAPSHOT_PATH
+        if not self.path or self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run,
+                                        name="results-snapshot",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+
+    def notify(self, version: int) -> None:
+        """Results listener: request a snapshot at ``version`` or newer."""
+        with self._condition:
+            if version > self._target_version:
+                self._target_version = version
+                self._condition.notify()
+
+    def publish(self, version: int) -> bool:
+        """Rebuild unless the file is already at ``version`` or newer.
+
+        Returns whether this call wrote the snapshot.
+        """
+        with open(f"{self.path}.lock", "ab") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            current = snapshot_file_version(self.path)
+            if current is not None and current >= version:
+                return False
+            db = self.session_factory()
+            try:
+                data = build_snapshot(db)
+            finally:
+                db.close()
+            write_snapshot(self.path, data)
+            return True
+
+    def _read_version(self) -> int:
+        db = self.session_factory()
+        try:
+            return get_results_version(db)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        published = None
+        while True:
+            with self._condition:
+                while not self._stopping and (
+                        published is not None
+                        and self._target_version <= published):
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                target = self._target_version
+            try:
+                if published is None:
+                    # Replace any file left behind by an earlier run
+                    target = max(target, self._read_version())
+                self.publish(target)
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to publish results snapshot")
+            published = target
+
+
+snapshot_publisher = SnapshotPublisher(SessionLocal)
@@ -0,0 +1,292 @@
+"""Per-region, multi-resolution slices of the national TopoJSON.
+
+A region view only needs that region's constituencies, usually at less
+detail than the national file carries. A slice keeps the geometries of one
+region and only the arcs they use, simplifies each arc once (so borders
+shared by neighbouring constituencies stay shared), and quantises the
+result onto a grid fitted to the region.
+
+Slices are content-addressed by the source file, the resolution and the
+member constituencies. They are kept in memory with their compressed
+variants and written under ``<asset build dir>/topology`` so other workers
+and restarts reuse them.
+"""
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.compression import STATIC_LEVELS, EncodedBody
+from app.services.response_cache import encode_json
+from app.services.single_flight import read_flight
+from app.static_assets import STATIC_DIR, asset_build_dir
+
+TOPOLOGY_FILE = "uk-constituencies.topojson"
+
+
+@dataclass(frozen=True)
+class Resolution:
+    # Douglas-Peucker tolerance in degrees; 0 keeps every point
+    tolerance: float
+    # Grid steps across the slice's bounding box on each axis
+    quantization: int
+
+
+RESOLUTIONS = {
+    "low": Resolution(tolerance=0.005, quantization=2_000),
+    "medium": Resolution(tolerance=0.001, quantization=10_000),
+    "high": Resolution(tolerance=0.0, quantization=100_000),
+}
+
+
+def _normalize_name(name: str) -> str:
+    # Same normalisation as the frontend's map matching
+    decomposed = unicodedata.normalize("NFD", name)
+    return "".join(c for c in decomposed
+                   if not unicodedata.combining(c)).lower().strip()
+
+
+def decode_arcs(topology: dict) -> list[list[tuple[float, float]]]:
+    """Absolute coordinates of every arc in a quantised topology."""
+    transform = topology.get("transform")
+    arcs = []
+    for arc in topology["arcs"]:
+        if transform is None:
+            arcs.append([(p[0], p[1]) for p in arc])
+            continue
+        (sx, sy), (tx, ty) = transform["scale"], transform["translate"]
+        x = y = 0
+        points = []
+        for dx, dy, *_ in arc:
+            x += dx
+            y += dy
+            points.append((x * sx + tx, y * sy + ty))
+        arcs.append(points)
+    return arcs
+
+
+def _segment_distance(point, start, end) -> float:
+    (px, py), (ax, ay), (bx, by) = point, start, end
+    dx, dy = bx - ax, by - ay
+    length = dx * dx + dy * dy
+    if length == 0:
+        return ((px - ax)**2 + (py - ay)**2)**0.5
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length))
+    return ((px - ax - t * dx)**2 + (py - ay - t * dy)**2)**0.5
+
+
+def simplify(points: list, tolerance: float) -> list:
+    """Douglas-Peucker simplification keeping both endpoints.
+
+    Closed arcs (rings stored as a single arc) keep at least four points
+    so they remain valid rings.
+    """
+    if tolerance <= 0 or len(points) <= 2:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        best, index = 0.0, None
+        for i in range(first + 1, last):
+            distance = _segment_distance(points[i], points[first],
+                                         points[last])
+            if distance > best:
+                best, index = distance, i
+        if index is not None and best > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    kept = [p for p, k in zip(points, keep) if k]
+    if points[0] == points[-1] and len(kept) < 4 <= len(points):
+        n = len(points)
+        kept = [points[0], points[n // 3], points[2 * n // 3], points[-1]]
+    return kept
+
+
+def geometry_arcs(geometry: dict):
+    """Yield the arc references of a geometry; negative means reversed."""
+    arcs = geometry.get("arcs", [])
+    if geometry["type"] == "Polygon":
+        rings = arcs
+    elif geometry["type"] == "MultiPolygon":
+        rings = [ring for polygon in arcs for ring in polygon]
+    elif geometry["type"] == "LineString":
+        rings = [arcs]
+    elif geometry["type"] == "MultiLineString":
+        rings = arcs
+    else:
+        rings = []
+    for ring in rings:
+        yield from ring
+
+
+def _remap(arcs, mapping: dict[int, int]):
+    if isinstance(arcs, int):
+        return mapping[arcs] if arcs >= 0 else ~mapping[~arcs]
+    return [_remap(a, mapping) for a in arcs]
+
+
+def _quantize(arcs: list[list], resolution: Resolution):
+    xs = [p[0] for arc in arcs for p in arc]
+    ys = [p[1] for arc in arcs for p in arc]
+    bbox = [min(xs), min(ys), max(xs), max(ys)]
+    steps = resolution.quantization - 1
+    kx = (bbox[2] - bbox[0]) / steps or 1.0
+    ky = (bbox[3] - bbox[1]) / steps or 1.0
+    encoded = []
+    for arc in arcs:
+        deltas = []
+        px = py = 0
+        for x, y in arc:
+            qx = round((x - bbox[0]) / kx)
+            qy = round((y - bbox[1]) / ky)
+            if deltas and qx == px and qy == py:
+                continue
+            deltas.append([qx - px, qy - py])
+            px, py = qx, qy
+        if len(deltas) == 1:
+            deltas.append([0, 0])
+        encoded.append(deltas)
+    transform = {"scale": [kx, ky], "translate": [bbox[0], bbox[1]]}
+    return encoded, transform, bbox
+
+
+def slice_topology(topology: dict,
+                   codes: set[str],
+                   names: set[str],
+                   resolution: Resolution,
+                   arcs: list[list] | None = None) -> dict:
+    """Sub-topology of the geometries whose code or name is listed.
+
+    Geometries match on ``pcon19cd`` or on their normalised ``pcon19nm``.
+    ``arcs`` may carry pre-decoded absolute arcs of ``topology``.
+    """
+    if arcs is None:
+        arcs = decode_arcs(topology)
+    names = {_normalize_name(n) for n in names}
+    objects = {}
+    mapping: dict[int, int] = {}
+    for object_name, collection in topology["objects"].items():
+        geometries = []
+        for geometry in collection.get("geometries", []):
+            properties = geometry.get("properties") or {}
+            if (properties.get("pcon19cd") not in codes and _normalize_name(
+                    properties.get("pcon19nm", "")) not in names):
+                continue
+            for index in geometry_arcs(geometry):
+                index = index if index >= 0 else ~index
+                mapping.setdefault(index, len(mapping))
+            geometries.append(geometry)
+        objects[object_name] = {
+            "type": "GeometryCollection",
+            "geometries": [{
+                **g, "arcs": _remap(g["arcs"], mapping)
+            } if "arcs" in g else g for g in geometries],
+        }
+
+    if not mapping:
+        return {"type": "Topology", "objects": objects, "arcs": []}
+    used = sorted(mapping, key=mapping.get)
+    simplified = [simplify(arcs[i], resolution.tolerance) for i in used]
+    encoded, transform, bbox = _quantize(simplified, resolution)
+    return {
+        "type": "Topology",
+        "bbox": bbox,
+        "transform": transform,
+        "objects": objects,
+        "arcs": encoded,
+    }
+
+
+class TopologySlicer:
+    """Builds and caches region slices of one source topology."""
+
+    def __init__(self, source: Path, cache_dir: Path | None = None):
+        self.source = source
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._loaded: tuple[str, dict, list] | None = None
+        self._slices: dict[str, EncodedBody] = {}
+
+    def _load(self) -> tuple[str, dict, list]:
+        with self._lock:
+            if self._loaded is None:
+                content = self.source.read_bytes()
+                topology = json.loads(content)
+                self._loaded = (hashlib.sha256(content).hexdigest(), topology,
+                                decode_arcs(topology))
+            return self._loaded
+
+    def slice_key(self, resolution: str, codes: set[str],
+                  names: set[str]) -> str:
+        """Content address of a slice; usable as an ETag."""
+        digest = hashlib.sha256(self._load()[0].encode())
+        digest.update(resolution.encode())
+        for value in sorted(codes) + sorted(names):
+            digest.update(b"\0" + value.encode())
+        return digest.hexdigest()[:16]
+
+    def get(self, resolution: str, codes: set[str],
+            names: set[str]) -> tuple[str, EncodedBody]:
+        """Return ``(key, body)`` of the slice, building it on a miss."""
+        key = self.slice_key(resolution, codes, names)
+        with self._lock:
+            body = self._slices.get(key)
+        if body is not None:
+            return key, body
+
+        def load() -> EncodedBody:
+            data = self._read_disk(key)
+            if data is None:
+                _, topology, arcs = self._load()
+                data = encode_json(
+                    slice_topology(topology, codes, names,
+                                   RESOLUTIONS[resolution], arcs))
+                self._write_disk(key, data)
+            encoded = EncodedBody(data, STATIC_LEVELS)
+            with self._lock:
+                self._slices[key] = encoded
+            return encoded
+
+        body, _ = read_flight.do(("topology", key), load)
+        return key, body
+
+    def _disk_path(self, key: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{key}.topojson"
+
+    def _read_disk(self, key: str) -> bytes | None:
+        path = self._disk_path(key)
+        try:
+            return path.read_bytes() if path is not None else None
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+_slicers: dict[Path, TopologySlicer] = {}
+
+
+def get_region_topology(resolution: str, codes: set[str],
+                        names: set[str]) -> tuple[str, EncodedBody]:
+    """Slice of the national map for the given constituencies."""
+    cache_dir = asset_build_dir() / "topology"
+    slicer = _slicers.get(cache_dir)
+    if slicer is None:
+        slicer = _slicers.setdefault(
+            cache_dir, TopologySlicer(STATIC_DIR / TOPOLOGY_FILE, cache_dir))
+    return slicer.get(resolution, codes, names)
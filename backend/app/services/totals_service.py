@@ -1,16 +1,34 @@
-from sqlalchemy import func, or_
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.constants import PARTY_CODE_MAP
 from app.models.constituency import Constituency
 from app.models.result import Result
-from app.models.upload_log import UploadLog
+from app.services.history_service import results_state_as_of
+from app.services.result_queries import party_totals
+from app.services.snapshot_service import read_snapshot
+from app.services.version_service import get_results_version
 
 
-def _active_result_filter():
-    """Filter condition: result's upload is not soft-deleted 
-       (or has no upload)."""
-    return or_(Result.upload_id.is_(None), UploadLog.deleted_at.is_(None))
+def build_totals(party_rows, total_constituencies: int) -> dict:
+    """Shape ``(party_code, total_votes, seats)`` rows as the totals payload.
+    """
+    parties = []
+    for party_code, total_votes, seats in party_rows:
+        parties.append({
+            "party_code": party_code,
+            "party_name": PARTY_CODE_MAP.get(party_code, party_code),
+            "total_votes": total_votes or 0,
+            "seats": seats or 0,
+        })
+
+    parties.sort(key=lambda p: (-p["seats"], -p["total_votes"]))
+
+    return {
+        "total_constituencies": total_constituencies,
+        "total_votes": sum(p["total_votes"] for p in parties),
+        "parties": parties,
+    }
 
 
 def get_total_results(db: Session) -> dict:
@@ -20,70 +38,47 @@ def get_total_results(db: Session) -> dict:
     - Seats per party: count of constituencies where that party has the sole
       highest votes (tied constituencies award no seat)
 
-    Results from soft-deleted uploads are excluded.
+    Results from soft-deleted uploads are excluded. Votes and seats are
+    computed in one statement over the active results, unless the shared
+    results snapshot is already at the current results version.
     """
-    # Base: only active (non-soft-deleted) results
-    active_results = (db.query(Result).outerjoin(
-        UploadLog, Result.upload_id == UploadLog.id).filter(
-            _active_result_filter()).subquery())
-
-    # Total votes per party
-    votes_query = (db.query(
-        active_results.c.party_code,
-        func.sum(active_results.c.votes).label("total_votes"),
-    ).group_by(active_results.c.party_code).all())
-
-    # Seats: find the winning party in each constituency
-    # Step 1: max votes per constituency
-    max_votes_sub = (db.query(
-        active_results.c.constituency_id,
-        func.max(active_results.c.votes).label("max_votes"),
-    ).group_by(active_results.c.constituency_id).subquery())
+    snapshot = read_snapshot()
+    if snapshot is not None and snapshot.version == get_results_version(db):
+        return build_totals(snapshot.party_rows(),
+                            snapshot.total_constituencies)
 
-    # Step 2: count how many parties share the max in each constituency
-    # (to exclude ties)
-    tie_count_sub = (db.query(
-        active_results.c.constituency_id,
-        func.count().label("winner_count"),
-    ).join(
-        max_votes_sub,
-        (active_results.c.constituency_id == max_votes_sub.c.constituency_id) &
-        (active_results.c.votes == max_votes_sub.c.max_votes),
-    ).group_by(active_results.c.constituency_id).subquery())
-
-    # Step 3: join results with max_votes and filter to sole winners only
-    winners_query = (db.query(
-        active_results.c.party_code,
-        func.count().label("seats")
-    ).join(
-        max_votes_sub,
-        (active_results.c.constituency_id == max_votes_sub.c.constituency_id) &
-        (active_results.c.votes == max_votes_sub.c.max_votes),
-    ).join(
-        tie_count_sub,
-        active_results.c.constituency_id == tie_count_sub.c.constituency_id,
-    ).filter(tie_count_sub.c.winner_count == 1).group_by(
-        active_results.c.party_code).all())
+    rows = db.execute(party_totals()).all()
+    total_constituencies = db.query(func.count(Constituency.id)).scalar() or 0
+    return build_totals(rows, total_constituencies)
 
-    votes_map = {row.party_code: row.total_votes for row in votes_query}
-    seats_map = {row.party_code: row.seats for row in winners_query}
-    all_parties = set(votes_map.keys()) | set(seats_map.keys())
 
-    parties = []
-    for code in all_parties:
-        parties.append({
-            "party_code": code,
-            "party_name": PARTY_CODE_MAP.get(code, code),
-            "total_votes": votes_map.get(code, 0),
-            "seats": seats_map.get(code, 0),
-        })
-
-    parties.sort(key=lambda p: (-p["seats"], -p["total_votes"]))
+def get_total_results_as_of(db: Session, upload_id: int) -> dict:
+    """National results as they stood after ``upload_id``.
 
+    Votes are rebuilt from the nearest state checkpoint plus the history
+    written since; seats follow the same sole-winner rule as
+    ``get_total_results``.
+    """
+    state = results_state_as_of(db, upload_id)
+    constituencies: dict[int, list[tuple[str, int]]] = {}
+    for result_id, constituency_id, party_code in db.execute(
+            select(Result.id, Result.constituency_id, Result.party_code)):
+        votes = state.get(result_id)
+        if votes is not None:
+            constituencies.setdefault(constituency_id, []).append(
+                (party_code, votes))
+
+    votes_by_party: dict[str, int] = {}
+    seats_by_party: dict[str, int] = {}
+    for results in constituencies.values():
+        top = max(votes for _, votes in results)
+        leaders = [code for code, votes in results if votes == top]
+        if len(leaders) == 1:
+            seats_by_party[leaders[0]] = seats_by_party.get(leaders[0], 0) + 1
+        for code, votes in results:
+            votes_by_party[code] = votes_by_party.get(code, 0) + votes
+
+    rows = [(code, votes, seats_by_party.get(code, 0))
+            for code, votes in votes_by_party.items()]
     total_constituencies = db.query(func.count(Constituency.id)).scalar() or 0
-
-    return {
-        "total_constituencies": total_constituencies,
-        "total_votes": sum(votes_map.values()),
-        "parties": parties,
-    }
+    return build_totals(rows, total_constituencies)
@@ -1,56 +1,85 @@
-from collections.abc import Generator
+from collections.abc import Collection, Generator
 from datetime import datetime, timezone
 
-from sqlalchemy import func
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.orm import Session
 
+from app.constants import PARTY_CODE_MAP
+from app.models.constituency import Constituency
 from app.models.result import Result
 from app.models.result_history import ResultHistory
 from app.models.upload_log import UploadLog
+from app.services.change_log_service import record_result_changes
+from app.services.checkpoint_service import invalidate_checkpoints
+from app.services.compaction_service import (
+    restore_archived,
+    restore_archived_after,
+)
+from app.services.history_service import (
+    previous_values,
+    set_history_active,
+    surviving_values,
+)
+from app.services.impact_service import compare_votes
 
 ROLLBACK_BATCH_SIZE = 10
+# Results written per statement by restores and batch deletes
+BULK_BATCH_SIZE = 500
+
+
+def _revert(result: Result, previous: tuple[int, int | None] | None) -> None:
+    """Put a result back to its previous values, or deactivate it if none."""
+    if previous is None:
+        # Kept, with its history, so the upload can be restored
+        result.is_active = False
+        return
+    result.votes, result.upload_id = previous
+    result.is_active = True
 
 
 def _rollback_results(db: Session, upload_id: int) -> None:
     """Roll back results affected by a deleted upload to their previous values.
 
-    For each result that was last modified by the deleted upload, find the most
-    recent history entry from a non-deleted upload and restore those values.
-    If no prior history exists, delete the result entirely.
+    Each result last modified by the deleted upload gets the values it held
+    before that upload, rebuilt from the nearest checkpoint and the history
+    since, after restoring any archived history that rebuild replays. If no
+    prior value exists, the result is deactivated.
     """
-    # Find all history entries for this upload to get affected result_ids
-    affected_result_ids = [
-        row[0] for row in db.query(ResultHistory.result_id).filter(
-            ResultHistory.upload_id == upload_id).distinct().all()
-    ]
+    restore_archived(db, upload_id)
+    previous = previous_values(db, upload_id)
+    # Results without history for the upload are left to be deactivated
+    written = db.query(
+        ResultHistory.result_id).filter(ResultHistory.upload_id == upload_id)
+    for result in db.query(Result).filter(Result.upload_id == upload_id,
+                                          Result.id.in_(written)).all():
+        _revert(result, previous.get(result.id))
+
+    # Kept, inactive, for a later restore
+    set_history_active(db, [upload_id], False)
+    _deactivate_results(db, [upload_id])
 
-    for result_id in affected_result_ids:
-        # Only roll back if this result's current upload_id matches the
-        # deleted upload (i.e., the deleted upload was the last to touch it)
-        result = db.query(Result).filter(Result.id == result_id).first()
-        if result is None or result.upload_id != upload_id:
-            continue
-
-        # Find the most recent history entry from a non-deleted upload
-        prev_history = (
-            db.query(ResultHistory).outerjoin(
-                UploadLog, ResultHistory.upload_id == UploadLog.id).filter(
-                    ResultHistory.result_id == result_id,
-                    ResultHistory.upload_id != upload_id,
-                    # Accept entries with no upload or with non-deleted uploads
-                    (ResultHistory.upload_id.is_(None) |
-                     UploadLog.deleted_at.is_(None)),
-                ).order_by(ResultHistory.id.desc()).first())
-
-        if prev_history is not None:
-            result.votes = prev_history.votes
-            result.upload_id = prev_history.upload_id
-        else:
-            db.delete(result)
 
-    # Clean up history rows for the deleted upload
-    db.query(ResultHistory).filter(
-        ResultHistory.upload_id == upload_id).delete()
+def _deactivate_results(db: Session, upload_ids: Collection[int]) -> None:
+    """Clear is_active on results still attributed to deleted uploads."""
+    # Rolled-back results must be flushed first so that only results the
+    # rollback left pointing at these uploads are matched.
+    db.flush()
+    db.query(Result).filter(Result.upload_id.in_(upload_ids),
+                            Result.is_active.is_(True)).update(
+                                {Result.is_active: False},
+                                synchronize_session=False)
+
+
+def _affected_constituency_ids(db: Session,
+                               upload_ids: Collection[int]) -> list[int]:
+    """Constituencies with results currently attributed to some uploads.
+
+    These are the only results a rollback of those uploads can change.
+    """
+    return [
+        row[0] for row in db.query(Result.constituency_id).filter(
+            Result.upload_id.in_(upload_ids)).distinct().all()
+    ]
 
 
 def soft_delete_upload(db: Session, upload_id: int) -> UploadLog | None:
@@ -64,7 +93,10 @@ def soft_delete_upload(db: Session, upload_id: int) -> UploadLog | None:
     if upload is None:
         return None
     upload.deleted_at = datetime.now(timezone.utc)
+    changed = _affected_constituency_ids(db, [upload_id])
+    invalidate_checkpoints(db, upload_id)
     _rollback_results(db, upload_id)
+    record_result_changes(db, changed, upload_id)
     db.commit()
     db.refresh(upload)
     return upload
@@ -91,6 +123,7 @@ def soft_delete_upload_streaming(
     def _generate():
         upload.deleted_at = datetime.now(timezone.utc)
         db.flush()
+        changed = _affected_constituency_ids(db, [upload_id])
 
         # Find affected result IDs
         affected_result_ids = [
@@ -106,29 +139,21 @@ def soft_delete_upload_streaming(
         }
 
         try:
+            invalidate_checkpoints(db, upload_id)
+            restore_archived(db, upload_id)
+            previous = previous_values(db, upload_id)
+            # Only results the deleted upload was the last to touch change
+            results = {
+                result.id: result
+                for result in db.query(Result).filter(
+                    Result.upload_id == upload_id)
+            }
             rolled_back = 0
             for i, result_id in enumerate(affected_result_ids):
-                result = db.query(Result).filter(Result.id == result_id).first()
-                if result is None or result.upload_id != upload_id:
-                    # Not affected by this upload, skip but count
-                    rolled_back += 1
-                else:
-                    prev_history = (db.query(ResultHistory).outerjoin(
-                        UploadLog,
-                        ResultHistory.upload_id == UploadLog.id,
-                    ).filter(
-                        ResultHistory.result_id == result_id,
-                        ResultHistory.upload_id != upload_id,
-                        (ResultHistory.upload_id.is_(None) |
-                         UploadLog.deleted_at.is_(None)),
-                    ).order_by(ResultHistory.id.desc()).first())
-
-                    if prev_history is not None:
-                        result.votes = prev_history.votes
-                        result.upload_id = prev_history.upload_id
-                    else:
-                        db.delete(result)
-                    rolled_back += 1
+                result = results.get(result_id)
+                if result is not None:
+                    _revert(result, previous.get(result_id))
+                rolled_back += 1
 
                 processed = i + 1
                 if processed % batch_size == 0 or processed == total_affected:
@@ -141,9 +166,9 @@ def soft_delete_upload_streaming(
                         "percentage": percentage,
                     }
 
-            # Clean up history rows
-            db.query(ResultHistory).filter(
-                ResultHistory.upload_id == upload_id).delete()
+            set_history_active(db, [upload_id], False)
+            _deactivate_results(db, [upload_id])
+            record_result_changes(db, changed, upload_id)
 
             db.commit()
             yield {
@@ -163,6 +188,274 @@ def soft_delete_upload_streaming(
     return _generate()
 
 
+def _live_uploads(db: Session,
+                  upload_ids: Collection[int]) -> list[UploadLog] | None:
+    """The uploads with these ids, or None unless all exist and are live."""
+    uploads = db.query(UploadLog).filter(UploadLog.id.in_(upload_ids),
+                                         UploadLog.deleted_at.is_(None)).all()
+    if len(uploads) != len(set(upload_ids)):
+        return None
+    return uploads
+
+
+def _prepare_batch_rollback(db: Session,
+                            uploads: list[UploadLog]) -> list[dict]:
+    """Soft-delete uploads and work out what their results fall back to.
+
+    Returns one row per result to write back: its id and, when an upload
+    outside the batch wrote it before, that upload's votes; the others are
+    deactivated once the rows are written.
+    """
+    upload_ids = sorted(upload.id for upload in uploads)
+    deleted_at = datetime.now(timezone.utc)
+    for upload in uploads:
+        upload.deleted_at = deleted_at
+    invalidate_checkpoints(db, upload_ids[0])
+    # Covers every chunk from the checkpoint before the first upload on
+    restore_archived(db, upload_ids[0])
+    set_history_active(db, upload_ids, False)
+    surviving = surviving_values(db, upload_ids)
+    written = select(ResultHistory.result_id).where(
+        ResultHistory.upload_id.in_(upload_ids))
+    affected = db.execute(
+        select(Result.id).where(Result.upload_id.in_(upload_ids),
+                                Result.id.in_(written)).order_by(
+                                    Result.id)).scalars()
+    return [{
+        "id": result_id,
+        "votes": surviving[result_id][0],
+        "upload_id": surviving[result_id][1],
+        "is_active": True,
+    } if result_id in surviving else {
+        "id": result_id,
+        "is_active": False,
+    } for result_id in affected]
+
+
+def _write_back(db: Session, rows: list[dict]) -> None:
+    """Bulk UPDATE results by primary key."""
+    for has_value in (True, False):
+        batch = [row for row in rows if ("votes" in row) == has_value]
+        if batch:
+            db.execute(update(Result), batch)
+
+
+def soft_delete_uploads(db: Session,
+                        upload_ids: Collection[int]) -> list[UploadLog] | None:
+    """Soft-delete several uploads at once.
+
+    Each result last written by one of them falls straight back to the
+    latest value from an upload outside the batch, computed in one replay
+    from the checkpoint before the first, rather than one rollback per
+    upload. Commits once. Returns None, deleting nothing, unless every
+    upload exists and is live.
+    """
+    uploads = _live_uploads(db, upload_ids)
+    if uploads is None:
+        return None
+    changed = _affected_constituency_ids(db, upload_ids)
+    _write_back(db, _prepare_batch_rollback(db, uploads))
+    _deactivate_results(db, upload_ids)
+    record_result_changes(db, changed)
+    db.commit()
+    return uploads
+
+
+def soft_delete_uploads_streaming(
+    db: Session,
+    upload_ids: Collection[int],
+    batch_size: int = BULK_BATCH_SIZE,
+) -> Generator[dict, None, None] | None:
+    """Soft-delete several uploads, streaming progress per batch of results.
+
+    Returns None unless every upload exists and is live. Otherwise yields:
+      - started: {upload_ids, total_affected}
+      - progress: {processed, total, percentage}  (every batch_size results)
+      - complete: {upload_ids, message, rolled_back}
+      - error: {upload_ids, detail}  (on exception; nothing is deleted)
+    """
+    uploads = _live_uploads(db, upload_ids)
+    if uploads is None:
+        return None
+    upload_ids = sorted(upload.id for upload in uploads)
+
+    def _generate():
+        try:
+            changed = _affected_constituency_ids(db, upload_ids)
+            rows = _prepare_batch_rollback(db, uploads)
+        except Exception:  # noqa: BLE001
+            db.rollback()
+            yield {
+                "event": "error",
+                "upload_ids": upload_ids,
+                "detail": "Delete failed due to a database error",
+            }
+            return
+        total_affected = len(rows)
+        yield {
+            "event": "started",
+            "upload_ids": upload_ids,
+            "total_affected": total_affected,
+        }
+
+        try:
+            for start in range(0, total_affected, batch_size):
+                batch = rows[start:start + batch_size]
+                _write_back(db, batch)
+                processed = start + len(batch)
+                yield {
+                    "event": "progress",
+                    "processed": processed,
+                    "total": total_affected,
+                    "percentage": int((processed / total_affected) * 100),
+                }
+            _deactivate_results(db, upload_ids)
+            record_result_changes(db, changed)
+            db.commit()
+            yield {
+                "event": "complete",
+                "upload_ids": upload_ids,
+                "message": "Uploads deleted",
+                "rolled_back": total_affected,
+            }
+        except Exception:  # noqa: BLE001
+            db.rollback()
+            yield {
+                "event": "error",
+                "upload_ids": upload_ids,
+                "detail": "Delete failed due to a database error",
+            }
+
+    return _generate()
+
+
+def _deleted_upload(db: Session, upload_id: int) -> UploadLog | None:
+    return (db.query(UploadLog).filter(
+        UploadLog.id == upload_id, UploadLog.deleted_at.is_not(None)).first())
+
+
+def _reapply_results(db: Session,
+                     upload_id: int,
+                     result_ids: list[int] | None = None) -> int:
+    """Write a restored upload's values back where it is the latest writer.
+
+    One UPDATE covers every result the upload has history for (or those in
+    ``result_ids``) that no later live upload has written since, taking the
+    votes from its history. Returns the number of results written.
+    """
+    written = select(
+        ResultHistory.result_id).where(ResultHistory.upload_id == upload_id)
+    votes = select(ResultHistory.votes).where(
+        ResultHistory.result_id == Result.id,
+        ResultHistory.upload_id == upload_id).order_by(
+            ResultHistory.id.desc()).limit(1).scalar_subquery()
+    conditions = [
+        Result.id.in_(written),
+        # Inactive results have no live writer left
+        or_(Result.is_active.is_(False), Result.upload_id.is_(None),
+            Result.upload_id < upload_id),
+    ]
+    if result_ids is not None:
+        conditions.append(Result.id.in_(result_ids))
+    return db.execute(
+        update(Result).where(*conditions).values(votes=votes,
+                                                 upload_id=upload_id,
+                                                 is_active=True)).rowcount
+
+
+def _prepare_restore(db: Session, upload: UploadLog) -> None:
+    """Undelete an upload and reactivate its history."""
+    upload.deleted_at = None
+    # Every state from the upload onwards now includes it again
+    invalidate_checkpoints(db, upload.id)
+    restore_archived_after(db, upload.id)
+    set_history_active(db, [upload.id], True)
+
+
+def restore_upload(db: Session, upload_id: int) -> UploadLog | None:
+    """Undo the soft delete of an upload.
+
+    Its history rows become active again and its values are written back
+    to every result no later upload has written since, in one set-based
+    pass; the results version is bumped once for the constituencies that
+    changed. Returns None if no deleted upload has this id.
+    """
+    upload = _deleted_upload(db, upload_id)
+    if upload is None:
+        return None
+    _prepare_restore(db, upload)
+    _reapply_results(db, upload_id)
+    record_result_changes(db, _affected_constituency_ids(db, [upload_id]),
+                          upload_id)
+    db.commit()
+    db.refresh(upload)
+    return upload
+
+
+def restore_upload_streaming(
+    db: Session,
+    upload_id: int,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> Generator[dict, None, None] | None:
+    """Restore a deleted upload, streaming progress per batch of results.
+
+    Returns None if no deleted upload has this id. Otherwise yields:
+      - started: {upload_id, total_affected}
+      - progress: {processed, total, percentage}  (every batch_size results)
+      - complete: {upload_id, message, restored}
+      - error: {upload_id, detail}  (on exception)
+    """
+    upload = _deleted_upload(db, upload_id)
+    if upload is None:
+        return None
+
+    def _generate():
+        affected_result_ids = [
+            row[0] for row in db.query(ResultHistory.result_id).filter(
+                ResultHistory.upload_id == upload_id).distinct().order_by(
+                    ResultHistory.result_id).all()
+        ]
+        total_affected = len(affected_result_ids)
+        yield {
+            "event": "started",
+            "upload_id": upload_id,
+            "total_affected": total_affected,
+        }
+
+        try:
+            _prepare_restore(db, upload)
+            restored = 0
+            for start in range(0, total_affected, batch_size):
+                batch = affected_result_ids[start:start + batch_size]
+                restored += _reapply_results(db, upload_id, batch)
+                processed = start + len(batch)
+                yield {
+                    "event": "progress",
+                    "processed": processed,
+                    "total": total_affected,
+                    "percentage": int((processed / total_affected) * 100),
+                }
+            record_result_changes(db,
+                                  _affected_constituency_ids(db, [upload_id]),
+                                  upload_id)
+            db.commit()
+            yield {
+                "event": "complete",
+                "upload_id": upload_id,
+                "message": "Upload restored",
+                "restored": restored,
+            }
+        except Exception:  # noqa: BLE001
+            db.rollback()
+            yield {
+                "event": "error",
+                "upload_id": upload_id,
+                "detail": "Restore failed due to a database error",
+            }
+
+    return _generate()
+
+
 def get_upload_stats(db: Session) -> dict:
     """Compute aggregate statistics for non-deleted uploads."""
     base = db.query(UploadLog).filter(UploadLog.deleted_at.is_(None))
@@ -182,3 +475,86 @@ def get_upload_stats(db: Session) -> dict:
         "success_rate": success_rate,
         "total_lines_processed": total_lines,
     }
+
+
+def get_upload_impact(db: Session, upload_id: int) -> dict | None:
+    """What deleting an upload would change, without changing anything.
+
+    Mirrors ``_rollback_results``: results the upload last wrote revert to
+    their previous values (one pass from the nearest checkpoint), or are
+    deactivated when they have none. One more query reads the active results
+    of the constituencies involved, so winners and votes can be compared
+    before and after. Returns None if the upload is not found or already
+    deleted.
+    """
+    upload = (db.query(UploadLog).filter(
+        UploadLog.id == upload_id, UploadLog.deleted_at.is_(None)).first())
+    if upload is None:
+        return None
+
+    previous = previous_values(db, upload_id)
+    written = select(
+        ResultHistory.result_id).where(ResultHistory.upload_id == upload_id)
+    involved = select(
+        Result.constituency_id).where(Result.upload_id == upload_id)
+    rows = db.execute(
+        select(
+            Result.id,
+            Result.constituency_id,
+            Constituency.name,
+            Result.party_code,
+            Result.votes,
+            Result.upload_id,
+            Result.id.in_(written).label("written"),
+        ).join(Constituency, Constituency.id == Result.constituency_id).where(
+            Result.constituency_id.in_(involved),
+            Result.is_active.is_(True),
+        ))
+
+    names: dict[int, str] = {}
+    before: dict[int, dict[str, int]] = {}
+    after: dict[int, dict[str, int]] = {}
+    reverted = removed = 0
+    for row in rows:
+        names[row.constituency_id] = row.name
+        before.setdefault(row.constituency_id, {})[row.party_code] = row.votes
+        kept = after.setdefault(row.constituency_id, {})
+        if row.upload_id != upload_id:
+            kept[row.party_code] = row.votes
+        elif row.written and row.id in previous:
+            kept[row.party_code] = previous[row.id][0]
+            reverted += 1
+        else:
+            removed += 1
+
+    changes = compare_votes(before, after)
+    constituencies = [{
+        "constituency_id": constituency_id,
+        "constituency_name": names[constituency_id],
+        "change": "reverted" if after[constituency_id] else "removed",
+        "winning_party_code_before": old_winner,
+        "winning_party_code_after": new_winner,
+    } for constituency_id, old_winner, new_winner in changes.constituencies]
+    constituencies.sort(key=lambda c: c["constituency_name"])
+
+    parties = [{
+        "party_code": code,
+        "party_name": PARTY_CODE_MAP.get(code, code),
+        "vote_delta": changes.vote_deltas.get(code, 0),
+        "seat_delta": changes.seat_delta(code),
+    } for code in changes.party_codes()
+               if changes.vote_deltas.get(code) or changes.seat_delta(code)]
+    parties.sort(key=lambda p: (-abs(p["seat_delta"]), -abs(p["vote_delta"]),
+                                p["party_code"]))
+
+    changed = [c["change"] for c in constituencies]
+    return {
+        "upload_id": upload_id,
+        "results_reverted": reverted,
+        "results_removed": removed,
+        "constituencies_reverted": changed.count("reverted"),
+        "constituencies_removed": changed.count("removed"),
+        "seats_flipped": changes.seats_flipped,
+        "constituencies": constituencies,
+        "parties": parties,
+    }
@@ -0,0 +1,84 @@
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.results_version import ResultsVersion
+
+logger = logging.getLogger(__name__)
+
+RESULTS_VERSION_ROW_ID = 1
+# PostgreSQL channel carrying each committed version to every API worker
+RESULTS_CHANNEL = "results_changed"
+_PENDING_VERSION_KEY = "pending_results_version"
+
+_listeners: list[Callable[[int], None]] = []
+
+
+def get_results_version(db: Session) -> int:
+    """Return the committed results version (0 before the first change)."""
+    version = db.execute(
+        select(ResultsVersion.version).where(
+            ResultsVersion.id == RESULTS_VERSION_ROW_ID)).scalar()
+    return version or 0
+
+
+def bump_results_version(db: Session) -> int:
+    """Increment the results version inside the caller's transaction.
+
+    Must be called by every write path that changes results, before it
+    commits. Returns the new version.
+    """
+    version = db.execute(
+        update(ResultsVersion).where(
+            ResultsVersion.id == RESULTS_VERSION_ROW_ID).values(
+                version=ResultsVersion.version + 1).returning(
+                    ResultsVersion.version)).scalar()
+    if version is None:
+        # Fresh database without the seeded row (tests, create_all)
+        version = 1
+        db.add(ResultsVersion(id=RESULTS_VERSION_ROW_ID, version=version))
+        db.flush()
+    if db.get_bind().dialect.name == "postgresql":
+        # Delivered by PostgreSQL only if (and when) the transaction commits
+        db.execute(select(func.pg_notify(RESULTS_CHANNEL, str(version))))
+    db.info[_PENDING_VERSION_KEY] = version
+    return version
+
+
+def add_results_listener(listener: Callable[[int], None]) -> None:
+    """Call ``listener(version)`` after each commit that bumped the version.
+
+    Listeners run synchronously in the notifying thread and must not block.
+    The same version may be delivered more than once (by the local commit
+    and again by the results watcher), so listeners must be idempotent.
+    """
+    _listeners.append(listener)
+
+
+def remove_results_listener(listener: Callable[[int], None]) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def notify_results_listeners(version: int) -> None:
+    """Tell every registered listener that ``version`` is committed."""
+    for listener in list(_listeners):
+        try:
+            listener(version)
+        except Exception:  # noqa: BLE001
+            logger.exception("Results listener failed for version %s",
+                             version)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_results_committed(session: Session) -> None:
+    version = session.info.pop(_PENDING_VERSION_KEY, None)
+    if version is not None:
+        notify_results_listeners(version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_version(session: Session) -> None:
+    session.info.pop(_PENDING_VERSION_KEY, None)
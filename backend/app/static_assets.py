@@ -0,0 +1,216 @@
+"""Fingerprinted, precompressed static assets.
+
+Each file in ``static/`` is copied to the asset build directory under a
+content-addressed name (``uk-constituencies.<hash>.topojson``) next to
+``.gz`` and ``.br`` siblings compressed at maximum level. Because a name
+changes whenever the content does, ``/assets`` responses are cacheable
+forever. ``GET /api/assets/manifest`` maps logical names to current URLs.
+
+The build runs at startup and is idempotent. It can also run ahead of time,
+from ``backend/``::
+
+    python -m app.static_assets
+"""
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+from pathlib import Path
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.compression import (
+    BROTLI,
+    GZIP,
+    STATIC_LEVELS,
+    available_encodings,
+    compress,
+    is_compressible,
+    negotiate,
+)
+from app.config import settings
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+ASSETS_URL_PATH = "/assets"
+FINGERPRINT_LENGTH = 12
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+SIBLING_SUFFIXES = {GZIP: ".gz", BROTLI: ".br"}
+
+# TopoJSON is JSON; registering it makes the map data compressible
+mimetypes.add_type("application/json", ".topojson")
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+asset_manifest: dict[str, str] = {}
+
+
+def asset_build_dir() -> Path:
+    if settings.STATIC_BUILD_DIR:
+        return Path(settings.STATIC_BUILD_DIR)
+    return STATIC_DIR.parent / "static-build"
+
+
+def fingerprint_name(name: str, content: bytes) -> str:
+    """``name`` with a content hash inserted before its extension."""
+    digest = hashlib.sha256(content).hexdigest()[:FINGERPRINT_LENGTH]
+    path = Path(name)
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def _write_once(path: Path, data: bytes) -> None:
+    # Content-addressed: an existing file already holds these bytes.
+    # Several workers may build at once, so write atomically.
+    if path.exists():
+        return
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def build_assets(source_dir: Path, build_dir: Path) -> dict[str, str]:
+    """Fingerprint and precompress every file in ``source_dir``.
+
+    Returns the manifest of logical name to fingerprinted file name.
+    """
+    build_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for source in sorted(source_dir.iterdir()):
+        if not source.is_file() or source.name.startswith("."):
+            continue
+        content = source.read_bytes()
+        name = fingerprint_name(source.name, content)
+        _write_once(build_dir / name, content)
+        if is_compressible(mimetypes.guess_type(name)[0]):
+            for encoding in available_encodings():
+                sibling = build_dir / f"{name}{SIBLING_SUFFIXES[encoding]}"
+                if not sibling.exists():
+                    _write_once(sibling,
+                                compress(content, encoding, STATIC_LEVELS))
+        manifest[source.name] = name
+    return manifest
+
+
+def load_asset_manifest() -> dict[str, str]:
+    """Build the assets and publish their URLs to the manifest endpoint."""
+    if not STATIC_DIR.is_dir():
+        return asset_manifest
+    manifest = build_assets(STATIC_DIR, asset_build_dir())
+    asset_manifest.clear()
+    asset_manifest.update({
+        logical: f"{ASSETS_URL_PATH}/{name}"
+        for logical, name in manifest.items()
+    })
+    return asset_manifest
+
+
+def parse_range(value: str, size: int) -> tuple[int, int] | None:
+    """Inclusive byte range for a single-range header; None if invalid.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = _RANGE_PATTERN.match(value.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """Serves the asset build directory with immutable caching.
+
+    Clients that accept gzip or brotli get the precompressed sibling; a
+    ``Range`` request gets the requested bytes of the uncompressed file.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        headers = Headers(scope=scope)
+        range_header = headers.get("range")
+        response = None
+        if range_header is None:
+            response = await self._precompressed(path, headers)
+        if response is None:
+            response = await super().get_response(path, scope)
+            if range_header is not None and isinstance(
+                    response, FileResponse) and response.status_code == 200:
+                response = await self._partial(response, headers,
+                                               range_header)
+            response.headers["Accept-Ranges"] = "bytes"
+        if response.status_code in (200, 206, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    async def _precompressed(self, path: str,
+                             headers: Headers) -> Response | None:
+        encoding = negotiate(headers.get("accept-encoding", ""))
+        if encoding is None or not is_compressible(
+                mimetypes.guess_type(path)[0]):
+            return None
+        full_path, stat_result = await anyio.to_thread.run_sync(
+            self.lookup_path, path + SIBLING_SUFFIXES[encoding])
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return None
+        response = FileResponse(full_path,
+                                stat_result=stat_result,
+                                media_type=mimetypes.guess_type(path)[0],
+                                headers={
+                                    "Content-Encoding": encoding,
+                                    "Vary": "Accept-Encoding",
+                                })
+        if self.is_not_modified(response.headers, headers):
+            return Response(status_code=304, headers={
+                "ETag": response.headers["etag"],
+                "Vary": "Accept-Encoding",
+            })
+        return response
+
+    async def _partial(self, response: FileResponse, headers: Headers,
+                       range_header: str) -> Response:
+        size = response.stat_result.st_size
+        if_range = headers.get("if-range")
+        if if_range is not None and if_range != response.headers["etag"]:
+            return response
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416,
+                            headers={"Content-Range": f"bytes */{size}"})
+        if byte_range is None:
+            return response
+        start, end = byte_range
+
+        def read_range() -> bytes:
+            with open(response.path, "rb") as f:
+                f.seek(start)
+                return f.read(end - start + 1)
+
+        content = await anyio.to_thread.run_sync(read_range)
+        return Response(content=content,
+                        status_code=206,
+                        media_type=response.media_type,
+                        headers={
+                            "Content-Range": f"bytes {start}-{end}/{size}",
+                            "ETag": response.headers["etag"],
+                            "Last-Modified":
+                            response.headers["last-modified"],
+                        })
+
+
+if __name__ == "__main__":
+    for logical, url in load_asset_manifest().items():
+        print(f"{logical} -> {url}")
@@ -0,0 +1,3 @@
+"""
+init config file for benchmarks module
+"""
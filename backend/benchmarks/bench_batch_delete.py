@@ -0,0 +1,72 @@
+"""Delete a run of uploads: one rollback per upload vs one batch pass.
+
+Appends ``REFRESH_CYCLES`` uploads that each rewrite every result, then
+deletes the last ``BATCH_UPLOADS`` of them, newest first, either one
+``soft_delete_upload`` at a time (each rolling every result back to the
+upload before, which the next delete undoes again) or with a single
+``soft_delete_uploads``. Each run starts from a freshly seeded database.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_batch_delete
+"""
+import time
+
+from sqlalchemy import select
+
+from app.models.result import Result
+from app.services.upload_service import soft_delete_upload, soft_delete_uploads
+from benchmarks.bench_history import append_refresh_cycles
+from benchmarks.synthetic import (
+    DATASET_SIZES,
+    bench_session,
+    count_statements,
+    create_bench_engine,
+    seed_dataset,
+)
+
+REFRESH_CYCLES = 10
+BATCH_UPLOADS = 5
+
+
+def one_by_one(db, upload_ids: list[int]) -> None:
+    for upload_id in upload_ids:
+        soft_delete_upload(db, upload_id)
+
+
+def batched(db, upload_ids: list[int]) -> None:
+    soft_delete_uploads(db, upload_ids)
+
+
+def run(size: int, delete) -> tuple[float, int, list]:
+    """Seed, delete, and return (ms, statements, final results)."""
+    engine = create_bench_engine()
+    seed_dataset(engine, size)
+    last = append_refresh_cycles(engine, REFRESH_CYCLES)
+    upload_ids = list(range(last, last - BATCH_UPLOADS, -1))
+    with bench_session(engine) as db, count_statements(engine) as counter:
+        start = time.perf_counter()
+        delete(db, upload_ids)
+        elapsed = (time.perf_counter() - start) * 1000
+        statements = counter["statements"]
+    with bench_session(engine) as db:
+        state = db.execute(
+            select(Result.id, Result.votes, Result.upload_id,
+                   Result.is_active).order_by(Result.id)).all()
+    engine.dispose()
+    return elapsed, statements, state
+
+
+def main() -> None:
+    print(f"{'constituencies':>14} {'uploads':>7} {'one-by-one ms':>13} "
+          f"{'statements':>10} {'batch ms':>9} {'statements':>10}")
+    for size in DATASET_SIZES:
+        sequential_ms, sequential_sql, expected = run(size, one_by_one)
+        batch_ms, batch_sql, state = run(size, batched)
+        assert state == expected
+        print(f"{size:>14,} {BATCH_UPLOADS:>7} {sequential_ms:>13.1f} "
+              f"{sequential_sql:>10,} {batch_ms:>9.1f} {batch_sql:>10,}")
+
+
+if __name__ == "__main__":
+    main()
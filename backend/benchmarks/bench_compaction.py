@@ -0,0 +1,98 @@
+"""Compact ``result_history`` after refresh cycles that mostly repeat votes.
+
+Appends ``REFRESH_CYCLES`` uploads that each rewrite every result, changing
+the votes of one result in ``CHANGE_EVERY``, checkpoints the last one, then
+times one ``compact_history`` pass and a full replay of the results as of
+an upload before the checkpoint, with the history hot and compacted.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_compaction
+"""
+import time
+
+from sqlalchemy import bindparam, insert, select, update
+
+from app.models.result import Result
+from app.models.result_history import ResultHistory
+from app.models.upload_log import UploadLog
+from app.services.checkpoint_service import write_checkpoint
+from app.services.compaction_service import compact_history
+from app.services.history_service import results_state_as_of
+from benchmarks.synthetic import (
+    DATASET_SIZES,
+    UPLOAD_COUNT,
+    bench_session,
+    create_bench_engine,
+    seed_dataset,
+    time_call,
+)
+
+REFRESH_CYCLES = 30
+CHANGE_EVERY = 10
+
+
+def append_refresh_cycles(engine, cycles: int) -> int:
+    """Add ``cycles`` uploads rewriting every result, mostly unchanged;
+    returns the last upload id."""
+    with engine.begin() as conn:
+        votes = dict(conn.execute(select(Result.id, Result.votes)).all())
+        for cycle in range(cycles):
+            upload_id = UPLOAD_COUNT + cycle + 1
+            conn.execute(insert(UploadLog), [{
+                "id": upload_id,
+                "filename": f"refresh-{cycle}.txt",
+                "status": "completed",
+                "total_lines": 0,
+                "processed_lines": 0,
+                "error_lines": 0,
+                "errors": [],
+            }])
+            for result_id in votes:
+                if (result_id + cycle) % CHANGE_EVERY == 0:
+                    votes[result_id] += 1
+            conn.execute(insert(ResultHistory), [{
+                "result_id": result_id,
+                "upload_id": upload_id,
+                "votes": count,
+            } for result_id, count in votes.items()])
+        last = UPLOAD_COUNT + cycles
+        conn.execute(
+            update(Result).where(Result.id == bindparam("result_id")).values(
+                votes=bindparam("votes"), upload_id=last, is_active=True),
+            [{
+                "result_id": result_id,
+                "votes": count
+            } for result_id, count in votes.items()])
+    return last
+
+
+def main() -> None:
+    print(f"{'constituencies':>14} {'history':>9} {'archived':>9} "
+          f"{'compact ms':>10} {'archive KB':>10} {'reclaimed KB':>12} "
+          f"{'replay ms':>9} {'compacted':>9}")
+    for size in DATASET_SIZES:
+        engine = create_bench_engine()
+        seed_dataset(engine, size)
+        last = append_refresh_cycles(engine, REFRESH_CYCLES)
+        as_of = last - REFRESH_CYCLES // 2
+        with bench_session(engine) as db:
+            write_checkpoint(db, last)
+            db.commit()
+            history_rows = db.query(ResultHistory).count()
+            expected = results_state_as_of(db, as_of)
+            replay = time_call(lambda s: results_state_as_of(s, as_of), db)
+            start = time.perf_counter()
+            report = compact_history(db)
+            compact_ms = (time.perf_counter() - start) * 1000
+            assert results_state_as_of(db, as_of) == expected
+            compacted = time_call(lambda s: results_state_as_of(s, as_of), db)
+        print(f"{size:>14,} {history_rows:>9,} {report.rows_archived:>9,} "
+              f"{compact_ms:>10.1f} {report.archive_bytes / 1024:>10.1f} "
+              f"{report.bytes_reclaimed / 1024:>12.1f} {replay:>9.1f} "
+              f"{compacted:>9.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Export every result: paging ``/api/constituencies`` vs the streamed export.
+
+Pages through ``get_all_constituencies`` 200 at a time and encodes each page
+as JSON, as scrapers do, against ``export_results`` in both formats, with
+the statements run and the peak memory of each.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_export
+"""
+import tracemalloc
+
+from sqlalchemy.orm import Session
+
+from app.services.constituency_service import get_all_constituencies
+from app.services.export_service import export_results
+from app.services.response_cache import encode_json
+from benchmarks.synthetic import (
+    DATASET_SIZES,
+    bench_session,
+    count_statements,
+    create_bench_engine,
+    seed_dataset,
+    time_call,
+)
+
+PAGE_SIZE = 200
+
+
+def paged(db: Session) -> int:
+    """Bytes sent fetching every page of ``/api/constituencies``."""
+    sent = page = 0
+    while True:
+        page += 1
+        body = get_all_constituencies(db, page=page, page_size=PAGE_SIZE)
+        sent += len(encode_json(body))
+        if page * PAGE_SIZE >= body["total"]:
+            return sent
+
+
+def exported(export_format: str):
+
+    def run(db: Session) -> int:
+        return sum(map(len, export_results(db, export_format)))
+
+    return run
+
+
+def _peak_kib(fn, db: Session) -> float:
+    db.expunge_all()
+    tracemalloc.start()
+    fn(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    print(f"{'constituencies':>14} {'plan':>8} {'ms':>9} {'stmts':>6} "
+          f"{'peak KiB':>10} {'KiB sent':>9}")
+    for size in DATASET_SIZES:
+        engine = create_bench_engine()
+        seed_dataset(engine, size)
+        with bench_session(engine) as db:
+            for label, fn in (("paged", paged), ("csv", exported("csv")),
+                              ("ndjson", exported("ndjson"))):
+                with count_statements(engine) as counter:
+                    sent = fn(db)
+                elapsed = time_call(fn, db, repeat=3)
+                peak = _peak_kib(fn, db)
+                print(f"{size:>14,} {label:>8} {elapsed:>9.1f} "
+                      f"{counter['statements']:>6} {peak:>10,.0f} "
+                      f"{sent / 1024:>9,.0f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
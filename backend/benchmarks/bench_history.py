@@ -0,0 +1,144 @@
+"""Rebuild results as of the latest upload: full replay vs checkpoint.
+
+Appends ``REFRESH_CYCLES`` uploads that each rewrite every result, so
+``result_history`` holds one row per result per cycle, then times
+``results_state_as_of`` and the rollback lookup ``previous_values`` with
+no checkpoint and with a checkpoint a few uploads back. Last, the diff
+between two uploads, as two full-state rebuilds against ``upload_diff``'s
+range scan: after a refresh rewriting every result, and after a partial
+upload writing ``PARTIAL_CONSTITUENCIES`` constituencies.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_history
+"""
+from sqlalchemy import insert, select, update
+
+from app.models.result import Result
+from app.models.result_history import ResultHistory
+from app.models.state_checkpoint import StateCheckpoint
+from app.models.upload_log import UploadLog
+from app.services.checkpoint_service import encode_state
+from app.services.history_service import (
+    previous_values,
+    results_state_as_of,
+)
+from app.services.impact_service import upload_diff
+from benchmarks.synthetic import (
+    DATASET_SIZES,
+    UPLOAD_COUNT,
+    bench_session,
+    create_bench_engine,
+    seed_dataset,
+    time_call,
+)
+
+REFRESH_CYCLES = 30
+CHECKPOINT_LAG = 5
+PARTIAL_CONSTITUENCIES = 10
+
+
+def append_refresh_cycles(engine, cycles: int) -> int:
+    """Add ``cycles`` uploads that each rewrite every result; returns the
+    last upload id."""
+    with engine.begin() as conn:
+        results = conn.execute(select(Result.id, Result.votes)).all()
+        for cycle in range(cycles):
+            upload_id = UPLOAD_COUNT + cycle + 1
+            conn.execute(insert(UploadLog), [{
+                "id": upload_id,
+                "filename": f"refresh-{cycle}.txt",
+                "status": "completed",
+                "total_lines": 0,
+                "processed_lines": 0,
+                "error_lines": 0,
+                "errors": [],
+            }])
+            conn.execute(insert(ResultHistory), [{
+                "result_id": r.id,
+                "upload_id": upload_id,
+                "votes": r.votes + cycle,
+            } for r in results])
+        # The last upload wrote every result, so deleting it rolls all back
+        conn.execute(update(Result).values(upload_id=UPLOAD_COUNT + cycles))
+    return UPLOAD_COUNT + cycles
+
+
+def append_partial_upload(engine, upload_id: int, constituencies: int) -> None:
+    """Add an upload writing the results of the first ``constituencies``
+    constituencies, one more vote each."""
+    with engine.begin() as conn:
+        results = conn.execute(
+            select(Result.id, Result.votes).where(
+                Result.constituency_id <= constituencies)).all()
+        conn.execute(insert(UploadLog), [{
+            "id": upload_id,
+            "filename": "partial.txt",
+            "status": "completed",
+            "total_lines": 0,
+            "processed_lines": 0,
+            "error_lines": 0,
+            "errors": [],
+        }])
+        conn.execute(insert(ResultHistory), [{
+            "result_id": r.id,
+            "upload_id": upload_id,
+            "votes": r.votes + REFRESH_CYCLES,
+        } for r in results])
+
+
+def main() -> None:
+    print(f"{'constituencies':>14} {'history':>9} {'plan':>12} {'ms':>9}")
+    for size in DATASET_SIZES:
+        engine = create_bench_engine()
+        seed_dataset(engine, size)
+        last = append_refresh_cycles(engine, REFRESH_CYCLES)
+        with bench_session(engine) as db:
+            history_rows = db.query(ResultHistory).count()
+            replay = time_call(lambda s: results_state_as_of(s, last), db)
+            rollback_replay = time_call(lambda s: previous_values(s, last),
+                                        db)
+            expected = results_state_as_of(db, last)
+            expected_previous = previous_values(db, last)
+            checkpoint_at = last - CHECKPOINT_LAG
+            state = results_state_as_of(db, checkpoint_at)
+            db.add(
+                StateCheckpoint(upload_id=checkpoint_at,
+                                result_count=len(state),
+                                data=encode_state(
+                                    (result_id, votes, checkpoint_at)
+                                    for result_id, votes in state.items())))
+            db.commit()
+            assert results_state_as_of(db, last) == expected
+            assert previous_values(db, last) == expected_previous
+            checkpointed = time_call(lambda s: results_state_as_of(s, last),
+                                     db)
+            rollback_checkpointed = time_call(
+                lambda s: previous_values(s, last), db)
+            diff_replay = time_call(
+                lambda s: (results_state_as_of(s, last - 1),
+                           results_state_as_of(s, last)), db)
+            diff = time_call(lambda s: upload_diff(s, last - 1, last), db)
+        append_partial_upload(engine, last + 1, PARTIAL_CONSTITUENCIES)
+        with bench_session(engine) as db:
+            partial_replay = time_call(
+                lambda s: (results_state_as_of(s, last),
+                           results_state_as_of(s, last + 1)), db)
+            partial = time_call(lambda s: upload_diff(s, last, last + 1), db)
+        for label, elapsed in (
+            ("replay", replay),
+            ("checkpoint", checkpointed),
+            ("rollback", rollback_replay),
+            ("rollback+cp", rollback_checkpointed),
+            ("diff replay", diff_replay),
+            ("diff", diff),
+            ("partial rep.", partial_replay),
+            ("partial diff", partial),
+        ):
+            print(f"{size:>14,} {history_rows:>9,} {label:>12} "
+                  f"{elapsed:>9.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare response_model validation and encoding with pre-encoded bodies.
+
+Times only the serialisation of one 200-item ``/api/constituencies`` page;
+the page itself is queried once up front.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_responses
+"""
+import json
+import statistics
+import time
+
+from app.schemas.constituency import ConstituencyListResponse
+from app.services import response_cache as response_cache_module
+from app.services.constituency_service import get_all_constituencies
+from app.services.response_cache import encode_json, response_cache
+from benchmarks.synthetic import (
+    DATASET_SIZES,
+    bench_session,
+    create_bench_engine,
+    seed_dataset,
+)
+
+PAGE_SIZE = 200
+
+
+def fastapi_encode(data: dict) -> bytes:
+    """What a ``response_model`` route does: validate, dump, then render."""
+    model = ConstituencyListResponse.model_validate(data)
+    return json.dumps(model.model_dump(mode="json"),
+                      ensure_ascii=False,
+                      separators=(",", ":")).encode()
+
+
+def _median_ms(fn, repeat: int = 21) -> float:
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    encoder = "orjson" if response_cache_module.orjson else "json"
+    print(f"encoder: {encoder}")
+    print(f"{'constituencies':>14} {'plan':>10} {'ms':>9} {'KiB':>8}")
+    for size in DATASET_SIZES:
+        engine = create_bench_engine()
+        seed_dataset(engine, size)
+        with bench_session(engine) as db:
+            data = get_all_constituencies(db, page_size=PAGE_SIZE)
+        assert json.loads(fastapi_encode(data)) == json.loads(
+            encode_json(data))
+        response_cache.put(0, "page", encode_json(data))
+        plans = (
+            ("pydantic", lambda: fastapi_encode(data)),
+            ("encode", lambda: encode_json(data)),
+            ("cached", lambda: response_cache.get(0, "page")),
+        )
+        for label, fn in plans:
+            elapsed = _median_ms(fn)
+            print(f"{size:>14,} {label:>10} {elapsed:>9.3f} "
+                  f"{len(fn()) / 1024:>8.1f}")
+        response_cache.clear()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
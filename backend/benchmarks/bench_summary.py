@@ -0,0 +1,85 @@
+"""Compare the Core summary query with ORM hydration of every result.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_summary
+"""
+import tracemalloc
+
+from sqlalchemy.orm import Session, joinedload, subqueryload
+
+from app.models.constituency import Constituency
+from app.services.constituency_service import get_all_constituencies_summary
+from benchmarks.synthetic import (
+    DATASET_SIZES,
+    bench_session,
+    count_statements,
+    create_bench_engine,
+    seed_dataset,
+    time_call,
+)
+
+
+def legacy_summary(db: Session) -> dict:
+    """The previous implementation: load every Constituency with its
+    results and region, then pick the winner in Python."""
+    constituencies = (db.query(Constituency).options(
+        subqueryload(Constituency.results),
+        joinedload(Constituency.region),
+    ).order_by(Constituency.name.asc()).all())
+
+    summaries = []
+    for c in constituencies:
+        winner_code = None
+        max_votes = -1
+        is_tied = False
+        for r in c.results:
+            if not r.is_active:
+                continue
+            if r.votes > max_votes:
+                max_votes = r.votes
+                winner_code = r.party_code
+                is_tied = False
+            elif r.votes == max_votes:
+                is_tied = True
+        summaries.append({
+            "id": c.id,
+            "name": c.name,
+            "pcon24_code": c.pcon24_code,
+            "region_id": c.region_id,
+            "region_name": c.region.name if c.region else None,
+            "winning_party_code": None if is_tied else winner_code,
+        })
+    return {"total": len(summaries), "constituencies": summaries}
+
+
+def _peak_kib(fn, db: Session) -> float:
+    db.expunge_all()
+    tracemalloc.start()
+    fn(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    print(f"{'constituencies':>14} {'plan':>8} {'ms':>9} {'stmts':>6} "
+          f"{'peak KiB':>10}")
+    for size in DATASET_SIZES:
+        engine = create_bench_engine()
+        seed_dataset(engine, size)
+        with bench_session(engine) as db:
+            assert legacy_summary(db) == get_all_constituencies_summary(db)
+            for label, fn in (("orm", legacy_summary),
+                              ("core", get_all_constituencies_summary)):
+                with count_statements(engine) as counter:
+                    fn(db)
+                elapsed = time_call(fn, db)
+                peak = _peak_kib(fn, db)
+                print(f"{size:>14,} {label:>8} {elapsed:>9.2f} "
+                      f"{counter['statements']:>6} {peak:>10,.0f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Compare the window-function totals query with the previous join plan.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_totals
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_totals
+"""
+from sqlalchemy import func, or_, text
+from sqlalchemy.orm import Session
+
+from app.models.constituency import Constituency
+from app.models.result import Result
+from app.models.upload_log import UploadLog
+from app.services.result_queries import party_totals
+from app.services.totals_service import get_total_results
+from benchmarks.synthetic import (
+    DATASET_SIZES,
+    bench_session,
+    count_statements,
+    create_bench_engine,
+    seed_dataset,
+    time_call,
+)
+
+
+def _legacy_queries(db: Session):
+    """The pre-window-function plan: three joins over ``active_results``,
+    which is itself an outer join to ``upload_logs``."""
+    active_results = (db.query(Result).outerjoin(
+        UploadLog, Result.upload_id == UploadLog.id).filter(
+            or_(Result.upload_id.is_(None),
+                UploadLog.deleted_at.is_(None))).subquery())
+    votes_query = db.query(
+        active_results.c.party_code,
+        func.sum(active_results.c.votes).label("total_votes"),
+    ).group_by(active_results.c.party_code)
+    max_votes_sub = (db.query(
+        active_results.c.constituency_id,
+        func.max(active_results.c.votes).label("max_votes"),
+    ).group_by(active_results.c.constituency_id).subquery())
+    is_max = ((active_results.c.constituency_id
+               == max_votes_sub.c.constituency_id) &
+              (active_results.c.votes == max_votes_sub.c.max_votes))
+    tie_count_sub = (db.query(
+        active_results.c.constituency_id,
+        func.count().label("winner_count"),
+    ).join(max_votes_sub, is_max).group_by(
+        active_results.c.constituency_id).subquery())
+    winners_query = db.query(
+        active_results.c.party_code,
+        func.count().label("seats"),
+    ).join(max_votes_sub, is_max).join(
+        tie_count_sub,
+        active_results.c.constituency_id == tie_count_sub.c.constituency_id,
+    ).filter(tie_count_sub.c.winner_count == 1).group_by(
+        active_results.c.party_code)
+    return [votes_query.statement, winners_query.statement]
+
+
+def legacy_total_results(db: Session) -> dict:
+    votes_stmt, winners_stmt = _legacy_queries(db)
+    votes_map = {r.party_code: r.total_votes for r in db.execute(votes_stmt)}
+    seats_map = {r.party_code: r.seats for r in db.execute(winners_stmt)}
+    db.query(func.count(Constituency.id)).scalar()
+    return {"votes": votes_map, "seats": seats_map}
+
+
+def _plan_cost(db: Session, statements) -> str:
+    """Summarise the planner's view of ``statements``.
+
+    PostgreSQL reports the summed estimated total cost; SQLite reports the
+    number of plan steps that scan or search the ``results`` table.
+    """
+    dialect = db.bind.dialect
+    if dialect.name == "postgresql":
+        cost = 0.0
+        for stmt in statements:
+            sql = str(stmt.compile(dialect=dialect,
+                                   compile_kwargs={"literal_binds": True}))
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            cost += plan[0]["Plan"]["Total Cost"]
+        return f"est. cost {cost:,.0f}"
+
+    scans = 0
+    for stmt in statements:
+        sql = str(stmt.compile(dialect=dialect,
+                               compile_kwargs={"literal_binds": True}))
+        for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")):
+            detail = row[-1]
+            if "results" in detail and ("SCAN" in detail
+                                        or "SEARCH" in detail):
+                scans += 1
+    return f"{scans} results scans"
+
+
+def main() -> None:
+    print(f"{'constituencies':>14} {'plan':>8} {'ms':>9} {'stmts':>6}  cost")
+    for size in DATASET_SIZES:
+        engine = create_bench_engine()
+        seed_dataset(engine, size)
+        with bench_session(engine) as db:
+            legacy = legacy_total_results(db)
+            current = get_total_results(db)
+            assert legacy["votes"] == {
+                p["party_code"]: p["total_votes"]
+                for p in current["parties"]
+            }
+            assert sum(legacy["seats"].values()) == sum(
+                p["seats"] for p in current["parties"])
+
+            plans = (
+                ("legacy", legacy_total_results, _legacy_queries(db)),
+                ("window", get_total_results, [party_totals()]),
+            )
+            for label, fn, statements in plans:
+                with count_statements(engine) as counter:
+                    fn(db)
+                elapsed = time_call(fn, db)
+                print(f"{size:>14,} {label:>8} {elapsed:>9.2f} "
+                      f"{counter['statements']:>6}  "
+                      f"{_plan_cost(db, statements)}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
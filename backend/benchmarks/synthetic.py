@@ -0,0 +1,163 @@
+"""Synthetic election datasets and timing helpers for the benchmarks.
+
+Benchmarks run against ``BENCH_DATABASE_URL`` when it is set (e.g. a
+disposable PostgreSQL database) and fall back to a throw-away SQLite file.
+"""
+import atexit
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.constants import PARTY_CODE_MAP
+from app.database import Base
+from app.models.constituency import Constituency
+from app.models.region import Region
+from app.models.result import Result
+from app.models.result_history import ResultHistory
+from app.models.upload_log import UploadLog
+
+DATASET_SIZES = (650, 10_000)
+REGION_COUNT = 12
+UPLOAD_COUNT = 20
+DELETED_UPLOAD_EVERY = 7
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def create_bench_engine() -> Engine:
+    """Create an empty schema on the benchmark database.
+
+    The throw-away SQLite file is removed when the engine is disposed, or
+    at exit if a benchmark fails before that.
+    """
+    url = os.environ.get("BENCH_DATABASE_URL")
+    path = None
+    if url is None:
+        fd, path = tempfile.mkstemp(prefix="election-bench-", suffix=".db")
+        os.close(fd)
+        url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    if path is not None:
+        event.listen(engine, "engine_disposed",
+                     lambda engine: _remove_file(path))
+        atexit.register(_remove_file, path)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def seed_dataset(engine: Engine, constituency_count: int,
+                 seed: int = 2024) -> None:
+    """Populate ``engine`` with a deterministic synthetic election.
+
+    Every constituency gets a result for each known party, roughly one in
+    fifty constituencies is a tie for first place, and every seventh upload
+    is soft-deleted so that the active-result filters have work to do.
+    """
+    rng = random.Random(seed)
+    party_codes = sorted(PARTY_CODE_MAP)
+    now = datetime.now(timezone.utc)
+
+    deleted = {
+        i + 1
+        for i in range(UPLOAD_COUNT) if (i + 1) % DELETED_UPLOAD_EVERY == 0
+    }
+
+    with engine.begin() as conn:
+        conn.execute(insert(Region), [{
+            "id": i + 1,
+            "name": f"Region {i + 1}",
+            "sort_order": i + 1,
+        } for i in range(REGION_COUNT)])
+        conn.execute(insert(UploadLog), [{
+            "id": i + 1,
+            "filename": f"upload-{i + 1}.txt",
+            "status": "completed",
+            "total_lines": 0,
+            "processed_lines": 0,
+            "error_lines": 0,
+            "errors": [],
+            "deleted_at": now if i + 1 in deleted else None,
+        } for i in range(UPLOAD_COUNT)])
+        conn.execute(insert(Constituency), [{
+            "id": i + 1,
+            "name": f"Constituency {i + 1:05d}",
+            "pcon24_code": f"X{i + 1:08d}",
+            "region_id": (i % REGION_COUNT) + 1,
+        } for i in range(constituency_count)])
+
+        results = []
+        for constituency_id in range(1, constituency_count + 1):
+            votes = [rng.randint(100, 30_000) for _ in party_codes]
+            if rng.random() < 0.02:
+                top = max(votes)
+                votes[votes.index(top) - 1] = top
+            for code, count in zip(party_codes, votes):
+                upload_id = rng.randint(1, UPLOAD_COUNT)
+                results.append({
+                    "id": len(results) + 1,
+                    "constituency_id": constituency_id,
+                    "party_code": code,
+                    "votes": count,
+                    "upload_id": upload_id,
+                    "is_active": upload_id not in deleted,
+                })
+        conn.execute(insert(Result), results)
+        conn.execute(insert(ResultHistory), [{
+            "result_id": r["id"],
+            "upload_id": r["upload_id"],
+            "votes": r["votes"],
+            "is_active": r["is_active"],
+        } for r in results])
+
+
+@contextmanager
+def bench_session(engine: Engine):
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@contextmanager
+def count_statements(engine: Engine):
+    """Count the SQL statements issued against ``engine``."""
+    counter = {"statements": 0}
+
+    def _before_execute(*_args):
+        counter["statements"] += 1
+
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_execute)
+
+
+def time_call(fn: Callable[[Session], object],
+              session: Session,
+              repeat: int = 7) -> float:
+    """Return the median wall time of ``fn(session)`` in milliseconds."""
+    fn(session)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        session.expire_all()
+        start = time.perf_counter()
+        fn(session)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
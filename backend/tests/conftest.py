@@ -1,4 +1,6 @@
+import io
 import os
+import tempfile
 
 import pytest
 from fastapi.testclient import TestClient
@@ -8,11 +10,27 @@ from sqlalchemy.pool import StaticPool
 
 # Override before importing app modules
 os.environ["DATABASE_URL"] = "sqlite://"
+# A polling results watcher would share the test's StaticPool connection
+os.environ["RESULTS_POLL_SECONDS"] = "0"
+# Keep fingerprinted assets built at startup out of the source tree
+os.environ["STATIC_BUILD_DIR"] = tempfile.mkdtemp(prefix="election-assets-")
 
+import app.routers.export as export_module
 import app.routers.upload as upload_module
 from app.database import Base, get_db
 from app.main import app
 from app.models.constituency import Constituency
+from app.services.live_service import broadcaster
+from app.services.results_cache import clear_caches
+from app.services.version_service import remove_results_listener
+
+
+@pytest.fixture(autouse=True)
+def _clear_results_caches():
+    # Each test starts a fresh database whose results version restarts at 0
+    clear_caches()
+    yield
+    clear_caches()
 
 
 @pytest.fixture(scope="function")
@@ -65,10 +83,18 @@ def client(db_engine):
     # Patch SessionLocal used by streaming endpoints so they use the test DB
     original_session_local = upload_module.SessionLocal
     upload_module.SessionLocal = testing_session_local
+    export_module.SessionLocal = testing_session_local
+    original_live_factory = broadcaster.session_factory
+    broadcaster.session_factory = testing_session_local
     with TestClient(app) as c:
+        # Live events are built on a worker thread, which would interleave
+        # with requests on the single StaticPool connection
+        remove_results_listener(broadcaster.notify)
         yield c
     app.dependency_overrides.clear()
     upload_module.SessionLocal = original_session_local
+    export_module.SessionLocal = original_session_local
+    broadcaster.session_factory = original_live_factory
 
 
 def seed_constituencies(db_session, names: list[str]) -> None:
@@ -76,3 +102,12 @@ def seed_constituencies(db_session, names: list[str]) -> None:
     for name in names:
         db_session.add(Constituency(name=name))
     db_session.commit()
+
+
+def upload_text(client, content: str) -> int:
+    """Upload ``content`` as a results file and return the upload id."""
+    resp = client.post(
+        "/api/upload",
+        files={"file": ("r.txt", io.BytesIO(content.encode()), "text/plain")})
+    assert resp.status_code == 201
+    return resp.json()["upload_id"]
@@ -0,0 +1,99 @@
+"""Tests for the result change log and the constituency delta feed."""
+from app.config import settings
+from app.models.result_change import ResultChange
+from app.services.change_log_service import (
+    can_replay_since,
+    record_result_changes,
+)
+from app.services.constituency_service import get_constituency_changes
+from tests.conftest import seed_constituencies, upload_text
+
+
+class TestRecordResultChanges:
+
+    def test_writes_one_row_per_constituency(self, db_session):
+        seed_constituencies(db_session, ["A", "B"])
+        version = record_result_changes(db_session, [1, 2, 2], upload_id=None)
+        db_session.commit()
+        rows = db_session.query(ResultChange).all()
+        assert version == 1
+        assert sorted(r.constituency_id for r in rows) == [1, 2]
+        assert {r.version for r in rows} == {1}
+
+    def test_prunes_beyond_retention(self, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "CHANGE_LOG_RETENTION_VERSIONS", 2)
+        seed_constituencies(db_session, ["A"])
+        for _ in range(4):
+            record_result_changes(db_session, [1])
+        db_session.commit()
+        versions = sorted(r.version for r in db_session.query(ResultChange))
+        assert versions == [3, 4]
+
+    def test_can_replay_since(self, monkeypatch):
+        monkeypatch.setattr(settings, "CHANGE_LOG_RETENTION_VERSIONS", 5)
+        assert can_replay_since(10, 10)
+        assert can_replay_since(5, 10)
+        assert not can_replay_since(4, 10)
+        assert not can_replay_since(11, 10)
+
+
+class TestGetConstituencyChanges:
+
+    def test_ingestion_logs_touched_constituencies(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford", "Oxford", "Cambridge"])
+        upload_text(client, "Bedford,100,C,50,L\nOxford,10,C,90,L\n")
+        upload_text(client, "Oxford,10,C,20,L\n")
+
+        changes = get_constituency_changes(db_session, since=1)
+        assert changes["version"] == 2
+        assert changes["resync"] is False
+        assert [c["name"] for c in changes["constituencies"]] == ["Oxford"]
+        oxford = changes["constituencies"][0]
+        assert oxford["winning_party_code"] == "L"
+        assert oxford["total_votes"] == 30
+
+    def test_up_to_date_client_gets_nothing(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        upload_text(client, "Bedford,100,C\n")
+        changes = get_constituency_changes(db_session, since=1)
+        assert changes["constituencies"] == []
+
+    def test_rollback_logs_reverted_constituencies(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        upload_text(client, "Bedford,100,C,50,L\nOxford,10,C,90,L\n")
+        second = upload_text(client, "Bedford,10,C,50,L\n")
+        client.delete(f"/api/uploads/{second}")
+
+        changes = get_constituency_changes(db_session, since=2)
+        assert changes["version"] == 3
+        assert [c["name"] for c in changes["constituencies"]] == ["Bedford"]
+        assert changes["constituencies"][0]["winning_party_code"] == "C"
+
+    def test_removed_results_reported_without_winner(self, client,
+                                                     db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        upload_id = upload_text(client, "Bedford,100,C\n")
+        client.delete(f"/api/uploads/{upload_id}")
+
+        changes = get_constituency_changes(db_session, since=1)
+        bedford = changes["constituencies"][0]
+        assert bedford["winning_party_code"] is None
+        assert bedford["total_votes"] == 0
+
+    def test_expired_version_triggers_resync(self, client, db_session,
+                                             monkeypatch):
+        monkeypatch.setattr(settings, "CHANGE_LOG_RETENTION_VERSIONS", 1)
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        upload_text(client, "Bedford,100,C\n")
+        upload_text(client, "Bedford,200,C\n")
+        upload_text(client, "Bedford,300,C\n")
+
+        changes = get_constituency_changes(db_session, since=1)
+        assert changes["resync"] is True
+        assert len(changes["constituencies"]) == 2
+
+    def test_future_version_triggers_resync(self, db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        changes = get_constituency_changes(db_session, since=7)
+        assert changes["resync"] is True
+        assert changes["version"] == 0
@@ -0,0 +1,203 @@
+"""Tests for result_history compaction and archive restores."""
+import pytest
+
+from app.config import settings
+from app.models.result import Result
+from app.models.result_history import ResultHistory
+from app.models.result_history_archive import ResultHistoryArchive
+from app.models.state_checkpoint import StateCheckpoint
+from app.services.checkpoint_service import write_checkpoint
+from app.services.compaction_service import (
+    compact_history,
+    decode_history,
+    encode_history,
+    restore_archived,
+    restore_archived_after,
+)
+from app.services.history_service import results_state_as_of
+from tests.conftest import seed_constituencies, upload_text
+
+REFRESH = "Bedford,100,C,50,L\n"
+CHANGED = "Bedford,120,C,50,L\n"
+
+
+def _state(db_session) -> dict:
+    db_session.expire_all()
+    return {
+        r.party_code: (r.votes, r.upload_id, r.is_active)
+        for r in db_session.query(Result)
+    }
+
+
+@pytest.fixture(autouse=True)
+def _no_automatic_checkpoints(monkeypatch):
+    monkeypatch.setattr(settings, "CHECKPOINT_EVERY_UPLOADS", 0)
+    monkeypatch.setattr(settings, "CHECKPOINT_INTERVAL_MINUTES", 0)
+
+
+@pytest.fixture
+def refreshed(client, db_session):
+    """Four uploads repeating the same votes, checkpointed at the last."""
+    seed_constituencies(db_session, ["Bedford"])
+    ids = [upload_text(client, REFRESH) for _ in range(4)]
+    write_checkpoint(db_session, ids[-1])
+    db_session.commit()
+    return ids
+
+
+class TestHistoryEncoding:
+
+    def test_round_trip(self):
+        rows = [(1, 10, 3, 100), (2, 11, 4, 0)]
+        assert decode_history(encode_history(rows)) == rows
+
+
+class TestCompactHistory:
+
+    def test_needs_a_checkpoint(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        for _ in range(3):
+            upload_text(client, REFRESH)
+        report = compact_history(db_session)
+        assert report.rows_archived == 0
+        assert db_session.query(ResultHistory).count() == 6
+
+    def test_archives_repeated_votes(self, db_session, refreshed):
+        report = compact_history(db_session)
+        assert report.horizon_upload_id == refreshed[-1]
+        assert report.rows_archived == 6
+        assert report.chunks == 1
+        assert 0 < report.archive_bytes < report.bytes_reclaimed
+        kept = db_session.query(ResultHistory.upload_id).all()
+        assert {upload_id for (upload_id, ) in kept} == {refreshed[0]}
+        [chunk] = db_session.query(ResultHistoryArchive).all()
+        assert (chunk.first_upload_id, chunk.last_upload_id,
+                chunk.row_count) == (refreshed[1], refreshed[-1], 6)
+
+    def test_keeps_changes_and_history_after_horizon(self, client, db_session,
+                                                     refreshed):
+        changed = upload_text(client, CHANGED)
+        upload_text(client, CHANGED)
+        compact_history(db_session)
+        kept = db_session.query(ResultHistory).filter(
+            ResultHistory.upload_id >= changed).count()
+        assert kept == 4
+
+    def test_second_pass_archives_nothing_new(self, db_session, refreshed):
+        compact_history(db_session)
+        assert compact_history(db_session).rows_archived == 0
+
+    def test_one_chunk_per_result_range(self, db_session, refreshed):
+        report = compact_history(db_session, results_per_chunk=1)
+        assert report.chunks == 2
+
+    def test_time_travel_unchanged(self, client, db_session, refreshed):
+        ids = refreshed + [upload_text(client, CHANGED)]
+        before = [results_state_as_of(db_session, i) for i in ids]
+        compact_history(db_session)
+        db_session.query(StateCheckpoint).delete()
+        db_session.commit()
+        assert [results_state_as_of(db_session, i) for i in ids] == before
+
+
+class TestRollbackAfterCompaction:
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_matches_uncompacted_history(self, client, db_session, refreshed,
+                                         compact):
+        if compact:
+            compact_history(db_session)
+        latest, first = refreshed[-1], refreshed[0]
+
+        client.delete(f"/api/uploads/{latest}")
+        assert _state(db_session)["C"] == (100, refreshed[2], True)
+        client.delete(f"/api/uploads/{first}")
+        assert _state(db_session)["C"] == (100, refreshed[2], True)
+        client.delete(f"/api/uploads/{refreshed[2]}")
+        assert _state(db_session)["C"] == (100, refreshed[1], True)
+        client.delete(f"/api/uploads/{refreshed[1]}")
+        assert _state(db_session)["C"] == (100, refreshed[1], False)
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_batch_delete(self, client, db_session, refreshed, compact):
+        if compact:
+            compact_history(db_session)
+        client.post("/api/uploads/batch-delete",
+                    json={"upload_ids": [refreshed[-1], refreshed[1]]})
+        assert _state(db_session)["C"] == (100, refreshed[2], True)
+
+    def test_later_uploads_leave_archive_alone(self, client, db_session,
+                                               refreshed):
+        compact_history(db_session)
+        changed = upload_text(client, CHANGED)
+        assert restore_archived(db_session, changed) == 0
+        client.delete(f"/api/uploads/{changed}")
+        assert db_session.query(ResultHistoryArchive).count() == 1
+        assert _state(db_session)["C"] == (100, refreshed[-1], True)
+
+    @pytest.mark.parametrize("batch", [False, True])
+    def test_delete_before_archived_repeat(self, client, db_session, batch):
+        seed_constituencies(db_session, ["Bedford"])
+        upload_text(client, "Bedford,10,C,5,L\n")
+        changed = upload_text(client, "Bedford,20,C,6,L\n")
+        repeat = upload_text(client, "Bedford,20,C,6,L\n")
+        write_checkpoint(db_session, repeat)
+        db_session.commit()
+        assert compact_history(db_session).rows_archived == 2
+
+        if batch:
+            client.post("/api/uploads/batch-delete",
+                        json={"upload_ids": [changed]})
+        else:
+            client.delete(f"/api/uploads/{changed}")
+        # The repeat is now the only record of its votes
+        assert _state(db_session) == {
+            "C": (20, repeat, True),
+            "L": (6, repeat, True)
+        }
+        assert sorted(results_state_as_of(db_session,
+                                          repeat).values()) == [6, 20]
+        as_of = client.get(f"/api/totals?as_of_upload={repeat}").json()
+        assert as_of == client.get("/api/totals").json()
+
+    def test_restores_chunks_the_rollback_replays(self, db_session, refreshed):
+        compact_history(db_session)
+        assert restore_archived(db_session, refreshed[1]) == 6
+        db_session.commit()
+        assert db_session.query(ResultHistory).count() == 8
+        assert db_session.query(ResultHistoryArchive).count() == 0
+
+
+class TestRestoreAfterCompaction:
+
+    def test_later_repeat_becomes_a_change_again(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        first = upload_text(client, REFRESH)
+        changed = upload_text(client, CHANGED)
+        client.delete(f"/api/uploads/{changed}")
+        # Repeats the first upload's votes, so it is archived while the
+        # change in between is deleted
+        repeat = upload_text(client, REFRESH)
+        write_checkpoint(db_session, repeat)
+        db_session.commit()
+        assert compact_history(db_session).rows_archived == 2
+
+        client.post(f"/api/uploads/{changed}/restore")
+        assert _state(db_session)["C"] == (100, repeat, True)
+        assert db_session.query(ResultHistoryArchive).count() == 0
+        states = [results_state_as_of(db_session, i) for i in (first, changed)]
+        assert [sorted(state.values()) for state in states] == [[50, 100],
+                                                                [50, 120]]
+        client.delete(f"/api/uploads/{repeat}")
+        assert _state(db_session)["C"] == (120, changed, True)
+
+    def test_inactive_rows_are_not_archived(self, client, db_session,
+                                            refreshed):
+        client.delete(f"/api/uploads/{refreshed[-1]}")
+        write_checkpoint(db_session, refreshed[-2])
+        db_session.commit()
+        compact_history(db_session)
+        kept = db_session.query(ResultHistory).filter_by(
+            upload_id=refreshed[-1]).count()
+        assert kept == 2
+        assert restore_archived_after(db_session, refreshed[-1]) == 0
@@ -0,0 +1,220 @@
+"""Tests for response compression and precompressed variants."""
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app import compression
+from app.compression import (
+    CompressionMiddleware,
+    EncodedBody,
+    etag_matches,
+    is_compressible,
+    negotiate,
+    weak_etag,
+)
+from app.main import STATIC_DIR
+from tests.conftest import seed_constituencies
+
+LARGE = {"items": ["constituency"] * 500}
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+@pytest.fixture
+def compress_calls(monkeypatch):
+    calls = []
+    original = compression.compress
+
+    def counting(body, encoding, *args, **kwargs):
+        calls.append(encoding)
+        return original(body, encoding, *args, **kwargs)
+
+    monkeypatch.setattr(compression, "compress", counting)
+    return calls
+
+
+class TestNegotiate:
+
+    def test_gzip(self, gzip_only):
+        assert negotiate("gzip, deflate") == "gzip"
+
+    def test_refused_with_zero_quality(self, gzip_only):
+        assert negotiate("gzip;q=0, deflate") is None
+
+    def test_wildcard(self, gzip_only):
+        assert negotiate("*") == "gzip"
+        assert negotiate("*, gzip;q=0") is None
+
+    def test_none(self):
+        assert negotiate("") is None
+        assert negotiate("identity") is None
+
+    def test_prefers_brotli_when_available(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", object())
+        assert negotiate("gzip, br") == "br"
+
+
+class TestIsCompressible:
+
+    @pytest.mark.parametrize("content_type", [
+        "application/json",
+        "application/vnd.election.columnar+json",
+        "text/plain; charset=utf-8",
+    ])
+    def test_compressible(self, content_type):
+        assert is_compressible(content_type)
+
+    @pytest.mark.parametrize("content_type",
+                             [None, "image/png", "application/gzip"])
+    def test_not_compressible(self, content_type):
+        assert not is_compressible(content_type)
+
+
+class TestEtagMatches:
+
+    def _request(self, if_none_match: str | None) -> Request:
+        headers = []
+        if if_none_match is not None:
+            headers.append((b"if-none-match", if_none_match.encode()))
+        return Request({"type": "http", "headers": headers})
+
+    @pytest.mark.parametrize("header", [
+        'W/"summary-1"',
+        '"summary-1"',
+        '"other", W/"summary-1"',
+        "*",
+    ])
+    def test_matches_weakly(self, header):
+        assert etag_matches(self._request(header), weak_etag("summary-1"))
+
+    @pytest.mark.parametrize("header", [None, 'W/"summary-2"', '"summary"'])
+    def test_no_match(self, header):
+        assert not etag_matches(self._request(header), weak_etag("summary-1"))
+
+
+class TestEncodedBody:
+
+    def test_small_body_has_no_variants(self):
+        body = EncodedBody(b"{}")
+        assert body.variants == {}
+        assert body.select("gzip") == (b"{}", None)
+
+    def test_large_body_is_compressed_once(self, gzip_only, compress_calls):
+        identity = b'{"name":"Bedford"}' * 200
+        body = EncodedBody(identity)
+        assert compress_calls == ["gzip"]
+
+        content, encoding = body.select("gzip, deflate")
+        assert encoding == "gzip"
+        assert gzip.decompress(content) == identity
+        assert body.select("identity") == (identity, None)
+        assert len(body) == len(identity) + len(content)
+        assert compress_calls == ["gzip"]
+
+
+def _middleware_app():
+
+    def large(request):
+        return JSONResponse(LARGE)
+
+    def small(request):
+        return JSONResponse({"ok": True})
+
+    def stream(request):
+        return StreamingResponse(iter([b"data: 1\n\n"] * 200),
+                                 media_type="text/event-stream")
+
+    def encoded(request):
+        return Response(b"x" * 5000,
+                        media_type="application/json",
+                        headers={"Content-Encoding": "identity"})
+
+    app = Starlette(routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/stream", stream),
+        Route("/encoded", encoded),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return app
+
+
+class TestCompressionMiddleware:
+
+    def test_compresses_large_response(self, gzip_only):
+        resp = TestClient(_middleware_app()).get("/large")
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["vary"]
+        assert resp.json() == LARGE
+
+    def test_skips_small_response(self, gzip_only):
+        resp = TestClient(_middleware_app()).get("/small")
+        assert "content-encoding" not in resp.headers
+
+    def test_skips_streamed_response(self, gzip_only):
+        resp = TestClient(_middleware_app()).get("/stream")
+        assert "content-encoding" not in resp.headers
+
+    def test_skips_already_encoded_response(self, gzip_only):
+        resp = TestClient(_middleware_app()).get("/encoded")
+        assert resp.headers["content-encoding"] == "identity"
+
+    def test_skips_client_without_accept_encoding(self, gzip_only):
+        resp = TestClient(_middleware_app()).get(
+            "/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+
+
+class TestPrecompressedRoutes:
+
+    def test_summary_variant_is_reused(self, client, db_session, gzip_only,
+                                       compress_calls):
+        seed_constituencies(db_session, [f"Seat {i}" for i in range(100)])
+
+        first = client.get("/api/constituencies/summary")
+        second = client.get("/api/constituencies/summary")
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert second.headers["content-encoding"] == "gzip"
+        assert first.json()["total"] == 100
+        assert compress_calls == ["gzip"]
+
+    def test_identity_for_clients_without_gzip(self, client, db_session,
+                                               gzip_only):
+        seed_constituencies(db_session, [f"Seat {i}" for i in range(100)])
+        resp = client.get("/api/constituencies/summary",
+                          headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+        assert "Accept-Encoding" in resp.headers["vary"]
+
+
+@pytest.mark.skipif(not STATIC_DIR.is_dir(), reason="no static assets")
+class TestPrecompressedStaticFiles:
+
+    def test_topojson_variant_is_reused(self, client, gzip_only,
+                                       compress_calls):
+        path = "/static/uk-constituencies.topojson"
+        first = client.get(path)
+        second = client.get(path)
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["etag"].startswith("W/")
+        assert first.content == (STATIC_DIR /
+                                 "uk-constituencies.topojson").read_bytes()
+        assert second.content == first.content
+        # Compressed at most once, however many requests (or tests) ask
+        assert len(compress_calls) <= 1
+
+    def test_identity_without_accept_encoding(self, client):
+        resp = client.get("/static/uk-constituencies.topojson",
+                          headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+        assert resp.headers["content-type"].startswith("application/json")
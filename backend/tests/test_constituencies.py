@@ -1,5 +1,8 @@
 import io
 
+import pytest
+
+from app.services.constituency_service import COLUMNAR_MEDIA_TYPE
 from tests.conftest import seed_constituencies
 
 
@@ -240,3 +243,115 @@ class TestConstituencySummary:
         c = resp.json()["constituencies"][0]
         assert c["name"] == "TiedTown"
         assert c["winning_party_code"] is None
+
+
+class TestColumnarSummary:
+    """GET /api/constituencies/summary in the columnar layout."""
+
+    def _upload(self, client, content):
+        client.post("/api/upload",
+                    files={
+                        "file": ("seed.txt", io.BytesIO(content.encode()),
+                                 "text/plain")
+                    })
+
+    def _seed(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford", "Oxford", "TiedTown"])
+        self._upload(
+            client, "Bedford,6643,C,5276,L\n"
+            "Oxford,3000,C,8000,L\n"
+            "TiedTown,100,C,100,L\n")
+
+    def test_format_query_param(self, client, db_session):
+        self._seed(client, db_session)
+        resp = client.get("/api/constituencies/summary?format=columnar")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith(
+            "application/vnd.election.columnar+json")
+        data = resp.json()
+        assert data["total"] == 3
+        assert data["name"] == ["Bedford", "Oxford", "TiedTown"]
+        winners = [
+            data["party_codes"][i] if i is not None else None
+            for i in data["winner"]
+        ]
+        assert winners == ["C", "L", None]
+        assert data["party_codes"] == ["C", "L"]
+
+    def test_accept_header(self, client, db_session):
+        self._seed(client, db_session)
+        resp = client.get(
+            "/api/constituencies/summary",
+            headers={"Accept": "application/vnd.election.columnar+json"})
+        assert resp.status_code == 200
+        assert "party_codes" in resp.json()
+
+    def test_format_param_overrides_accept(self, client, db_session):
+        self._seed(client, db_session)
+        resp = client.get(
+            "/api/constituencies/summary?format=objects",
+            headers={"Accept": "application/vnd.election.columnar+json"})
+        assert "constituencies" in resp.json()
+
+    @pytest.mark.parametrize("accept",
+                             ["application/json", COLUMNAR_MEDIA_TYPE])
+    def test_varies_on_accept(self, client, db_session, accept):
+        self._seed(client, db_session)
+        resp = client.get("/api/constituencies/summary",
+                          headers={"Accept": accept})
+        assert "Accept" in resp.headers["vary"].split(", ")
+
+    def test_invalid_format_rejected(self, client):
+        resp = client.get("/api/constituencies/summary?format=xml")
+        assert resp.status_code == 422
+
+    def test_etag_not_modified(self, client, db_session):
+        self._seed(client, db_session)
+        first = client.get("/api/constituencies/summary?format=columnar")
+        etag = first.headers["etag"]
+        assert etag.startswith("W/")
+        resp = client.get("/api/constituencies/summary?format=columnar",
+                          headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+    def test_new_upload_changes_payload(self, client, db_session):
+        self._seed(client, db_session)
+        before = client.get("/api/constituencies/summary?format=columnar")
+        self._upload(client, "TiedTown,100,C,900,L\n")
+        after = client.get("/api/constituencies/summary?format=columnar")
+        assert after.headers["etag"] != before.headers["etag"]
+        data = after.json()
+        assert data["version"] > before.json()["version"]
+        assert data["party_codes"][data["winner"][2]] == "L"
+
+
+class TestConstituencyChangesEndpoint:
+    """GET /api/constituencies/changes"""
+
+    def test_changes_since_version(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        for content in ("Bedford,100,C\nOxford,100,L\n", "Oxford,300,C\n"):
+            client.post("/api/upload",
+                        files={
+                            "file": ("r.txt", io.BytesIO(content.encode()),
+                                     "text/plain")
+                        })
+        resp = client.get("/api/constituencies/changes?since=1")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["version"] == 2
+        assert data["since"] == 1
+        assert data["resync"] is False
+        assert len(data["constituencies"]) == 1
+        oxford = data["constituencies"][0]
+        assert oxford["name"] == "Oxford"
+        assert oxford["winning_party_code"] == "C"
+        assert oxford["total_votes"] == 400
+
+    def test_since_is_required(self, client):
+        resp = client.get("/api/constituencies/changes")
+        assert resp.status_code == 422
+
+    def test_negative_since_rejected(self, client):
+        resp = client.get("/api/constituencies/changes?since=-1")
+        assert resp.status_code == 422
@@ -1,4 +1,5 @@
 """Unit tests for constituency_service module."""
+import json
 
 from app.models.constituency import Constituency
 from app.models.region import Region
@@ -7,6 +8,7 @@ from app.models.upload_log import UploadLog
 from app.services.constituency_service import (
     get_all_constituencies,
     get_all_constituencies_summary,
+    get_columnar_summary,
     get_constituency_by_id,
 )
 
@@ -149,6 +151,22 @@ class TestGetAllConstituenciesSummary:
                     if c["name"] == "Tied Place")
         assert tied["winning_party_code"] is None
 
+    def test_tie_below_first_place_keeps_winner(self, db_session):
+        c = Constituency(name="Close Second")
+        db_session.add(c)
+        db_session.flush()
+        db_session.add_all([
+            Result(constituency_id=c.id, party_code="G", votes=6000),
+            Result(constituency_id=c.id, party_code="C", votes=5000),
+            Result(constituency_id=c.id, party_code="L", votes=5000),
+        ])
+        db_session.commit()
+
+        result = get_all_constituencies_summary(db_session)
+        row = result["constituencies"][0]
+        assert row["winning_party_code"] == "G"
+        assert row["region_name"] is None
+
     def test_constituency_without_results(self, db_session):
         _seed(db_session)
         result = get_all_constituencies_summary(db_session)
@@ -157,6 +175,28 @@ class TestGetAllConstituenciesSummary:
         assert empty["winning_party_code"] is None
 
 
+class TestGetColumnarSummary:
+
+    def test_matches_object_summary(self, db_session):
+        _seed(db_session, with_region=True)
+        body = get_columnar_summary(db_session, 1)
+        data = json.loads(body)
+        objects = get_all_constituencies_summary(db_session)["constituencies"]
+        assert data["id"] == [c["id"] for c in objects]
+        assert data["pcon24_code"] == [c["pcon24_code"] for c in objects]
+        for i, c in enumerate(objects):
+            region = data["region"][i]
+            winner = data["winner"][i]
+            assert c["region_name"] == (data["regions"]["name"][region]
+                                        if region is not None else None)
+            assert c["winning_party_code"] == (data["party_codes"][winner]
+                                               if winner is not None else None)
+
+    def test_carries_version(self, db_session):
+        _seed(db_session)
+        assert json.loads(get_columnar_summary(db_session, 7))["version"] == 7
+
+
 class TestGetConstituencyById:
 
     def test_returns_constituency(self, db_session):
@@ -226,6 +266,7 @@ class TestSoftDeletedUploadFiltering:
                 party_code="L",
                 votes=3000,
                 upload_id=deleted_upload.id,
+                is_active=False,
             ),
         ])
         db_session.commit()
@@ -284,6 +325,7 @@ class TestSoftDeletedUploadFiltering:
                 party_code="C",
                 votes=9999,
                 upload_id=deleted_upload.id,
+                is_active=False,
             ))
         db_session.commit()
 
@@ -318,6 +360,7 @@ class TestSoftDeletedUploadFiltering:
                 party_code="L",
                 votes=8000,
                 upload_id=deleted_upload.id,
+                is_active=False,
             ))
         db_session.commit()
 
@@ -371,6 +414,7 @@ class TestSoftDeletedUploadFiltering:
                 party_code="C",
                 votes=99999,
                 upload_id=deleted_upload.id,
+                is_active=False,
             ),
             Result(constituency_id=c2.id, party_code="L", votes=100),
         ])
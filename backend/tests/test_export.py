@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.services import export_service
+from tests.conftest import seed_constituencies, upload_text
+
+
+def _csv_rows(resp) -> list[dict]:
+    return list(csv.DictReader(io.StringIO(resp.text)))
+
+
+class TestExportResults:
+
+    @pytest.fixture
+    def uploads(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford", "Oxford", "Cambridge"])
+        return [
+            upload_text(client, "Bedford,100,C,50,L\nOxford,10,C,90,L\n"),
+            upload_text(client, "Oxford,200,C\n"),
+        ]
+
+    def test_csv(self, client, uploads):
+        resp = client.get("/api/export/results.csv")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        rows = _csv_rows(resp)
+        assert [(r["constituency_name"], r["party_code"], r["votes"])
+                for r in rows] == [
+                    ("Bedford", "C", "100"),
+                    ("Bedford", "L", "50"),
+                    ("Oxford", "C", "200"),
+                    ("Oxford", "L", "90"),
+                    ("Cambridge", "", ""),
+                ]
+        assert rows[0]["party_name"] == "Conservative Party"
+
+    def test_ndjson(self, client, uploads):
+        resp = client.get("/api/export/results.ndjson")
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in resp.text.splitlines()]
+        assert len(rows) == 5
+        assert rows[0] == {
+            "constituency_id": 1,
+            "pcon24_code": None,
+            "constituency_name": "Bedford",
+            "region_name": None,
+            "party_code": "C",
+            "party_name": "Conservative Party",
+            "votes": 100,
+        }
+        assert rows[-1]["party_code"] is None
+
+    def test_same_in_any_batch_size(self, client, uploads, monkeypatch):
+        whole = client.get("/api/export/results.csv").text
+        monkeypatch.setattr(export_service, "EXPORT_BATCH_ROWS", 1)
+        assert client.get("/api/export/results.csv").text == whole
+
+    def test_gzip(self, client, uploads):
+        plain = client.get("/api/export/results.ndjson",
+                           headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        resp = client.get("/api/export/results.ndjson",
+                          headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        # The client decompresses it
+        assert resp.text == plain.text
+
+    def test_deleted_upload_is_excluded(self, client, uploads):
+        client.delete(f"/api/uploads/{uploads[1]}")
+        rows = _csv_rows(client.get("/api/export/results.csv"))
+        assert ("Oxford", "C", "10") in [
+            (r["constituency_name"], r["party_code"], r["votes"]) for r in rows
+        ]
+
+    def test_since_version(self, client, uploads):
+        version = int(
+            client.get("/api/export/results.csv").headers["x-results-version"])
+        upload_text(client, "Cambridge,30,G\n")
+        resp = client.get(f"/api/export/results.csv?since_version={version}")
+        assert resp.headers["x-resync"] == "false"
+        assert resp.headers["x-results-version"] == str(version + 1)
+        assert [(r["constituency_name"], r["party_code"])
+                for r in _csv_rows(resp)] == [("Cambridge", "G")]
+
+    def test_since_current_version_is_empty(self, client, uploads):
+        version = client.get(
+            "/api/export/results.csv").headers["x-results-version"]
+        resp = client.get(f"/api/export/results.csv?since_version={version}")
+        assert _csv_rows(resp) == []
+
+    def test_since_unknown_version_resyncs(self, client, uploads):
+        resp = client.get("/api/export/results.csv?since_version=999")
+        assert resp.headers["x-resync"] == "true"
+        assert len(_csv_rows(resp)) == 5
+
+    def test_unknown_format(self, client):
+        assert client.get("/api/export/results.xml").status_code == 422
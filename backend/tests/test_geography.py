@@ -68,6 +68,53 @@ class TestGeographyRegions:
         assert "constituency_count" in region
 
 
+class TestGeographyRegionResults:
+
+    def test_empty(self, client):
+        resp = client.get("/api/geography/regions/results")
+        assert resp.status_code == 200
+        assert resp.json() == {"regions": []}
+
+    def test_region_results(self, client, db_session):
+        db_session.add(Region(id=1, name="North East", sort_order=0))
+        db_session.commit()
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        for c in db_session.query(Constituency).all():
+            c.region_id = 1
+        db_session.commit()
+        content = "Bedford,6643,C,5276,L\nOxford,3000,C,8000,L\n"
+        client.post("/api/upload",
+                    files={
+                        "file": ("seed.txt", io.BytesIO(content.encode()),
+                                 "text/plain")
+                    })
+
+        resp = client.get("/api/geography/regions/results")
+        assert resp.status_code == 200
+        [region] = resp.json()["regions"]
+        assert region["name"] == "North East"
+        assert region["total_votes"] == 22919
+        seats = {p["party_code"]: p["seats"] for p in region["parties"]}
+        assert seats == {"C": 1, "L": 1}
+
+    def test_refreshed_after_upload(self, client, db_session):
+        db_session.add(Region(id=1, name="North East", sort_order=0))
+        db_session.commit()
+        seed_constituencies(db_session, ["Bedford"])
+        db_session.query(Constituency).update({"region_id": 1})
+        db_session.commit()
+        assert client.get("/api/geography/regions/results").json(
+        )["regions"][0]["parties"] == []
+        client.post("/api/upload",
+                    files={
+                        "file": ("seed.txt", io.BytesIO(b"Bedford,10,C\n"),
+                                 "text/plain")
+                    })
+        parties = client.get(
+            "/api/geography/regions/results").json()["regions"][0]["parties"]
+        assert [p["party_code"] for p in parties] == ["C"]
+
+
 class TestGeographyRegionDetail:
 
     def _seed_region_with_constituencies(self, client, db_session):
@@ -0,0 +1,157 @@
+"""Tests for the precomputed constituency adjacency index."""
+import json
+
+import pytest
+
+from app.models.constituency import Constituency
+from app.services.geography_index import (
+    build_geography_index,
+    decode_index,
+    encode_index,
+    load_geography_index,
+)
+
+
+def _topology():
+    # A and B side by side sharing x=1, C apart
+    return {
+        "type": "Topology",
+        "arcs": [
+            [[1, 0], [1, 2]],
+            [[1, 2], [0, 2], [0, 0], [1, 0]],
+            [[1, 0], [3, 0], [3, 2], [1, 2]],
+            [[5, 5], [6, 5], [6, 6], [5, 6], [5, 5]],
+        ],
+        "objects": {
+            "wpc": {
+                "type":
+                "GeometryCollection",
+                "geometries": [
+                    {
+                        "type": "Polygon",
+                        "arcs": [[0, 1]],
+                        "properties": {
+                            "pcon19cd": "A"
+                        },
+                    },
+                    {
+                        "type": "Polygon",
+                        "arcs": [[2, ~0]],
+                        "properties": {
+                            "pcon19cd": "B"
+                        },
+                    },
+                    {
+                        "type": "MultiPolygon",
+                        "arcs": [[[3]]],
+                        "properties": {
+                            "pcon19cd": "C"
+                        },
+                    },
+                ],
+            }
+        },
+    }
+
+
+class TestBuildGeographyIndex:
+
+    def test_shared_arcs_make_neighbours(self):
+        index = build_geography_index(_topology())
+        assert index.neighbours("A") == ["B"]
+        assert index.neighbours("B") == ["A"]
+        assert index.neighbours("C") == []
+
+    def test_unknown_code(self):
+        index = build_geography_index(_topology())
+        assert "Z" not in index
+        assert index.neighbours("Z") == []
+        assert index.bbox("Z") is None
+
+    def test_bounding_boxes(self):
+        index = build_geography_index(_topology())
+        assert index.bbox("A") == (0, 0, 1, 2)
+        assert index.bbox("B") == (1, 0, 3, 2)
+
+    def test_centroids(self):
+        index = build_geography_index(_topology())
+        assert index.centroid("A") == pytest.approx((0.5, 1.0))
+        assert index.centroid("B") == pytest.approx((2.0, 1.0))
+        assert index.centroid("C") == pytest.approx((5.5, 5.5))
+
+    def test_within_viewport(self):
+        index = build_geography_index(_topology())
+        assert index.within(0.2, 0.2, 0.8, 0.8) == ["A"]
+        assert index.within(0, 0, 10, 10) == ["A", "B", "C"]
+        assert index.within(20, 20, 30, 30) == []
+
+
+class TestIndexStorage:
+
+    def test_round_trip(self):
+        index = build_geography_index(_topology())
+        decoded = decode_index(encode_index(index))
+        assert decoded.codes == index.codes
+        assert decoded.neighbours("A") == ["B"]
+        assert decoded.bbox("B") == index.bbox("B")
+        assert decoded.centroid("C") == index.centroid("C")
+
+    def test_rejects_other_files(self):
+        with pytest.raises(ValueError):
+            decode_index(b"\0" * 64)
+
+    def test_load_builds_once(self, tmp_path):
+        source = tmp_path / "map.topojson"
+        source.write_text(json.dumps(_topology()))
+        build_dir = tmp_path / "build"
+        load_geography_index(source, build_dir)
+        [stored] = build_dir.iterdir()
+        mtime = stored.stat().st_mtime_ns
+        index = load_geography_index(source, build_dir)
+        assert stored.stat().st_mtime_ns == mtime
+        assert index.neighbours("B") == ["A"]
+
+
+class TestNeighboursEndpoint:
+
+    def test_not_found(self, client):
+        resp = client.get("/api/geography/constituencies/999/neighbours")
+        assert resp.status_code == 404
+
+    def test_returns_known_neighbours(self, client, db_session):
+        # Oxford East is seeded but does not border Aldershot
+        db_session.add_all([
+            Constituency(id=1, name="Aldershot", pcon24_code="E14000530"),
+            Constituency(id=2, name="North East Hampshire",
+                         pcon24_code="E14000844"),
+            Constituency(id=3, name="Oxford East", pcon24_code="E14000873"),
+        ])
+        db_session.commit()
+        resp = client.get("/api/geography/constituencies/1/neighbours")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [n["name"] for n in data["neighbours"]
+                ] == ["North East Hampshire"]
+        west, south, east, north = data["bbox"]
+        lon, lat = data["centroid"]
+        assert west < lon < east and south < lat < north
+
+    def test_without_code(self, client, db_session):
+        db_session.add(Constituency(id=1, name="Nowhere"))
+        db_session.commit()
+        data = client.get("/api/geography/constituencies/1/neighbours").json()
+        assert data["neighbours"] == []
+        assert data["bbox"] is None
+
+
+class TestViewportEndpoint:
+
+    def test_returns_codes_in_box(self, client):
+        resp = client.get("/api/geography/viewport",
+                          params={"bbox": "-0.8,51.25,-0.75,51.3"})
+        assert resp.status_code == 200
+        assert "E14000530" in resp.json()["pcon24_codes"]
+
+    def test_invalid_bbox(self, client):
+        resp = client.get("/api/geography/viewport", params={"bbox": "1,2"})
+        assert resp.status_code == 422
@@ -4,7 +4,11 @@ from app.models.constituency import Constituency
 from app.models.region import Region
 from app.models.result import Result
 from app.models.upload_log import UploadLog
-from app.services.geography_service import get_all_regions, get_region_detail
+from app.services.geography_service import (
+    get_all_regions,
+    get_region_detail,
+    get_region_results,
+)
 
 
 def _seed_regions(db_session):
@@ -109,6 +113,59 @@ class TestGetRegionDetail:
         assert result["pcon24_codes"] == []
 
 
+class TestGetRegionResults:
+
+    def _by_name(self, db_session):
+        return {
+            r["name"]: r
+            for r in get_region_results(db_session)["regions"]
+        }
+
+    def test_returns_every_region_in_order(self, db_session):
+        _seed_regions(db_session)
+        names = [r["name"] for r in get_region_results(db_session)["regions"]]
+        assert names == ["London", "East of England", "Empty Region"]
+
+    def test_votes_and_seats_per_region(self, db_session):
+        _seed_regions(db_session)
+        london = self._by_name(db_session)["London"]
+        parties = {p["party_code"]: p for p in london["parties"]}
+        assert london["total_votes"] == 25000
+        assert london["constituency_count"] == 2
+        assert parties["L"]["total_votes"] == 14000
+        assert parties["L"]["seats"] == 1
+        assert parties["C"]["seats"] == 1
+        assert parties["G"]["seats"] == 0
+
+    def test_parties_sorted_by_seats_then_votes(self, db_session):
+        _seed_regions(db_session)
+        london = self._by_name(db_session)["London"]
+        assert [p["party_code"] for p in london["parties"]] == ["L", "C", "G"]
+
+    def test_region_without_results(self, db_session):
+        _seed_regions(db_session)
+        empty = self._by_name(db_session)["Empty Region"]
+        assert empty["parties"] == []
+        assert empty["total_votes"] == 0
+
+    def test_tie_awards_no_seat(self, db_session):
+        _, _, _, _, _, c3 = _seed_regions(db_session)
+        db_session.add(Result(constituency_id=c3.id, party_code="L",
+                              votes=6000))
+        db_session.commit()
+        east = self._by_name(db_session)["East of England"]
+        assert all(p["seats"] == 0 for p in east["parties"])
+
+    def test_excludes_inactive_results(self, db_session):
+        _, _, _, _, _, c3 = _seed_regions(db_session)
+        db_session.add(Result(constituency_id=c3.id, party_code="L",
+                              votes=9000, is_active=False))
+        db_session.commit()
+        east = self._by_name(db_session)["East of England"]
+        assert [p["party_code"] for p in east["parties"]] == ["C"]
+        assert east["parties"][0]["seats"] == 1
+
+
 class TestRegionDetailSoftDeleteFiltering:
     """Region detail should exclude results from soft-deleted uploads."""
 
@@ -148,7 +205,8 @@ class TestRegionDetailSoftDeleteFiltering:
             Result(constituency_id=c.id,
                    party_code="C",
                    votes=10000,
-                   upload_id=deleted_upload.id),
+                   upload_id=deleted_upload.id,
+                   is_active=False),
             # L has fewer votes but from active upload
             Result(constituency_id=c.id,
                    party_code="L",
@@ -190,7 +248,8 @@ class TestRegionDetailSoftDeleteFiltering:
             Result(constituency_id=c.id,
                    party_code="C",
                    votes=8000,
-                   upload_id=deleted_upload.id))
+                   upload_id=deleted_upload.id,
+                   is_active=False))
         db_session.commit()
 
         result = get_region_detail(db_session, region.id)
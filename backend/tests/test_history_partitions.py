@@ -0,0 +1,119 @@
+"""Tests for result_history partition helpers.
+
+Partitioning itself needs PostgreSQL; on SQLite the helpers must fall back
+to plain-table behaviour, and partition creation runs against a stand-in
+connection.
+"""
+from contextlib import contextmanager
+
+import pytest
+
+from app.config import settings
+from app.services import history_partitions
+from app.services.history_partitions import (
+    ensure_history_partitions,
+    is_partitioned,
+    partition_bounds,
+    partition_name,
+    partition_width,
+)
+
+
+@pytest.fixture(autouse=True)
+def _width(monkeypatch):
+    monkeypatch.setattr(settings, "HISTORY_PARTITION_UPLOADS", 50)
+
+
+class TestPartitionBounds:
+
+    @pytest.mark.parametrize("upload_id, bounds", [
+        (1, (1, 51)),
+        (50, (1, 51)),
+        (51, (51, 101)),
+        (120, (101, 151)),
+    ])
+    def test_ranges(self, upload_id, bounds):
+        assert partition_bounds(upload_id) == bounds
+
+    def test_name(self):
+        assert partition_name(75) == "result_history_u51"
+
+    def test_explicit_width(self):
+        assert partition_bounds(75, 20) == (61, 81)
+        assert partition_name(75, 20) == "result_history_u61"
+
+
+class TestPartitionWidth:
+
+    def test_setting_without_partitions(self):
+        assert partition_width({}) == 50
+
+    def test_existing_partitions_win(self, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "HISTORY_PARTITION_UPLOADS", 20)
+        ranges = {
+            "result_history_u1": (1, 51),
+            "result_history_u51": (51, 101),
+        }
+        assert partition_width(ranges) == 50
+        assert "HISTORY_PARTITION_UPLOADS is 20" in caplog.text
+
+    def test_matching_setting_is_quiet(self, caplog):
+        assert partition_width({"result_history_u1": (1, 51)}) == 50
+        assert caplog.text == ""
+
+
+class TestPlainTableFallback:
+
+    def test_sqlite_is_not_partitioned(self, db_session):
+        assert is_partitioned(db_session.get_bind()) is False
+        assert ensure_history_partitions(db_session) == []
+
+
+class _Connection:
+    """Stand-in for a PostgreSQL connection, recording savepoints."""
+
+    def __init__(self):
+        self.savepoints = []
+
+    @contextmanager
+    def begin_nested(self):
+        self.savepoints.append("begin")
+        try:
+            yield
+        except Exception:
+            self.savepoints.append("rollback")
+            raise
+        self.savepoints.append("release")
+
+
+class TestCreatePartitions:
+
+    @pytest.fixture
+    def created(self, monkeypatch):
+        created = []
+
+        def create(conn, lower, upper):
+            if lower == 101:
+                raise RuntimeError("overlaps")
+            created.append((lower, upper))
+
+        monkeypatch.setattr(history_partitions, "_create_partition", create)
+        monkeypatch.setattr(history_partitions, "_in_default",
+                            lambda conn, lower, upper: lower == 1)
+        return created
+
+    def test_range_in_default_is_skipped(self, created):
+        conn = _Connection()
+        ranges = [(1, 51), (51, 101)]
+        names = history_partitions._create_partitions(conn, ranges)
+        assert names == ["result_history_u51"]
+        assert created == [(51, 101)]
+
+    def test_failure_leaves_later_ranges(self, created):
+        conn = _Connection()
+        ranges = [(1, 51), (51, 101), (101, 151), (151, 201)]
+        names = history_partitions._create_partitions(conn, ranges)
+        assert names == ["result_history_u51", "result_history_u151"]
+        assert conn.savepoints == [
+            "begin", "release", "begin", "rollback", "begin", "release"
+        ]
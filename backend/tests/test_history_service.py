@@ -0,0 +1,294 @@
+"""Tests for state checkpoints and point-in-time result queries."""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.models.result_history import ResultHistory
+from app.models.state_checkpoint import StateCheckpoint
+from app.models.upload_log import UploadLog
+from app.services import history_service
+from app.services.checkpoint_service import decode_state, encode_state
+from app.services.history_service import results_state_as_of
+from app.services.totals_service import get_total_results_as_of
+from tests.conftest import seed_constituencies, upload_text
+
+UPLOADS = [
+    "Bedford,100,C,50,L\nOxford,10,C,90,L\n",
+    "Bedford,100,C,150,L\n",
+    "Oxford,200,C,90,L\nBedford,100,C,150,L,20,G\n",
+]
+
+
+def _seats(totals: dict) -> dict:
+    return {p["party_code"]: p["seats"] for p in totals["parties"]}
+
+
+def _votes(totals: dict) -> dict:
+    return {p["party_code"]: p["total_votes"] for p in totals["parties"]}
+
+
+@pytest.fixture
+def uploads(client, db_session):
+    seed_constituencies(db_session, ["Bedford", "Oxford"])
+    return [upload_text(client, content) for content in UPLOADS]
+
+
+class TestStateEncoding:
+
+    def test_round_trip(self):
+        rows = [(1, 100, 3), (2, 0, None)]
+        assert decode_state(encode_state(rows)) == {
+            1: (100, 3),
+            2: (0, None),
+        }
+
+
+class TestCheckpoints:
+
+    def test_written_every_n_uploads(self, client, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "CHECKPOINT_EVERY_UPLOADS", 2)
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        ids = [upload_text(client, content) for content in UPLOADS]
+        checkpoints = db_session.query(StateCheckpoint).all()
+        assert [c.upload_id for c in checkpoints] == [ids[1]]
+        assert checkpoints[0].result_count == 4
+
+    def test_written_after_interval(self, client, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "CHECKPOINT_EVERY_UPLOADS", 0)
+        monkeypatch.setattr(settings, "CHECKPOINT_INTERVAL_MINUTES", 10)
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        first = upload_text(client, UPLOADS[0])
+        assert db_session.query(StateCheckpoint).count() == 0
+
+        stale = datetime.now(timezone.utc) - timedelta(minutes=30)
+        db_session.get(UploadLog, first).completed_at = stale
+        db_session.commit()
+        second = upload_text(client, UPLOADS[1])
+        upload_text(client, UPLOADS[2])
+        checkpoints = db_session.query(StateCheckpoint).all()
+        assert [c.upload_id for c in checkpoints] == [second]
+
+    def test_disabled(self, client, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "CHECKPOINT_EVERY_UPLOADS", 0)
+        monkeypatch.setattr(settings, "CHECKPOINT_INTERVAL_MINUTES", 0)
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        for content in UPLOADS:
+            upload_text(client, content)
+        assert db_session.query(StateCheckpoint).count() == 0
+
+    def test_invalidated_by_deleting_an_earlier_upload(self, client,
+                                                       db_session,
+                                                       monkeypatch):
+        monkeypatch.setattr(settings, "CHECKPOINT_EVERY_UPLOADS", 1)
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        ids = [upload_text(client, content) for content in UPLOADS]
+        client.delete(f"/api/uploads/{ids[1]}")
+        db_session.expire_all()
+        remaining = [c.upload_id for c in db_session.query(StateCheckpoint)]
+        assert remaining == [ids[0]]
+
+
+class TestRollbackFromCheckpoint:
+
+    @pytest.fixture
+    def compacted(self, client, db_session, monkeypatch):
+        """Three uploads with the history up to the second one removed, so
+        only its checkpoint remembers those values."""
+        monkeypatch.setattr(settings, "CHECKPOINT_EVERY_UPLOADS", 2)
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        ids = [upload_text(client, content) for content in UPLOADS]
+        db_session.query(ResultHistory).filter(
+            ResultHistory.upload_id <= ids[1]).delete()
+        db_session.commit()
+        return ids
+
+    @pytest.mark.parametrize("path", ["", "/stream"])
+    def test_restores_checkpointed_values(self, client, compacted, path):
+        client.delete(f"/api/uploads/{compacted[2]}{path}")
+        totals = client.get("/api/totals").json()
+        assert _votes(totals) == {"C": 110, "L": 240}
+        assert _seats(totals) == {"L": 2, "C": 0}
+
+
+class TestTotalsAsOf:
+
+    def test_each_upload(self, client, uploads):
+        first = client.get(f"/api/totals?as_of_upload={uploads[0]}").json()
+        assert _votes(first) == {"C": 110, "L": 140}
+        assert _seats(first) == {"C": 1, "L": 1}
+
+        second = client.get(f"/api/totals?as_of_upload={uploads[1]}").json()
+        assert _seats(second) == {"L": 2, "C": 0}
+
+    def test_latest_matches_current(self, client, uploads):
+        current = client.get("/api/totals").json()
+        as_of = client.get(f"/api/totals?as_of_upload={uploads[-1]}").json()
+        assert as_of == current
+
+    def test_before_any_upload(self, client, uploads):
+        resp = client.get("/api/totals?as_of_upload=0")
+        assert resp.json()["parties"] == []
+        assert resp.headers["x-as-of-upload"] == "0"
+
+    def test_same_with_and_without_checkpoints(self, client, db_session,
+                                               monkeypatch):
+        monkeypatch.setattr(settings, "CHECKPOINT_EVERY_UPLOADS", 1)
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        ids = [upload_text(client, content) for content in UPLOADS]
+        with_checkpoints = [
+            results_state_as_of(db_session, upload_id) for upload_id in ids
+        ]
+        db_session.query(StateCheckpoint).delete()
+        db_session.commit()
+        replayed = [
+            results_state_as_of(db_session, upload_id) for upload_id in ids
+        ]
+        assert with_checkpoints == replayed
+
+    def test_deleted_upload_is_excluded(self, client, db_session, uploads):
+        client.delete(f"/api/uploads/{uploads[1]}")
+        totals = get_total_results_as_of(db_session, uploads[1])
+        assert _votes(totals) == {"C": 110, "L": 140}
+
+    def test_rejects_negative(self, client):
+        assert client.get("/api/totals?as_of_upload=-1").status_code == 422
+
+
+class TestConstituencyAsOf:
+
+    def _complete_at(self, db_session, upload_id, when):
+        db_session.get(UploadLog, upload_id).completed_at = when
+        db_session.commit()
+
+    def test_state_at_timestamp(self, client, db_session, uploads):
+        start = datetime(2024, 7, 4, 22, 0)
+        for i, upload_id in enumerate(uploads):
+            self._complete_at(db_session, upload_id,
+                              start + timedelta(hours=i))
+
+        as_of = (start + timedelta(minutes=90)).isoformat()
+        resp = client.get(f"/api/constituencies/1?as_of={as_of}")
+        assert resp.status_code == 200
+        assert resp.headers["x-as-of-upload"] == str(uploads[1])
+        data = resp.json()
+        assert data["winning_party_code"] == "L"
+        assert {
+            p["party_code"]: p["votes"]
+            for p in data["parties"]
+        } == {
+            "C": 100,
+            "L": 150
+        }
+
+    def test_before_first_upload(self, client, db_session, uploads):
+        for upload_id in uploads:
+            self._complete_at(db_session, upload_id, datetime(2024, 7, 5))
+        resp = client.get("/api/constituencies/1?as_of=2024-07-04T00:00:00")
+        data = resp.json()
+        assert data["parties"] == []
+        assert data["winning_party_code"] is None
+
+    def test_not_found(self, client):
+        resp = client.get("/api/constituencies/999?as_of=2024-07-04T00:00:00")
+        assert resp.status_code == 404
+
+
+class TestUploadDiff:
+
+    def test_changes_between_uploads(self, client, uploads):
+        resp = client.get(f"/api/uploads/diff?from={uploads[0]}"
+                          f"&to={uploads[2]}")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert (data["constituencies_changed"], data["results_changed"],
+                data["seats_flipped"]) == (2, 3, 2)
+        bedford, oxford = data["constituencies"]
+        assert (bedford["constituency_name"],
+                bedford["winning_party_code_before"],
+                bedford["winning_party_code_after"]) == ("Bedford", "C", "L")
+        assert [(p["party_code"], p["votes_before"], p["votes_after"])
+                for p in bedford["parties"]] == [("G", None, 20),
+                                                 ("L", 50, 150)]
+        assert [(p["party_code"], p["vote_delta"])
+                for p in oxford["parties"]] == [("C", 190)]
+        assert {(p["party_code"], p["vote_delta"], p["seats_gained"],
+                 p["seats_lost"])
+                for p in data["parties"]} == {("C", 190, 1, 1),
+                                              ("L", 100, 1, 1),
+                                              ("G", 20, 0, 0)}
+
+    def test_reversed_order_negates(self, client, uploads):
+        forward = client.get(f"/api/uploads/diff?from={uploads[0]}"
+                             f"&to={uploads[2]}").json()
+        backward = client.get(f"/api/uploads/diff?from={uploads[2]}"
+                              f"&to={uploads[0]}").json()
+        assert ({
+            p["party_code"]: -p["vote_delta"]
+            for p in backward["parties"]
+        } == {
+            p["party_code"]: p["vote_delta"]
+            for p in forward["parties"]
+        })
+        assert backward["constituencies"][0]["winning_party_code_after"] == "C"
+
+    @pytest.mark.parametrize("every, seek_share", [(0, 10), (1, 0), (1, 1000)])
+    def test_matches_totals_as_of(self, client, db_session, monkeypatch, every,
+                                  seek_share):
+        monkeypatch.setattr(settings, "CHECKPOINT_EVERY_UPLOADS", every)
+        # 0 always seeks each result, 1000 always scans the range
+        monkeypatch.setattr(history_service, "SEEK_SHARE", seek_share)
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        ids = [0] + [upload_text(client, content) for content in UPLOADS]
+        for start in ids:
+            for end in ids:
+                diff = client.get(
+                    f"/api/uploads/diff?from={start}&to={end}").json()
+                before = _votes(
+                    client.get(f"/api/totals?as_of_upload={start}").json())
+                after = _votes(
+                    client.get(f"/api/totals?as_of_upload={end}").json())
+                expected = {
+                    code: after.get(code, 0) - before.get(code, 0)
+                    for code in before.keys() | after.keys()
+                }
+                deltas = {
+                    p["party_code"]: p["vote_delta"]
+                    for p in diff["parties"] if p["vote_delta"]
+                }
+                assert deltas == {
+                    code: delta
+                    for code, delta in expected.items() if delta
+                }
+
+    def test_deleted_upload_is_excluded(self, client, uploads):
+        client.delete(f"/api/uploads/{uploads[2]}")
+        data = client.get(f"/api/uploads/diff?from={uploads[0]}"
+                          f"&to={uploads[2]}").json()
+        assert [c["constituency_name"]
+                for c in data["constituencies"]] == ["Bedford"]
+
+    def test_streams_ndjson_when_large(self, client, uploads, monkeypatch):
+        monkeypatch.setattr(settings, "UPLOAD_DIFF_STREAM_CONSTITUENCIES", 1)
+        resp = client.get(f"/api/uploads/diff?from=0&to={uploads[2]}")
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        summary, *constituencies = [
+            json.loads(line) for line in resp.text.splitlines()
+        ]
+        assert summary["constituencies_changed"] == 2
+        assert "constituencies" not in summary
+        assert [c["constituency_name"]
+                for c in constituencies] == ["Bedford", "Oxford"]
+
+    def test_streams_ndjson_on_request(self, client, uploads):
+        resp = client.get(
+            f"/api/uploads/diff?from={uploads[0]}"
+            f"&to={uploads[1]}",
+            headers={"Accept": "application/x-ndjson"})
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        assert len(resp.text.splitlines()) == 2
+
+    def test_not_found(self, client, uploads):
+        resp = client.get(f"/api/uploads/diff?from={uploads[0]}&to=999")
+        assert resp.status_code == 404
@@ -157,3 +157,74 @@ class TestIngestFile:
         assert history[0].votes == 100
         assert history[1].upload_id == u2.id
         assert history[1].votes == 500
+
+
+class TestImpactSummary:
+    """ingest_file stores what each upload changed."""
+
+    def test_first_upload(self, db_session):
+        _seed_constituencies(db_session, ["Bedford", "Oxford"])
+        upload = ingest_file(db_session, "Bedford,100,C,200,L\nOxford,50,C",
+                             "test.txt")
+        assert upload.impact == {
+            "constituencies_touched":
+            2,
+            "constituencies_changed":
+            2,
+            "results_changed":
+            3,
+            "seats_flipped":
+            2,
+            "parties": [
+                {
+                    "party_code": "L",
+                    "party_name": "Labour Party",
+                    "vote_delta": 200,
+                    "seats_gained": 1,
+                    "seats_lost": 0,
+                },
+                {
+                    "party_code": "C",
+                    "party_name": "Conservative Party",
+                    "vote_delta": 150,
+                    "seats_gained": 1,
+                    "seats_lost": 0,
+                },
+            ],
+        }
+
+    def test_counts_only_changes(self, db_session):
+        _seed_constituencies(db_session, ["Bedford", "Oxford"])
+        ingest_file(db_session, "Bedford,100,C,200,L\nOxford,50,C", "1.txt")
+        upload = ingest_file(db_session,
+                             "Bedford,300,C,200,L\nOxford,50,C\nOxford,9,G",
+                             "2.txt")
+        impact = upload.impact
+        assert impact["constituencies_touched"] == 2
+        assert impact["constituencies_changed"] == 2
+        assert impact["results_changed"] == 2
+        assert impact["seats_flipped"] == 1
+        assert [(p["party_code"], p["vote_delta"], p["seats_gained"],
+                 p["seats_lost"]) for p in impact["parties"]] == [
+                     ("C", 200, 1, 0),
+                     ("L", 0, 0, 1),
+                     ("G", 9, 0, 0),
+                 ]
+
+    def test_repeat_upload_changes_nothing(self, db_session):
+        _seed_constituencies(db_session, ["Bedford"])
+        ingest_file(db_session, "Bedford,100,C,200,L", "1.txt")
+        upload = ingest_file(db_session, "Bedford,100,C,200,L", "2.txt")
+        assert upload.impact == {
+            "constituencies_touched": 1,
+            "constituencies_changed": 0,
+            "results_changed": 0,
+            "seats_flipped": 0,
+            "parties": [],
+        }
+
+    def test_unmatched_lines_touch_nothing(self, db_session):
+        upload = ingest_file(db_session, "Nowhere,100,C", "test.txt")
+        assert upload.status == "completed"
+        assert upload.impact["constituencies_touched"] == 0
+        assert upload.impact["parties"] == []
@@ -102,6 +102,16 @@ class TestIngestFileStreaming:
         assert upload.status == "completed"
         assert upload.completed_at is not None
 
+    def test_impact_summary_stored(self, db_session):
+        _seed_constituencies(db_session, ["Bedford"])
+        list(ingest_file_streaming(db_session, "Bedford,100,C", "1.txt"))
+        list(ingest_file_streaming(db_session, "Bedford,100,C,300,L", "2.txt"))
+        upload = db_session.query(UploadLog).order_by(UploadLog.id).all()[-1]
+        assert upload.impact["results_changed"] == 1
+        assert upload.impact["seats_flipped"] == 1
+        assert [p["party_code"]
+                for p in upload.impact["parties"]] == ["L", "C"]
+
     def test_results_persisted_to_db(self, db_session):
         _seed_constituencies(db_session, ["Bedford"])
         list(
@@ -0,0 +1,149 @@
+"""Tests for the live results broadcaster and the /api/live stream."""
+import asyncio
+
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.services.ingestion import ingest_file
+from app.services.live_service import (
+    LiveBroadcaster,
+    Subscription,
+    broadcaster,
+    build_results_event,
+)
+from app.services.version_service import (
+    add_results_listener,
+    remove_results_listener,
+)
+from tests.conftest import seed_constituencies
+
+
+class TestSubscription:
+
+    def test_offer_queues_message(self):
+        subscription = Subscription(maxsize=2)
+        subscription.offer("a", "resync")
+        assert subscription.queue.get_nowait() == "a"
+
+    def test_slow_consumer_gets_resync(self):
+        subscription = Subscription(maxsize=2)
+        for message in ("a", "b", "c"):
+            subscription.offer(message, "resync")
+        assert subscription.dropped == 1
+        assert subscription.queue.qsize() == 1
+        assert subscription.queue.get_nowait() == "resync"
+
+
+class TestBuildResultsEvent:
+
+    def test_contains_changes_and_totals(self, db_session):
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        ingest_file(db_session, "Bedford,100,C,50,L\n")
+
+        version, message = build_results_event(db_session, since=0)
+        assert version == 1
+        assert message.startswith("event: results\n")
+        assert '"winning_party_code": "C"' in message
+        assert '"total_votes": 150' in message
+        assert "Oxford" not in message
+
+    def test_stale_since_sends_resync(self, db_session, monkeypatch):
+        from app.config import settings  # noqa: PLC0415
+        monkeypatch.setattr(settings, "CHANGE_LOG_RETENTION_VERSIONS", 1)
+        seed_constituencies(db_session, ["Bedford"])
+        ingest_file(db_session, "Bedford,100,C\n")
+        ingest_file(db_session, "Bedford,200,C\n")
+        ingest_file(db_session, "Bedford,300,C\n")
+
+        version, message = build_results_event(db_session, since=0)
+        assert version == 3
+        assert message.startswith("event: resync\n")
+
+
+class TestLiveBroadcaster:
+
+    def test_commit_fans_out_to_all_subscribers(self, db_engine, db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        factory = sessionmaker(bind=db_engine)
+        live = LiveBroadcaster(factory)
+
+        async def scenario():
+            await live.start()
+            add_results_listener(live.notify)
+            try:
+                subscribers = [live.subscribe() for _ in range(3)]
+
+                def write():
+                    db = factory()
+                    try:
+                        ingest_file(db, "Bedford,100,C\n")
+                    finally:
+                        db.close()
+
+                await asyncio.to_thread(write)
+                return [
+                    await asyncio.wait_for(s.queue.get(), timeout=5)
+                    for s in subscribers
+                ]
+            finally:
+                remove_results_listener(live.notify)
+                await live.stop()
+
+        messages = asyncio.run(scenario())
+        assert len(set(messages)) == 1
+        assert messages[0].startswith("event: results\n")
+        assert live.published_version == 1
+
+    def test_unsubscribed_client_receives_nothing(self):
+        live = LiveBroadcaster(session_factory=None)
+        subscription = live.subscribe()
+        live.unsubscribe(subscription)
+        live.publish("event: results\ndata: {}\n\n")
+        assert subscription.queue.empty()
+        assert live.subscriber_count == 0
+
+
+class TestLiveEndpoint:
+    """GET /api/live"""
+
+    def test_stream_starts_with_hello(self):
+
+        async def first_chunk():
+            scope = {
+                "type": "http",
+                "asgi": {
+                    "version": "3.0"
+                },
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": "/api/live",
+                "raw_path": b"/api/live",
+                "root_path": "",
+                "query_string": b"",
+                "headers": [],
+                "client": ("testclient", 50000),
+                "server": ("testserver", 80),
+            }
+            disconnected = asyncio.Event()
+            sent = []
+
+            async def receive():
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                sent.append(message)
+                if message["type"] == "http.response.body":
+                    disconnected.set()
+
+            await asyncio.wait_for(app(scope, receive, send), timeout=5)
+            return sent
+
+        sent = asyncio.run(first_chunk())
+        start, body = sent[0], sent[1]
+        assert start["status"] == 200
+        assert (b"content-type", b"text/event-stream; charset=utf-8"
+                ) in start["headers"]
+        assert body["body"].startswith(b"event: hello\n")
+        assert broadcaster.subscriber_count == 0
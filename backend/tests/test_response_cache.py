@@ -0,0 +1,128 @@
+"""Tests for pre-encoded response caching."""
+import io
+import json
+
+import pytest
+
+from app.routers import constituencies as constituencies_router
+from app.routers import totals as totals_router
+from app.services import response_cache as response_cache_module
+from app.services.response_cache import encode_json
+from app.services.results_cache import ResponseCache
+from tests.conftest import seed_constituencies
+
+
+class TestResponseCache:
+
+    def test_get_and_put(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.put(1, "totals", b"{}")
+        assert cache.get(1, "totals") == b"{}"
+        assert cache.get(2, "totals") is None
+
+    def test_newer_version_replaces_entries(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.put(1, "a", b"old")
+        cache.put(2, "b", b"new")
+        assert cache.get(1, "a") is None
+        assert cache.size == 3
+
+    def test_older_version_is_ignored(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.put(2, "a", b"new")
+        cache.put(1, "a", b"old")
+        assert cache.get(2, "a") == b"new"
+
+    def test_evicts_least_recently_used_over_cap(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.put(1, "a", b"aaaa")
+        cache.put(1, "b", b"bbbb")
+        cache.get(1, "a")
+        cache.put(1, "c", b"cccc")
+        assert cache.get(1, "b") is None
+        assert cache.get(1, "a") == b"aaaa"
+        assert cache.get(1, "c") == b"cccc"
+        assert cache.size == 8
+
+    def test_replacing_key_updates_size(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.put(1, "a", b"aaaa")
+        cache.put(1, "a", b"aa")
+        assert cache.size == 2
+
+    def test_skips_body_larger_than_cap(self):
+        cache = ResponseCache(max_bytes=4)
+        cache.put(1, "a", b"too large")
+        assert cache.get(1, "a") is None
+        assert cache.size == 0
+
+    def test_expire(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.put(1, "a", b"x")
+        cache.expire(2)
+        assert cache.get(1, "a") is None
+        assert cache.size == 0
+
+
+class TestEncodeJson:
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_compact_utf8(self, use_orjson, monkeypatch):
+        if not use_orjson:
+            monkeypatch.setattr(response_cache_module, "orjson", None)
+        elif response_cache_module.orjson is None:
+            pytest.skip("orjson not installed")
+        body = encode_json({"name": "Ynys Môn", "percentage": 12.5})
+        assert body == '{"name":"Ynys Môn","percentage":12.5}'.encode()
+
+
+class TestCachedRoutes:
+
+    def test_totals_served_from_cache_until_results_change(
+            self, client, db_session, monkeypatch):
+        seed_constituencies(db_session, ["Bedford"])
+        calls = []
+        original = totals_router.get_total_results
+
+        def counting(db):
+            calls.append(1)
+            return original(db)
+
+        monkeypatch.setattr(totals_router, "get_total_results", counting)
+
+        first = client.get("/api/totals")
+        second = client.get("/api/totals")
+        assert len(calls) == 1
+        assert first.content == second.content
+
+        client.post("/api/upload",
+                    files={
+                        "file": ("a.txt", io.BytesIO(b"Bedford,10,C"),
+                                 "text/plain")
+                    })
+        third = client.get("/api/totals")
+        assert len(calls) == 2
+        assert third.json()["parties"][0]["party_code"] == "C"
+
+    def test_list_cache_is_keyed_by_query(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford", "Oxford"])
+        all_pages = client.get("/api/constituencies")
+        searched = client.get("/api/constituencies?search=ox")
+        assert all_pages.json()["total"] == 2
+        assert searched.json()["total"] == 1
+
+    def test_list_matches_response_schema(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        client.post("/api/upload",
+                    files={
+                        "file": ("a.txt", io.BytesIO(b"Bedford,10,C,30,L"),
+                                 "text/plain")
+                    })
+        body = client.get("/api/constituencies").json()
+        validated = constituencies_router.ConstituencyListResponse(**body)
+        assert json.loads(validated.model_dump_json()) == body
+
+    def test_missing_constituency_is_not_cached(self, client, db_session):
+        assert client.get("/api/constituencies/1").status_code == 404
+        seed_constituencies(db_session, ["Bedford"])
+        assert client.get("/api/constituencies/1").status_code == 200
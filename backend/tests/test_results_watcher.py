@@ -0,0 +1,102 @@
+"""Tests for cross-worker results version propagation."""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import Base
+from app.models.results_version import ResultsVersion
+from app.services.results_cache import VersionedCache, expire_caches
+from app.services.results_watcher import ResultsWatcher
+from app.services.version_service import (
+    add_results_listener,
+    bump_results_version,
+    remove_results_listener,
+)
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    # A file database gives the watcher its own connection, like a
+    # separate worker process would have
+    engine = create_engine(f"sqlite:///{tmp_path / 'results.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def received():
+    versions = []
+    add_results_listener(versions.append)
+    yield versions
+    remove_results_listener(versions.append)
+
+
+class TestResultsWatcher:
+
+    def test_dispatch_skips_seen_versions(self, file_engine, received):
+        watcher = ResultsWatcher(file_engine)
+        watcher.dispatch(2)
+        watcher.dispatch(2)
+        watcher.dispatch(1)
+        assert received == [2]
+
+    def test_polls_versions_committed_elsewhere(self, file_engine, received,
+                                                monkeypatch):
+        monkeypatch.setattr(settings, "RESULTS_POLL_SECONDS", 0.01)
+        with Session(file_engine) as db:
+            bump_results_version(db)
+            db.commit()
+        received.clear()
+        watcher = ResultsWatcher(file_engine)
+
+        def external_write():
+            # Another worker's commit: no local after_commit notification
+            with Session(file_engine) as db:
+                db.execute(update(ResultsVersion).values(version=5))
+                db.commit()
+
+        async def scenario():
+            await watcher.start()
+            try:
+                assert watcher.seen_version == 1
+                await asyncio.to_thread(external_write)
+                for _ in range(200):
+                    if received:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await watcher.stop()
+
+        asyncio.run(scenario())
+        assert received == [5]
+
+    def test_polling_disabled(self, file_engine, monkeypatch):
+        monkeypatch.setattr(settings, "RESULTS_POLL_SECONDS", 0)
+        watcher = ResultsWatcher(file_engine)
+
+        async def scenario():
+            await watcher.start()
+            started = watcher._task is not None
+            await watcher.stop()
+            return started
+
+        assert asyncio.run(scenario()) is False
+
+
+class TestExpireCaches:
+
+    def test_drops_entries_for_older_versions(self):
+        cache = VersionedCache()
+        cache.put(1, "summary", b"old")
+        expire_caches(2)
+        assert cache.get(1, "summary") is None
+
+    def test_keeps_current_version(self):
+        cache = VersionedCache()
+        cache.put(2, "summary", b"current")
+        expire_caches(2)
+        assert cache.get(2, "summary") == b"current"
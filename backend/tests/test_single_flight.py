@@ -0,0 +1,109 @@
+"""Tests for concurrent read coalescing."""
+import threading
+import time
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+class TestSingleFlight:
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "body"
+
+        results = []
+
+        def caller():
+            results.append(flight.do("totals", compute))
+
+        threads = [threading.Thread(target=caller) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: flight.coalesced == 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [("body", 4)] * 5
+        assert flight.stats() == {"executions": 1, "coalesced": 4}
+
+    def test_sequential_calls_recompute(self):
+        flight = SingleFlight()
+        assert flight.do("k", lambda: 1) == (1, 0)
+        assert flight.do("k", lambda: 2) == (2, 0)
+        assert flight.executions == 2
+
+    def test_different_keys_do_not_coalesce(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        thread = threading.Thread(
+            target=lambda: flight.do("a", lambda: release.wait(5)))
+        thread.start()
+        _wait_for(lambda: flight.executions == 1)
+        assert flight.do("b", lambda: "b") == ("b", 0)
+        release.set()
+        thread.join()
+        assert flight.coalesced == 0
+
+    def test_leader_error_reaches_followers(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def compute():
+            release.wait(5)
+            raise RuntimeError("database unavailable")
+
+        def caller():
+            try:
+                flight.do("k", compute)
+            except RuntimeError as exc:
+                errors.append(str(exc))
+
+        threads = [threading.Thread(target=caller) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: flight.coalesced == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert errors == ["database unavailable"] * 3
+        with pytest.raises(ValueError):
+            flight.do("k", lambda: int("x"))
+
+
+class TestCoalescedEndpoints:
+
+    def test_totals_reports_coalesced_callers(self, client):
+        resp = client.get("/api/totals")
+        assert resp.status_code == 200
+        assert resp.headers["x-coalesced-callers"] == "0"
+        assert resp.json()["parties"] == []
+
+    def test_summary_reports_coalesced_callers(self, client):
+        resp = client.get("/api/constituencies/summary")
+        assert resp.status_code == 200
+        assert resp.headers["x-coalesced-callers"] == "0"
+        assert resp.json() == {"total": 0, "constituencies": []}
+
+    def test_health_reports_counters(self, client):
+        client.get("/api/totals")
+        stats = client.get("/api/health").json()["coalescing"]
+        assert stats["executions"] >= 1
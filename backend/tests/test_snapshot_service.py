@@ -0,0 +1,144 @@
+"""Tests for the shared memory-mapped results snapshot."""
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.services.ingestion import ingest_file
+from app.services.snapshot_service import (
+    ResultsSnapshot,
+    SnapshotPublisher,
+    build_snapshot,
+    encode_snapshot,
+    read_snapshot,
+    snapshot_file_version,
+    write_snapshot,
+)
+from app.services.totals_service import get_total_results
+from tests.conftest import seed_constituencies
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.snapshot")
+    monkeypatch.setattr(settings, "RESULTS_SNAPSHOT_PATH", path)
+    return path
+
+
+class TestEncodeSnapshot:
+
+    def test_round_trip(self):
+        data = encode_snapshot(
+            7,
+            [(1, "C", 150), (4, None, 80), (9, "L", 0)],
+            [("C", 100, 1), ("L", 130, 1)],
+        )
+        snapshot = ResultsSnapshot(data)
+
+        assert snapshot.version == 7
+        assert snapshot.total_votes == 230
+        assert snapshot.total_constituencies == 3
+        assert list(snapshot.constituency_ids) == [1, 4, 9]
+        assert list(snapshot.constituency_votes) == [150, 80, 0]
+        assert list(snapshot.party_rows()) == [("C", 100, 1), ("L", 130, 1)]
+        assert snapshot.winner(1) == "C"
+        assert snapshot.winner(4) is None
+        assert snapshot.winner(9) == "L"
+        assert snapshot.winner(5) is None
+
+    def test_empty(self):
+        snapshot = ResultsSnapshot(encode_snapshot(0, [], []))
+        assert snapshot.total_constituencies == 0
+        assert list(snapshot.party_rows()) == []
+
+    def test_rejects_other_data(self):
+        with pytest.raises(ValueError):
+            ResultsSnapshot(b"x" * 64)
+
+
+class TestBuildSnapshot:
+
+    def test_matches_database_totals(self, db_session):
+        seed_constituencies(db_session, ["Bedford", "Oxford", "Reading"])
+        ingest_file(db_session, "Bedford,100,C,50,L\nOxford,30,C,30,L\n")
+
+        snapshot = ResultsSnapshot(build_snapshot(db_session))
+
+        assert snapshot.version == 1
+        totals = get_total_results(db_session)
+        assert snapshot.total_constituencies == totals["total_constituencies"]
+        assert {code: (votes, seats)
+                for code, votes, seats in snapshot.party_rows()} == {
+                    p["party_code"]: (p["total_votes"], p["seats"])
+                    for p in totals["parties"]
+                }
+        winners = [snapshot.winner(i) for i in snapshot.constituency_ids]
+        assert winners == ["C", None, None]
+
+
+class TestReadSnapshot:
+
+    def test_disabled_without_path(self, monkeypatch):
+        monkeypatch.setattr(settings, "RESULTS_SNAPSHOT_PATH", "")
+        assert read_snapshot() is None
+
+    def test_missing_file(self, snapshot_path):
+        assert read_snapshot() is None
+
+    def test_remaps_after_replace(self, snapshot_path):
+        write_snapshot(snapshot_path, encode_snapshot(1, [], []))
+        assert read_snapshot().version == 1
+        assert read_snapshot() is read_snapshot()
+
+        write_snapshot(snapshot_path, encode_snapshot(2, [], []))
+        assert read_snapshot().version == 2
+
+
+class TestTotalsFromSnapshot:
+
+    def test_current_snapshot_is_used(self, db_session, snapshot_path):
+        write_snapshot(snapshot_path,
+                       encode_snapshot(0, [(1, "G", 5)], [("G", 5, 1)]))
+        totals = get_total_results(db_session)
+        assert totals["total_constituencies"] == 1
+        assert totals["parties"][0]["party_code"] == "G"
+
+    def test_stale_snapshot_is_ignored(self, db_session, snapshot_path):
+        seed_constituencies(db_session, ["Bedford"])
+        ingest_file(db_session, "Bedford,100,C\n")
+        write_snapshot(snapshot_path,
+                       encode_snapshot(0, [(1, "G", 5)], [("G", 5, 1)]))
+        totals = get_total_results(db_session)
+        assert totals["parties"][0]["party_code"] == "C"
+
+
+class TestSnapshotPublisher:
+
+    def test_publish_skips_current_file(self, db_engine, db_session,
+                                        snapshot_path):
+        seed_constituencies(db_session, ["Bedford"])
+        ingest_file(db_session, "Bedford,100,C\n")
+        publisher = SnapshotPublisher(sessionmaker(bind=db_engine))
+        publisher.path = snapshot_path
+
+        assert publisher.publish(1) is True
+        assert snapshot_file_version(snapshot_path) == 1
+        assert publisher.publish(1) is False
+
+    def test_background_thread_publishes_notified_version(
+            self, db_engine, db_session, snapshot_path):
+        seed_constituencies(db_session, ["Bedford"])
+        ingest_file(db_session, "Bedford,100,C\n")
+        publisher = SnapshotPublisher(sessionmaker(bind=db_engine))
+        publisher.start()
+        try:
+            publisher.notify(1)
+            deadline = time.monotonic() + 5
+            while (snapshot_file_version(snapshot_path) != 1
+                   and time.monotonic() < deadline):
+                time.sleep(0.01)
+        finally:
+            publisher.stop()
+
+        assert read_snapshot().winner(1) == "C"
@@ -0,0 +1,144 @@
+"""Tests for fingerprinted, precompressed static assets."""
+import gzip
+
+import pytest
+
+from app import compression
+from app.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    STATIC_DIR,
+    build_assets,
+    fingerprint_name,
+    parse_range,
+)
+
+TOPOJSON = "uk-constituencies.topojson"
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+class TestFingerprintName:
+
+    def test_inserts_hash_before_extension(self):
+        name = fingerprint_name("map.topojson", b"{}")
+        stem, digest, ext = name.split(".")
+        assert (stem, ext) == ("map", "topojson")
+        assert len(digest) == 12
+
+    def test_changes_with_content(self):
+        assert fingerprint_name("a.json", b"1") != fingerprint_name(
+            "a.json", b"2")
+
+
+class TestBuildAssets:
+
+    def test_writes_fingerprinted_file_and_siblings(self, tmp_path,
+                                                    gzip_only):
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "config.json").write_bytes(b'{"a": 1}' * 200)
+        (source / "logo.png").write_bytes(b"\x89PNG")
+        build = tmp_path / "build"
+
+        manifest = build_assets(source, build)
+
+        name = manifest["config.json"]
+        assert (build / name).read_bytes() == b'{"a": 1}' * 200
+        assert gzip.decompress(
+            (build / f"{name}.gz").read_bytes()) == b'{"a": 1}' * 200
+        assert not (build / f"{manifest['logo.png']}.gz").exists()
+
+    def test_is_idempotent(self, tmp_path, gzip_only):
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "config.json").write_bytes(b"{}")
+        build = tmp_path / "build"
+
+        first = build_assets(source, build)
+        mtime = (build / first["config.json"]).stat().st_mtime_ns
+        assert build_assets(source, build) == first
+        assert (build / first["config.json"]).stat().st_mtime_ns == mtime
+
+
+class TestParseRange:
+
+    def test_closed_range(self):
+        assert parse_range("bytes=0-9", 100) == (0, 9)
+
+    def test_open_range(self):
+        assert parse_range("bytes=90-", 100) == (90, 99)
+
+    def test_suffix_range(self):
+        assert parse_range("bytes=-10", 100) == (90, 99)
+
+    def test_end_is_clamped(self):
+        assert parse_range("bytes=95-200", 100) == (95, 99)
+
+    def test_unsupported_forms_are_ignored(self):
+        assert parse_range("bytes=0-1,5-6", 100) is None
+        assert parse_range("items=0-1", 100) is None
+
+    def test_unsatisfiable(self):
+        with pytest.raises(ValueError):
+            parse_range("bytes=100-", 100)
+
+
+@pytest.mark.skipif(not STATIC_DIR.is_dir(), reason="no static assets")
+class TestAssetEndpoints:
+
+    def _url(self, client):
+        resp = client.get("/api/assets/manifest")
+        assert resp.status_code == 200
+        assert resp.headers["cache-control"] == "no-cache"
+        return resp.json()["assets"][TOPOJSON]
+
+    def test_manifest_lists_fingerprinted_urls(self, client):
+        url = self._url(client)
+        assert url.startswith("/assets/uk-constituencies.")
+        assert url.endswith(".topojson")
+
+    def test_serves_precompressed_sibling(self, client, gzip_only):
+        resp = client.get(self._url(client),
+                          headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert resp.content == (STATIC_DIR / TOPOJSON).read_bytes()
+
+    def test_serves_identity_with_ranges(self, client):
+        resp = client.get(self._url(client),
+                          headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+        assert resp.headers["accept-ranges"] == "bytes"
+        assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    def test_range_request(self, client):
+        content = (STATIC_DIR / TOPOJSON).read_bytes()
+        resp = client.get(self._url(client), headers={"Range": "bytes=0-9"})
+        assert resp.status_code == 206
+        assert resp.content == content[:10]
+        assert resp.headers["content-range"] == f"bytes 0-9/{len(content)}"
+
+    def test_unsatisfiable_range(self, client):
+        size = (STATIC_DIR / TOPOJSON).stat().st_size
+        resp = client.get(self._url(client),
+                          headers={"Range": f"bytes={size}-"})
+        assert resp.status_code == 416
+        assert resp.headers["content-range"] == f"bytes */{size}"
+
+    def test_conditional_request(self, client, gzip_only):
+        url = self._url(client)
+        first = client.get(url, headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["etag"]
+        resp = client.get(url,
+                          headers={
+                              "Accept-Encoding": "gzip",
+                              "If-None-Match": etag
+                          })
+        assert resp.status_code == 304
+
+    def test_unknown_asset(self, client):
+        assert client.get("/assets/missing.json").status_code == 404
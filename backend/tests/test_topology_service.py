@@ -0,0 +1,206 @@
+"""Tests for per-region, multi-resolution TopoJSON slices."""
+import json
+
+from app.models.constituency import Constituency
+from app.models.region import Region
+from app.services.topology_service import (
+    RESOLUTIONS,
+    Resolution,
+    TopologySlicer,
+    decode_arcs,
+    simplify,
+    slice_topology,
+)
+from app.static_assets import STATIC_DIR
+
+FULL = Resolution(tolerance=0.0, quantization=1_000)
+
+
+def _topology():
+    # Two squares sharing the arc x=1, plus a third, unrelated square
+    return {
+        "type": "Topology",
+        "arcs": [
+            [[1, 0], [1, 1]],
+            [[1, 1], [0, 1], [0, 0], [1, 0]],
+            [[1, 0], [2, 0], [2, 1], [1, 1]],
+            [[5, 5], [6, 5], [6, 6], [5, 6], [5, 5]],
+        ],
+        "objects": {
+            "wpc": {
+                "type":
+                "GeometryCollection",
+                "geometries": [
+                    {
+                        "type": "Polygon",
+                        "arcs": [[0, 1]],
+                        "properties": {
+                            "pcon19cd": "A",
+                            "pcon19nm": "Alpha"
+                        },
+                    },
+                    {
+                        "type": "Polygon",
+                        "arcs": [[2, ~0]],
+                        "properties": {
+                            "pcon19cd": "B",
+                            "pcon19nm": "Béta"
+                        },
+                    },
+                    {
+                        "type": "Polygon",
+                        "arcs": [[3]],
+                        "properties": {
+                            "pcon19cd": "C",
+                            "pcon19nm": "Gamma"
+                        },
+                    },
+                ],
+            }
+        },
+    }
+
+
+class TestSimplify:
+
+    def test_drops_points_within_tolerance(self):
+        points = [(0, 0), (1, 0.001), (2, 0)]
+        assert simplify(points, 0.01) == [(0, 0), (2, 0)]
+
+    def test_keeps_points_beyond_tolerance(self):
+        points = [(0, 0), (1, 1), (2, 0)]
+        assert simplify(points, 0.01) == points
+
+    def test_zero_tolerance_keeps_everything(self):
+        points = [(0, 0), (1, 0), (2, 0)]
+        assert simplify(points, 0) == points
+
+    def test_closed_arc_stays_a_ring(self):
+        ring = [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]
+        kept = simplify(ring, 10)
+        assert len(kept) >= 4
+        assert kept[0] == kept[-1]
+
+
+class TestSliceTopology:
+
+    def test_keeps_only_listed_geometries_and_their_arcs(self):
+        sliced = slice_topology(_topology(), {"B"}, set(), FULL)
+        geometries = sliced["objects"]["wpc"]["geometries"]
+        assert [g["properties"]["pcon19cd"] for g in geometries] == ["B"]
+        assert len(sliced["arcs"]) == 2
+
+    def test_shared_arc_is_stored_once_and_remapped(self):
+        sliced = slice_topology(_topology(), {"A", "B"}, set(), FULL)
+        first, second = sliced["objects"]["wpc"]["geometries"]
+        assert len(sliced["arcs"]) == 3
+        assert first["arcs"] == [[0, 1]]
+        assert second["arcs"] == [[2, ~0]]
+
+    def test_matches_by_normalised_name(self):
+        sliced = slice_topology(_topology(), set(), {"beta"}, FULL)
+        geometries = sliced["objects"]["wpc"]["geometries"]
+        assert [g["properties"]["pcon19cd"] for g in geometries] == ["B"]
+
+    def test_quantised_arcs_decode_to_original_coordinates(self):
+        topology = _topology()
+        sliced = slice_topology(topology, {"A", "B"}, set(), FULL)
+        decoded = decode_arcs(sliced)
+        assert sliced["bbox"] == [0, 0, 2, 1]
+        for got, expected in zip(decoded, topology["arcs"][:3]):
+            for (x, y), (ex, ey) in zip(got, expected):
+                assert abs(x - ex) < 0.01 and abs(y - ey) < 0.01
+
+    def test_no_match_returns_empty_topology(self):
+        sliced = slice_topology(_topology(), {"Z"}, set(), FULL)
+        assert sliced["arcs"] == []
+        assert sliced["objects"]["wpc"]["geometries"] == []
+
+    def test_lower_resolution_is_smaller(self):
+        topology = json.loads(
+            (STATIC_DIR / "uk-constituencies.topojson").read_text())
+        codes = {
+            g["properties"]["pcon19cd"]
+            for g in next(iter(topology["objects"].values()))["geometries"]
+            if g["properties"]["pcon19cd"].startswith("S")
+        }
+        sizes = [
+            len(json.dumps(
+                slice_topology(topology, codes, set(), RESOLUTIONS[name])))
+            for name in ("low", "medium", "high")
+        ]
+        assert sizes == sorted(sizes)
+        assert sizes[-1] < len(json.dumps(topology))
+
+
+class TestTopologySlicer:
+
+    def _slicer(self, tmp_path):
+        source = tmp_path / "map.topojson"
+        source.write_text(json.dumps(_topology()))
+        return TopologySlicer(source, tmp_path / "cache")
+
+    def test_writes_slice_to_disk(self, tmp_path):
+        key, body = self._slicer(tmp_path).get("high", {"A"}, set())
+        cached = tmp_path / "cache" / f"{key}.topojson"
+        assert cached.read_bytes() == body.identity
+
+    def test_reuses_disk_cache_across_instances(self, tmp_path):
+        key, _ = self._slicer(tmp_path).get("high", {"A"}, set())
+        (tmp_path / "cache" / f"{key}.topojson").write_bytes(b"{}")
+        _, body = self._slicer(tmp_path).get("high", {"A"}, set())
+        assert body.identity == b"{}"
+
+    def test_key_depends_on_resolution_and_members(self, tmp_path):
+        slicer = self._slicer(tmp_path)
+        keys = {
+            slicer.slice_key("low", {"A"}, set()),
+            slicer.slice_key("high", {"A"}, set()),
+            slicer.slice_key("low", {"A", "B"}, set()),
+        }
+        assert len(keys) == 3
+
+
+class TestRegionTopologyEndpoint:
+
+    def _seed(self, db_session):
+        db_session.add(Region(id=1, name="South East", sort_order=7))
+        db_session.add_all([
+            Constituency(name="Aldershot", pcon24_code="E14000530",
+                         region_id=1),
+            Constituency(name="Basingstoke", region_id=1),
+        ])
+        db_session.commit()
+
+    def test_region_not_found(self, client):
+        resp = client.get("/api/geography/regions/999/topojson")
+        assert resp.status_code == 404
+
+    def test_invalid_resolution(self, client, db_session):
+        self._seed(db_session)
+        resp = client.get("/api/geography/regions/1/topojson?resolution=max")
+        assert resp.status_code == 422
+
+    def test_returns_region_geometries(self, client, db_session):
+        self._seed(db_session)
+        resp = client.get("/api/geography/regions/1/topojson?resolution=low")
+        assert resp.status_code == 200
+        geometries = next(iter(resp.json()["objects"].values()))["geometries"]
+        names = sorted(g["properties"]["pcon19nm"] for g in geometries)
+        assert names == ["Aldershot", "Basingstoke"]
+
+    def test_not_modified_with_matching_etag(self, client, db_session):
+        self._seed(db_session)
+        url = "/api/geography/regions/1/topojson"
+        etag = client.get(url).headers["etag"]
+        # Weak: the gzip and br bodies share it
+        assert etag.startswith('W/"topology-')
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+    def test_compressed_when_accepted(self, client, db_session):
+        self._seed(db_session)
+        resp = client.get("/api/geography/regions/1/topojson?resolution=high",
+                          headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.json()["type"] == "Topology"
@@ -72,6 +72,38 @@ class TestGetTotalResults:
         assert parties["C"]["seats"] == 0
         assert parties["L"]["seats"] == 0
 
+    def test_tie_below_first_place_still_awards_seat(self, db_session):
+        c = Constituency(name="Close Second")
+        db_session.add(c)
+        db_session.flush()
+        db_session.add_all([
+            Result(constituency_id=c.id, party_code="C", votes=7000),
+            Result(constituency_id=c.id, party_code="L", votes=5000),
+            Result(constituency_id=c.id, party_code="LD", votes=5000),
+        ])
+        db_session.commit()
+
+        result = get_total_results(db_session)
+        parties = {p["party_code"]: p for p in result["parties"]}
+        assert parties["C"]["seats"] == 1
+        assert parties["L"]["seats"] == 0
+        assert parties["LD"]["seats"] == 0
+
+    def test_three_way_tie_awards_no_seat(self, db_session):
+        c = Constituency(name="Three Way")
+        db_session.add(c)
+        db_session.flush()
+        db_session.add_all([
+            Result(constituency_id=c.id, party_code="C", votes=4000),
+            Result(constituency_id=c.id, party_code="L", votes=4000),
+            Result(constituency_id=c.id, party_code="G", votes=4000),
+        ])
+        db_session.commit()
+
+        result = get_total_results(db_session)
+        assert all(p["seats"] == 0 for p in result["parties"])
+        assert result["total_votes"] == 12000
+
     def test_empty_database(self, db_session):
         result = get_total_results(db_session)
         assert result["total_constituencies"] == 0
@@ -129,7 +161,8 @@ class TestTotalsSoftDeleteFiltering:
             Result(constituency_id=c.id,
                    party_code="C",
                    votes=9000,
-                   upload_id=deleted_upload.id),
+                   upload_id=deleted_upload.id,
+                   is_active=False),
             Result(constituency_id=c.id,
                    party_code="L",
                    votes=3000,
@@ -167,7 +200,8 @@ class TestTotalsSoftDeleteFiltering:
             Result(constituency_id=c.id,
                    party_code="C",
                    votes=10000,
-                   upload_id=deleted_upload.id),
+                   upload_id=deleted_upload.id,
+                   is_active=False),
             Result(constituency_id=c.id, party_code="L", votes=5000),
         ])
         db_session.commit()
@@ -200,7 +234,8 @@ class TestTotalsSoftDeleteFiltering:
             Result(constituency_id=c.id,
                    party_code="C",
                    votes=8000,
-                   upload_id=deleted_upload.id))
+                   upload_id=deleted_upload.id,
+                   is_active=False))
         db_session.commit()
 
         result = get_total_results(db_session)
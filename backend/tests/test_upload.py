@@ -267,3 +267,41 @@ class TestListUploadsEndpoint:
         resp = client.get("/api/uploads")
         ids = [u["id"] for u in resp.json()["uploads"]]
         assert ids == sorted(ids, reverse=True)
+
+
+class TestGetUploadEndpoint:
+
+    def test_returns_impact_summary(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        resp = client.post(
+            "/api/upload",
+            files={
+                "file":
+                ("r.txt", io.BytesIO(b"Bedford,100,C,200,L"), "text/plain")
+            },
+        )
+        upload_id = resp.json()["upload_id"]
+        resp = client.get(f"/api/uploads/{upload_id}")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["id"] == upload_id
+        assert data["impact"]["constituencies_changed"] == 1
+        assert data["impact"]["parties"][0]["seats_gained"] == 1
+        listed = client.get("/api/uploads").json()["uploads"][0]
+        assert listed["impact"] == data["impact"]
+
+    def test_includes_deleted_uploads(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        resp = client.post(
+            "/api/upload",
+            files={
+                "file": ("r.txt", io.BytesIO(b"Bedford,1,C"), "text/plain")
+            },
+        )
+        upload_id = resp.json()["upload_id"]
+        client.delete(f"/api/uploads/{upload_id}")
+        data = client.get(f"/api/uploads/{upload_id}").json()
+        assert data["deleted_at"] is not None
+
+    def test_not_found(self, client):
+        assert client.get("/api/uploads/999").status_code == 404
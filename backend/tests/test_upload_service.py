@@ -6,7 +6,10 @@ import pytest
 from app.models.constituency import Constituency
 from app.models.result import Result
 from app.models.result_history import ResultHistory
+from app.models.state_checkpoint import StateCheckpoint
 from app.models.upload_log import UploadLog
+from app.services.checkpoint_service import write_checkpoint
+from app.services.version_service import get_results_version
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -80,7 +83,7 @@ class TestSoftDeleteEndpoint:
 
     def test_soft_delete_removes_result_with_no_prior_history(
             self, client, db_session):
-        """Result with no prior upload history is deleted on soft-delete."""
+        """Result with no prior upload history is deactivated on soft-delete."""
         c = Constituency(name="TestConstituency")
         db_session.add(c)
         db_session.flush()
@@ -102,9 +105,9 @@ class TestSoftDeleteEndpoint:
         # Delete upload
         client.delete(f"/api/uploads/{upload.id}")
 
-        # Result should be deleted (no prior upload to roll back to)
+        # Result should be inactive (no prior upload to roll back to)
         remaining = db_session.query(Result).filter(
-            Result.constituency_id == c.id).all()
+            Result.constituency_id == c.id, Result.is_active.is_(True)).all()
         assert len(remaining) == 0
 
 
@@ -157,7 +160,7 @@ class TestSoftDeleteRollback:
 
     def test_delete_removes_result_with_no_prior_upload(
             self, client, db_session):
-        """Upload 1 creates a result. Delete upload 1 → result deleted."""
+        """Upload 1 creates a result. Delete upload 1 → result inactive."""
         uid1 = self._seed_and_upload(client, db_session, "TestPlace",
                                      b"TestPlace,500,C", "only.txt")
 
@@ -168,10 +171,10 @@ class TestSoftDeleteRollback:
         # Delete the only upload
         client.delete(f"/api/uploads/{uid1}")
 
-        # Result should be gone
+        # Result should be inactive
         db_session.expire_all()
         result = db_session.query(Result).filter_by(party_code="C").first()
-        assert result is None
+        assert result.is_active is False
 
     def test_delete_only_affects_results_from_that_upload(
             self, client, db_session):
@@ -193,11 +196,11 @@ class TestSoftDeleteRollback:
         assert result_a.votes == 100
         assert result_a.upload_id == uid1
 
-        # PlaceB result deleted (no prior history)
+        # PlaceB result inactive (no prior history)
         c_b = db_session.query(Constituency).filter_by(name="PlaceB").first()
         result_b = db_session.query(Result).filter_by(
             constituency_id=c_b.id).first()
-        assert result_b is None
+        assert result_b.is_active is False
 
     def test_chain_rollback(self, client, db_session):
         """Upload 1→100, Upload 2→200, Upload 3→300.
@@ -223,8 +226,8 @@ class TestSoftDeleteRollback:
         assert result.votes == 100
         assert result.upload_id == uid1
 
-    def test_history_cleaned_up_after_delete(self, client, db_session):
-        """History rows for the deleted upload are removed."""
+    def test_history_kept_inactive_after_delete(self, client, db_session):
+        """History rows for the deleted upload are kept, flagged inactive."""
         uid1 = self._seed_and_upload(client, db_session, "TestPlace",
                                      b"TestPlace,100,L", "first.txt")
         uid2 = self._seed_and_upload(client, db_session, "TestPlace",
@@ -233,22 +236,361 @@ class TestSoftDeleteRollback:
         # Delete upload 2
         client.delete(f"/api/uploads/{uid2}")
 
-        # History for upload 2 should be gone
+        # History for upload 2 should be inactive
+        db_session.expire_all()
         history_for_u2 = db_session.query(ResultHistory).filter_by(
             upload_id=uid2).all()
-        assert len(history_for_u2) == 0
+        assert [h.is_active for h in history_for_u2] == [False]
 
         # History for upload 1 should remain
         history_for_u1 = db_session.query(ResultHistory).filter_by(
             upload_id=uid1).all()
         assert len(history_for_u1) >= 1
 
+    def test_rolled_back_result_stays_active(self, client, db_session):
+        self._seed_and_upload(client, db_session, "TestPlace",
+                              b"TestPlace,100,L", "first.txt")
+        uid2 = self._seed_and_upload(client, db_session, "TestPlace",
+                                     b"TestPlace,200,L", "second.txt")
+
+        client.delete(f"/api/uploads/{uid2}")
+
+        db_session.expire_all()
+        result = db_session.query(Result).filter_by(party_code="L").first()
+        assert result.is_active is True
+
+    def test_delete_deactivates_results_without_history(
+            self, client, db_session):
+        """Results attributed to the upload but with no history to restore
+        from are kept and flagged inactive."""
+        upload = _create_upload(db_session)
+        c = Constituency(name="Legacy")
+        db_session.add(c)
+        db_session.flush()
+        db_session.add(
+            Result(constituency_id=c.id,
+                   party_code="C",
+                   votes=700,
+                   upload_id=upload.id))
+        db_session.commit()
+
+        client.delete(f"/api/uploads/{upload.id}")
+
+        db_session.expire_all()
+        result = db_session.query(Result).filter_by(party_code="C").one()
+        assert result.is_active is False
+        totals = client.get("/api/totals").json()
+        assert totals["total_votes"] == 0
+
+    def test_reupload_reactivates_result(self, client, db_session):
+        upload = _create_upload(db_session)
+        c = Constituency(name="TestPlace")
+        db_session.add(c)
+        db_session.flush()
+        db_session.add(
+            Result(constituency_id=c.id,
+                   party_code="L",
+                   votes=700,
+                   upload_id=upload.id))
+        db_session.commit()
+        client.delete(f"/api/uploads/{upload.id}")
+
+        self._seed_and_upload(client, db_session, "TestPlace",
+                              b"TestPlace,900,L", "again.txt")
+
+        db_session.expire_all()
+        result = db_session.query(Result).filter_by(party_code="L").one()
+        assert result.is_active is True
+        assert result.votes == 900
+
 
 # ===========================================================================
 # Upload Filters via API
 # ===========================================================================
 
 
+class TestUploadImpact:
+    """GET /api/uploads/{id}/impact previews a delete without applying it."""
+
+    FIRST = b"Bedford,100,C,50,L\nOxford,10,C,90,L\n"
+    SECOND = b"Bedford,100,C,150,L\nCambridge,30,G\n"
+
+    @pytest.fixture
+    def uploads(self, client, db_session):
+        from tests.conftest import seed_constituencies  # noqa: PLC0415
+        seed_constituencies(db_session, ["Bedford", "Cambridge", "Oxford"])
+        ids = []
+        for content in (self.FIRST, self.SECOND):
+            resp = client.post(
+                "/api/upload",
+                files={"file": ("r.txt", io.BytesIO(content), "text/plain")})
+            ids.append(resp.json()["upload_id"])
+        return ids
+
+    def test_reverts_removes_and_flips(self, client, uploads):
+        resp = client.get(f"/api/uploads/{uploads[1]}/impact")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["results_reverted"] == 2
+        assert data["results_removed"] == 1
+        assert data["seats_flipped"] == 2
+        assert [(c["constituency_name"], c["change"],
+                 c["winning_party_code_before"], c["winning_party_code_after"])
+                for c in data["constituencies"]] == [
+                    ("Bedford", "reverted", "L", "C"),
+                    ("Cambridge", "removed", "G", None),
+                ]
+        assert {(p["party_code"], p["vote_delta"], p["seat_delta"])
+                for p in data["parties"]} == {
+                    ("C", 0, 1),
+                    ("L", -100, -1),
+                    ("G", -30, -1),
+                }
+
+    def test_matches_the_delete(self, client, uploads):
+        impact = client.get(f"/api/uploads/{uploads[1]}/impact").json()
+        before = client.get("/api/totals").json()["parties"]
+        client.delete(f"/api/uploads/{uploads[1]}")
+        after = client.get("/api/totals").json()["parties"]
+
+        def _by_party(parties):
+            return {p["party_code"]: p for p in parties}
+
+        old, new = _by_party(before), _by_party(after)
+        for party in impact["parties"]:
+            code = party["party_code"]
+            gone = {"total_votes": 0, "seats": 0}
+            assert (new.get(code, gone)["total_votes"] -
+                    old[code]["total_votes"]) == party["vote_delta"]
+            assert (new.get(code, gone)["seats"] -
+                    old[code]["seats"]) == party["seat_delta"]
+
+    def test_changes_nothing(self, client, db_session, uploads):
+        client.get(f"/api/uploads/{uploads[1]}/impact")
+        db_session.expire_all()
+        assert db_session.query(Result).filter_by(
+            upload_id=uploads[1]).count() == 3
+        assert db_session.query(ResultHistory).filter_by(
+            upload_id=uploads[1]).count() == 3
+
+    def test_unchanged_values_are_not_listed(self, client, uploads):
+        resp = client.post(
+            "/api/upload",
+            files={"file": ("r.txt", io.BytesIO(self.SECOND), "text/plain")})
+        data = client.get(
+            f"/api/uploads/{resp.json()['upload_id']}/impact").json()
+        assert data["results_reverted"] == 3
+        assert data["constituencies"] == []
+        assert data["parties"] == []
+
+    def test_not_found(self, client, db_session, uploads):
+        assert client.get("/api/uploads/999/impact").status_code == 404
+        client.delete(f"/api/uploads/{uploads[0]}")
+        resp = client.get(f"/api/uploads/{uploads[0]}/impact")
+        assert resp.status_code == 404
+
+
+class TestRestoreUpload:
+    """Restoring a deleted upload re-applies it where it is still latest."""
+
+    @pytest.fixture(autouse=True)
+    def _place(self, db_session):
+        from tests.conftest import seed_constituencies  # noqa: PLC0415
+        seed_constituencies(db_session, ["TestPlace"])
+
+    def _upload(self, client, content: bytes) -> int:
+        resp = client.post(
+            "/api/upload",
+            files={"file": ("r.txt", io.BytesIO(content), "text/plain")})
+        assert resp.status_code == 201
+        return resp.json()["upload_id"]
+
+    def _result(self, db_session) -> tuple[int, int, bool]:
+        db_session.expire_all()
+        result = db_session.query(Result).filter_by(party_code="L").one()
+        return result.votes, result.upload_id, result.is_active
+
+    def test_restores_latest_upload(self, client, db_session):
+        self._upload(client, b"TestPlace,100,L")
+        uid2 = self._upload(client, b"TestPlace,200,L")
+        client.delete(f"/api/uploads/{uid2}")
+
+        resp = client.post(f"/api/uploads/{uid2}/restore")
+        assert resp.status_code == 200
+        assert resp.json() == {"message": "Upload restored"}
+        assert self._result(db_session) == (200, uid2, True)
+        history = db_session.query(ResultHistory).filter_by(
+            upload_id=uid2).one()
+        assert history.is_active is True
+        upload = db_session.get(UploadLog, uid2)
+        assert upload.deleted_at is None
+
+    def test_reactivates_result_it_created(self, client, db_session):
+        uid1 = self._upload(client, b"TestPlace,100,L")
+        client.delete(f"/api/uploads/{uid1}")
+        assert self._result(db_session)[2] is False
+
+        client.post(f"/api/uploads/{uid1}/restore")
+        assert self._result(db_session) == (100, uid1, True)
+
+    def test_later_upload_keeps_precedence(self, client, db_session):
+        self._upload(client, b"TestPlace,100,L")
+        uid2 = self._upload(client, b"TestPlace,200,L")
+        client.delete(f"/api/uploads/{uid2}")
+        uid3 = self._upload(client, b"TestPlace,300,L")
+
+        client.post(f"/api/uploads/{uid2}/restore")
+        assert self._result(db_session) == (300, uid3, True)
+        # The restored upload is back in the rollback chain
+        client.delete(f"/api/uploads/{uid3}")
+        assert self._result(db_session) == (200, uid2, True)
+
+    def test_earlier_upload_leaves_current_values(self, client, db_session):
+        uid1 = self._upload(client, b"TestPlace,100,L")
+        uid2 = self._upload(client, b"TestPlace,200,L")
+        client.delete(f"/api/uploads/{uid1}")
+
+        client.post(f"/api/uploads/{uid1}/restore")
+        assert self._result(db_session) == (200, uid2, True)
+        client.delete(f"/api/uploads/{uid2}")
+        assert self._result(db_session) == (100, uid1, True)
+
+    def test_time_travel_includes_it_again(self, client, db_session):
+        uid1 = self._upload(client, b"TestPlace,100,L")
+        uid2 = self._upload(client, b"TestPlace,200,L")
+        client.delete(f"/api/uploads/{uid1}")
+        # Taken without upload 1, so the restore must discard it
+        write_checkpoint(db_session, uid2)
+        db_session.commit()
+        client.post(f"/api/uploads/{uid1}/restore")
+
+        assert db_session.query(StateCheckpoint).count() == 0
+        totals = client.get(f"/api/totals?as_of_upload={uid1}").json()
+        assert totals["parties"][0]["total_votes"] == 100
+
+    def test_listed_while_deleted(self, client, db_session):
+        uid1 = self._upload(client, b"TestPlace,100,L")
+        client.delete(f"/api/uploads/{uid1}")
+        deleted = client.get("/api/uploads?deleted=true").json()
+        assert [u["id"] for u in deleted["uploads"]] == [uid1]
+
+        client.post(f"/api/uploads/{uid1}/restore")
+        assert client.get("/api/uploads?deleted=true").json()["total"] == 0
+        assert client.get("/api/uploads").json()["total"] == 1
+
+    def test_not_found(self, client, db_session):
+        uid1 = self._upload(client, b"TestPlace,100,L")
+        assert client.post(f"/api/uploads/{uid1}/restore").status_code == 404
+        assert client.post("/api/uploads/999/restore").status_code == 404
+        resp = client.post(f"/api/uploads/{uid1}/restore/stream")
+        assert resp.status_code == 404
+
+    def test_stream_endpoint(self, client, db_session):
+        uid1 = self._upload(client, b"TestPlace,100,L")
+        client.delete(f"/api/uploads/{uid1}")
+
+        resp = client.post(f"/api/uploads/{uid1}/restore/stream")
+        assert resp.status_code == 200
+        assert "text/event-stream" in resp.headers["content-type"]
+        assert "event: complete" in resp.text
+        assert self._result(db_session) == (100, uid1, True)
+
+
+class TestBatchDelete:
+    """Deleting several uploads at once matches deleting them one by one."""
+
+    CONTENTS = (
+        b"PlaceA,100,L\n",
+        b"PlaceA,200,L\nPlaceB,50,C\n",
+        b"PlaceA,300,L\n",
+        b"PlaceA,400,L\n",
+    )
+
+    @pytest.fixture
+    def uploads(self, client, db_session):
+        from tests.conftest import seed_constituencies  # noqa: PLC0415
+        seed_constituencies(db_session, ["PlaceA", "PlaceB"])
+        ids = []
+        for content in self.CONTENTS:
+            resp = client.post(
+                "/api/upload",
+                files={"file": ("r.txt", io.BytesIO(content), "text/plain")})
+            ids.append(resp.json()["upload_id"])
+        return ids
+
+    def _state(self, db_session) -> dict:
+        db_session.expire_all()
+        return {
+            r.party_code: (r.votes, r.upload_id, r.is_active)
+            for r in db_session.query(Result)
+        }
+
+    @pytest.mark.parametrize("picked, survivor", [
+        ((1, 3), 2),
+        ((2, 3, 1), 0),
+        ((0, 1, 2, 3), None),
+        ((0, ), 3),
+    ])
+    @pytest.mark.parametrize("batch", [True, False])
+    def test_matches_sequential_deletes(self, client, db_session, uploads,
+                                        picked, survivor, batch):
+        ids = [uploads[i] for i in picked]
+        if batch:
+            resp = client.post("/api/uploads/batch-delete",
+                               json={"upload_ids": ids})
+            assert resp.status_code == 200
+            assert resp.json()["upload_ids"] == sorted(ids)
+        else:
+            for upload_id in ids:
+                client.delete(f"/api/uploads/{upload_id}")
+        state = self._state(db_session)
+        if survivor is None:
+            assert state["L"][2] is False
+        else:
+            votes = int(self.CONTENTS[survivor].split(b",")[1])
+            assert state["L"] == (votes, uploads[survivor], True)
+        assert state["C"][2] is (1 not in picked)
+
+    def test_bumps_version_once(self, client, db_session, uploads):
+        before = get_results_version(db_session)
+        client.post("/api/uploads/batch-delete",
+                    json={"upload_ids": uploads[1:]})
+        db_session.expire_all()
+        assert get_results_version(db_session) == before + 1
+
+    def test_all_or_nothing(self, client, db_session, uploads):
+        client.delete(f"/api/uploads/{uploads[0]}")
+        for ids in ([uploads[1], 999], [uploads[1], uploads[0]]):
+            resp = client.post("/api/uploads/batch-delete",
+                               json={"upload_ids": ids})
+            assert resp.status_code == 404
+            resp = client.post("/api/uploads/batch-delete/stream",
+                               json={"upload_ids": ids})
+            assert resp.status_code == 404
+        assert self._state(db_session)["L"] == (400, uploads[3], True)
+        assert client.get("/api/uploads").json()["total"] == 3
+
+    def test_rejects_empty_list(self, client, uploads):
+        resp = client.post("/api/uploads/batch-delete",
+                           json={"upload_ids": []})
+        assert resp.status_code == 422
+
+    def test_deleted_uploads_can_be_restored(self, client, db_session,
+                                             uploads):
+        client.post("/api/uploads/batch-delete",
+                    json={"upload_ids": uploads[2:]})
+        client.post(f"/api/uploads/{uploads[3]}/restore")
+        assert self._state(db_session)["L"] == (400, uploads[3], True)
+
+    def test_stream_endpoint(self, client, db_session, uploads):
+        resp = client.post("/api/uploads/batch-delete/stream",
+                           json={"upload_ids": uploads[1:]})
+        assert resp.status_code == 200
+        assert "text/event-stream" in resp.headers["content-type"]
+        assert "event: complete" in resp.text
+        assert self._state(db_session)["L"] == (100, uploads[0], True)
+
+
 class TestUploadFilters:
     """GET /api/uploads with status and search filters."""
 
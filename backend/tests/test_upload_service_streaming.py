@@ -1,10 +1,14 @@
-"""Unit tests for soft_delete_upload_streaming() generator."""
+"""Unit tests for the streaming delete, batch delete and restore generators."""
 
 from app.models.constituency import Constituency
 from app.models.result import Result
 from app.models.result_history import ResultHistory
 from app.models.upload_log import UploadLog
-from app.services.upload_service import soft_delete_upload_streaming
+from app.services.upload_service import (
+    restore_upload_streaming,
+    soft_delete_upload_streaming,
+    soft_delete_uploads_streaming,
+)
 
 
 def _create_upload(db,
@@ -132,21 +136,21 @@ class TestSoftDeleteUploadStreaming:
         assert upload.deleted_at is not None
 
     def test_results_rolled_back(self, db_session):
-        """Result with no prior history is deleted after streaming delete."""
+        """Result with no prior history is deactivated by streaming delete."""
         upload = _create_upload(db_session)
         result = _seed_with_results(db_session, upload)
         result_id = result.id
         list(soft_delete_upload_streaming(db_session, upload.id))
         remaining = db_session.query(Result).filter_by(id=result_id).first()
-        assert remaining is None
+        assert remaining.is_active is False
 
-    def test_history_cleaned_up(self, db_session):
+    def test_history_kept_inactive(self, db_session):
         upload = _create_upload(db_session)
         _seed_with_results(db_session, upload)
         list(soft_delete_upload_streaming(db_session, upload.id))
         history = db_session.query(ResultHistory).filter_by(
             upload_id=upload.id).all()
-        assert len(history) == 0
+        assert [h.is_active for h in history] == [False]
 
     def test_rollback_to_previous_upload(self, db_session):
         """With two uploads, deleting the second restores first's values."""
@@ -180,3 +184,96 @@ class TestSoftDeleteUploadStreaming:
         assert result is not None
         assert result.votes == 100
         assert result.upload_id == upload1.id
+
+
+class TestRestoreUploadStreaming:
+    """Test the streaming restore generator yields correct SSE events."""
+
+    def _deleted_upload(self, db, places=("PlaceA", "PlaceB", "PlaceC")):
+        upload = _create_upload(db)
+        for votes, place in enumerate(places, start=1):
+            _seed_with_results(db, upload, place, "L", votes * 100)
+        list(soft_delete_upload_streaming(db, upload.id))
+        return upload
+
+    def test_event_sequence_per_batch(self, db_session):
+        upload = self._deleted_upload(db_session)
+        events = list(
+            restore_upload_streaming(db_session, upload.id, batch_size=2))
+        assert [e["event"] for e in events
+                ] == ["started", "progress", "progress", "complete"]
+        assert events[0]["total_affected"] == 3
+        assert [e["processed"] for e in events[1:3]] == [2, 3]
+        assert [e["percentage"] for e in events[1:3]] == [66, 100]
+        assert events[-1]["restored"] == 3
+
+    def test_results_reapplied(self, db_session):
+        upload = self._deleted_upload(db_session)
+        list(restore_upload_streaming(db_session, upload.id))
+        db_session.expire_all()
+        results = db_session.query(Result).order_by(Result.votes).all()
+        assert [(r.votes, r.upload_id, r.is_active)
+                for r in results] == [(100, upload.id, True),
+                                      (200, upload.id, True),
+                                      (300, upload.id, True)]
+        assert upload.deleted_at is None
+
+    def test_skips_results_written_since(self, db_session):
+        upload = self._deleted_upload(db_session, ("PlaceA", ))
+        later = _create_upload(db_session, filename="later.txt")
+        result = db_session.query(Result).one()
+        result.votes, result.upload_id, result.is_active = 500, later.id, True
+        db_session.add(
+            ResultHistory(result_id=result.id, upload_id=later.id, votes=500))
+        db_session.commit()
+
+        events = list(restore_upload_streaming(db_session, upload.id))
+        assert events[-1]["restored"] == 0
+        db_session.expire_all()
+        assert db_session.query(Result).one().votes == 500
+
+    def test_returns_none_unless_deleted(self, db_session):
+        upload = _create_upload(db_session)
+        assert restore_upload_streaming(db_session, upload.id) is None
+        assert restore_upload_streaming(db_session, 99999) is None
+
+
+class TestBatchDeleteStreaming:
+    """Test the streaming batch delete generator yields correct SSE events."""
+
+    def _uploads(self, db):
+        first, second = _create_upload(db), _create_upload(db)
+        for place in ("PlaceA", "PlaceB", "PlaceC"):
+            _seed_with_results(db, first, place, "L", 100)
+        _seed_with_results(db, second, "PlaceD", "C", 200)
+        return first, second
+
+    def test_event_sequence_per_batch(self, db_session):
+        first, second = self._uploads(db_session)
+        events = list(
+            soft_delete_uploads_streaming(db_session, [second.id, first.id],
+                                          batch_size=3))
+        assert [e["event"] for e in events
+                ] == ["started", "progress", "progress", "complete"]
+        assert events[0]["upload_ids"] == [first.id, second.id]
+        assert events[0]["total_affected"] == 4
+        assert [e["percentage"] for e in events[1:3]] == [75, 100]
+        assert events[-1]["rolled_back"] == 4
+
+    def test_commits_once_at_the_end(self, db_session):
+        first, second = self._uploads(db_session)
+        gen = soft_delete_uploads_streaming(db_session, [first.id, second.id],
+                                            batch_size=1)
+        next(gen)
+        next(gen)
+        # Abandoning the stream mid-way leaves nothing deleted
+        gen.close()
+        db_session.rollback()
+        assert db_session.query(UploadLog).filter(
+            UploadLog.deleted_at.is_not(None)).count() == 0
+        assert db_session.query(Result).filter_by(is_active=True).count() == 4
+
+    def test_returns_none_unless_all_live(self, db_session):
+        first, _ = self._uploads(db_session)
+        assert soft_delete_uploads_streaming(db_session,
+                                             [first.id, 99999]) is None
@@ -0,0 +1,40 @@
+"""Unit tests for version_service module."""
+import io
+
+from app.services.version_service import (
+    bump_results_version,
+    get_results_version,
+)
+from tests.conftest import seed_constituencies
+
+
+class TestResultsVersion:
+
+    def test_starts_at_zero(self, db_session):
+        assert get_results_version(db_session) == 0
+
+    def test_bump_increments(self, db_session):
+        assert bump_results_version(db_session) == 1
+        assert bump_results_version(db_session) == 2
+        db_session.commit()
+        assert get_results_version(db_session) == 2
+
+    def test_bump_discarded_on_rollback(self, db_session):
+        bump_results_version(db_session)
+        db_session.commit()
+        bump_results_version(db_session)
+        db_session.rollback()
+        assert get_results_version(db_session) == 1
+
+    def test_upload_and_delete_bump_version(self, client, db_session):
+        seed_constituencies(db_session, ["Bedford"])
+        resp = client.post("/api/upload",
+                           files={
+                               "file": ("a.txt", io.BytesIO(b"Bedford,10,C"),
+                                        "text/plain")
+                           })
+        assert get_results_version(db_session) == 1
+
+        client.delete(f"/api/uploads/{resp.json()['upload_id']}")
+        db_session.expire_all()
+        assert get_results_version(db_session) == 2
@@ -6,12 +6,12 @@ import type { Topology } from "topojson-specification";
 import { geoMercator, geoPath } from "d3-geo";
 import type { FeatureCollection, Feature, Geometry } from "geojson";
 import { useConstituenciesSummary } from "@/hooks/use-constituencies-summary";
+import { resolveAssetUrl } from "@/lib/assets";
 import { getConstituencyColor } from "@/lib/map-utils";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Skeleton } from "@/components/ui/skeleton";
 
-const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
-const TOPOJSON_URL = `${API_BASE}/static/uk-constituencies.topojson`;
+const TOPOJSON_ASSET = "uk-constituencies.topojson";
 
 const MINI_MAP_SIZE = 300;
 
@@ -30,7 +30,8 @@ export function ConstituencyMiniMap({
   const [topology, setTopology] = useState<Topology | null>(null);
 
   useEffect(() => {
-    fetch(TOPOJSON_URL)
+    resolveAssetUrl(TOPOJSON_ASSET)
+      .then((url) => fetch(url))
       .then((res) => res.json())
       .then(setTopology)
       .catch(() => {});
@@ -10,9 +10,11 @@ import {
   SheetTitle,
   SheetTrigger,
 } from "@/components/ui/sheet";
+import { useLiveUpdates } from "@/hooks/use-live-updates";
 
 export function AppShell({ children }: { children: React.ReactNode }) {
   const [open, setOpen] = useState(false);
+  useLiveUpdates();
 
   return (
     <div className="flex h-screen overflow-hidden">
@@ -7,6 +7,8 @@ import type { Topology } from "topojson-specification";
 import { geoMercator, geoPath } from "d3-geo";
 import type { FeatureCollection, Feature, Geometry } from "geojson";
 import { useConstituenciesSummary } from "@/hooks/use-constituencies-summary";
+import { regionTopologyUrl } from "@/lib/api";
+import { resolveAssetUrl } from "@/lib/assets";
 import { useMapViewport } from "@/hooks/use-map-viewport";
 import {
   buildConstituencyLookup,
@@ -20,8 +22,7 @@ import { MapTooltip } from "./map-tooltip";
 import { MapLegend } from "./map-legend";
 import { MapControls } from "./map-controls";
 
-const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
-const TOPOJSON_URL = `${API_BASE}/static/uk-constituencies.topojson`;
+const TOPOJSON_ASSET = "uk-constituencies.topojson";
 
 interface TooltipState {
   x: number;
@@ -64,15 +65,30 @@ export function ConstituencyMap({
     baseHeight: MAP_HEIGHT,
   });
 
+  // A single region only needs its own slice of the national map
+  const singleRegionId =
+    selectedRegionIds?.length === 1 ? selectedRegionIds[0] : null;
+
   useEffect(() => {
-    fetch(TOPOJSON_URL)
+    let cancelled = false;
+    const topologyUrl =
+      singleRegionId !== null
+        ? Promise.resolve(regionTopologyUrl(singleRegionId))
+        : resolveAssetUrl(TOPOJSON_ASSET);
+    topologyUrl
+      .then((url) => fetch(url))
       .then((res) => {
         if (!res.ok) throw new Error(`HTTP ${res.status}`);
         return res.json();
       })
-      .then(setTopology)
+      .then((data) => {
+        if (!cancelled) setTopology(data);
+      })
       .catch((err) => console.error("Failed to load TopoJSON:", err));
-  }, []);
+    return () => {
+      cancelled = true;
+    };
+  }, [singleRegionId]);
 
   const geojson = useMemo<FeatureCollection | null>(() => {
     if (!topology) return null;
@@ -0,0 +1,35 @@
+"use client";
+
+import { useEffect } from "react";
+import { useSWRConfig } from "swr";
+import { LIVE_URL } from "@/lib/api";
+import type { LiveResultsEvent } from "@/lib/types";
+
+export function useLiveUpdates() {
+  const { mutate } = useSWRConfig();
+
+  useEffect(() => {
+    if (typeof EventSource === "undefined") return;
+
+    const source = new EventSource(LIVE_URL);
+
+    const onResults = (e: MessageEvent) => {
+      const data: LiveResultsEvent = JSON.parse(e.data);
+      mutate("totals", data.totals, { revalidate: false });
+      mutate((key) => key !== "totals", undefined, { revalidate: true });
+    };
+
+    const onResync = () => {
+      mutate(() => true, undefined, { revalidate: true });
+    };
+
+    source.addEventListener("results", onResults);
+    source.addEventListener("resync", onResync);
+
+    return () => {
+      source.removeEventListener("results", onResults);
+      source.removeEventListener("resync", onResync);
+      source.close();
+    };
+  }, [mutate]);
+}
@@ -5,16 +5,33 @@ import type {
   ConstituencyResponse,
   ConstituencySummaryListResponse,
   UploadResponse,
+  UploadLogEntry,
+  UploadDiffResponse,
   UploadListResponse,
   UploadStatsResponse,
   RegionListResponse,
   RegionDetail,
+  RegionResultsResponse,
+  AssetManifestResponse,
   SSEEvent,
   DeleteSSEEvent,
+  BatchDeleteSSEEvent,
+  RestoreSSEEvent,
 } from "./types";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
+export const LIVE_URL = `${API_BASE}/api/live`;
+
+export const exportResultsUrl = (
+  format: "csv" | "ndjson",
+  sinceVersion?: number,
+) => {
+  const qs =
+    sinceVersion === undefined ? "" : `?since_version=${sinceVersion}`;
+  return `${API_BASE}/api/export/results.${format}${qs}`;
+};
+
 export const fetchTotals = () =>
   apiFetch<TotalResultsResponse>("/api/totals");
 
@@ -44,15 +61,40 @@ export const fetchUploads = (params?: {
   page_size?: number;
   status?: string;
   search?: string;
+  deleted?: boolean;
 }) => {
   const qs = new URLSearchParams();
   if (params?.page) qs.set("page", String(params.page));
   if (params?.page_size) qs.set("page_size", String(params.page_size));
   if (params?.status) qs.set("status", params.status);
   if (params?.search) qs.set("search", params.search);
+  if (params?.deleted) qs.set("deleted", "true");
   return apiFetch<UploadListResponse>(`/api/uploads?${qs}`);
 };
 
+export const fetchUpload = (id: number) =>
+  apiFetch<UploadLogEntry>(`/api/uploads/${id}`);
+
+// Always asks for NDJSON, which large diffs are sent as anyway
+export const fetchUploadDiff = async (
+  from: number,
+  to: number,
+): Promise<UploadDiffResponse> => {
+  const res = await fetch(
+    `${API_BASE}/api/uploads/diff?from=${from}&to=${to}`,
+    { headers: { Accept: "application/x-ndjson" } },
+  );
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({ detail: res.statusText }));
+    throw new Error(body.detail || "Diff failed");
+  }
+  const [summary, ...constituencies] = (await res.text())
+    .split("\n")
+    .filter((line) => line.trim())
+    .map((line) => JSON.parse(line));
+  return { ...summary, constituencies };
+};
+
 export const deleteUpload = async (id: number): Promise<void> => {
   const res = await fetch(`${API_BASE}/api/uploads/${id}`, {
     method: "DELETE",
@@ -63,6 +105,16 @@ export const deleteUpload = async (id: number): Promise<void> => {
   }
 };
 
+export const restoreUpload = async (id: number): Promise<void> => {
+  const res = await fetch(`${API_BASE}/api/uploads/${id}/restore`, {
+    method: "POST",
+  });
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({ detail: res.statusText }));
+    throw new Error(body.detail || "Restore failed");
+  }
+};
+
 export const fetchUploadStats = () =>
   apiFetch<UploadStatsResponse>("/api/uploads/stats");
 
@@ -92,9 +144,20 @@ export const fetchHealth = () =>
 export const fetchRegions = () =>
   apiFetch<RegionListResponse>("/api/geography/regions");
 
+export const fetchRegionResults = () =>
+  apiFetch<RegionResultsResponse>("/api/geography/regions/results");
+
 export const fetchRegionDetail = (id: number) =>
   apiFetch<RegionDetail>(`/api/geography/regions/${id}`);
 
+export const regionTopologyUrl = (
+  id: number,
+  resolution: "low" | "medium" | "high" = "medium",
+) => `${API_BASE}/api/geography/regions/${id}/topojson?resolution=${resolution}`;
+
+export const fetchAssetManifest = () =>
+  apiFetch<AssetManifestResponse>("/api/assets/manifest");
+
 export async function parseSSEStream<T>(
   response: Response,
   onEvent: (event: T) => void,
@@ -158,3 +221,37 @@ export async function deleteUploadStream(
 
   await parseSSEStream<DeleteSSEEvent>(res, onEvent);
 }
+
+export async function batchDeleteUploadsStream(
+  ids: number[],
+  onEvent: (event: BatchDeleteSSEEvent) => void,
+): Promise<void> {
+  const res = await fetch(`${API_BASE}/api/uploads/batch-delete/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ upload_ids: ids }),
+  });
+
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({ detail: res.statusText }));
+    throw new Error(body.detail || "Delete failed");
+  }
+
+  await parseSSEStream<BatchDeleteSSEEvent>(res, onEvent);
+}
+
+export async function restoreUploadStream(
+  id: number,
+  onEvent: (event: RestoreSSEEvent) => void,
+): Promise<void> {
+  const res = await fetch(`${API_BASE}/api/uploads/${id}/restore/stream`, {
+    method: "POST",
+  });
+
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({ detail: res.statusText }));
+    throw new Error(body.detail || "Restore failed");
+  }
+
+  await parseSSEStream<RestoreSSEEvent>(res, onEvent);
+}
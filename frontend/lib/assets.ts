@@ -0,0 +1,27 @@
+import { fetchAssetManifest } from "./api";
+
+const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+
+let manifestPromise: Promise<Record<string, string>> | null = null;
+
+/**
+ * Absolute URL of a static asset. Uses the fingerprinted, immutably
+ * cached URL from the backend manifest, falling back to the plain
+ * /static path when the manifest is unavailable.
+ */
+export async function resolveAssetUrl(name: string): Promise<string> {
+  if (!manifestPromise) {
+    manifestPromise = fetchAssetManifest()
+      .then((res) => res.assets)
+      .catch(() => {
+        manifestPromise = null;
+        return {};
+      });
+  }
+  const assets = await manifestPromise;
+  return `${API_BASE}${assets[name] ?? `/static/${name}`}`;
+}
+
+export function resetAssetManifest() {
+  manifestPromise = null;
+}
@@ -18,7 +18,8 @@ export const PARTY_NAMES: Record<string, string> = {
   Ind: "Independent",
 };
 
-export const POLLING_INTERVAL_MS = 30_000;
+// Fallback only: result changes are pushed over /api/live
+export const POLLING_INTERVAL_MS = 120_000;
 export const UPLOAD_POLLING_INTERVAL_MS = 10_000;
 
 export const DEFAULT_PAGE_SIZE = 20;
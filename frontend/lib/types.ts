@@ -57,6 +57,15 @@ export interface RegionListResponse {
   regions: RegionSummary[];
 }
 
+export interface RegionResults extends RegionSummary {
+  total_votes: number;
+  parties: PartyTotals[];
+}
+
+export interface RegionResultsResponse {
+  regions: RegionResults[];
+}
+
 export interface RegionConstituency {
   id: number;
   name: string;
@@ -96,6 +105,48 @@ export interface UploadLogEntry {
   started_at: string;
   completed_at: string | null;
   deleted_at: string | null;
+  impact: UploadImpactSummary | null;
+}
+
+export interface PartyChangeSummary {
+  party_code: string;
+  party_name: string;
+  vote_delta: number;
+  seats_gained: number;
+  seats_lost: number;
+}
+
+export interface UploadImpactSummary {
+  constituencies_touched: number;
+  constituencies_changed: number;
+  results_changed: number;
+  seats_flipped: number;
+  parties: PartyChangeSummary[];
+}
+
+export interface PartyVoteChange {
+  party_code: string;
+  votes_before: number | null;
+  votes_after: number | null;
+  vote_delta: number;
+}
+
+export interface ConstituencyDiff {
+  constituency_id: number;
+  constituency_name: string;
+  winning_party_code_before: string | null;
+  winning_party_code_after: string | null;
+  parties: PartyVoteChange[];
+}
+
+export interface UploadDiffResponse {
+  from_upload_id: number;
+  to_upload_id: number;
+  constituencies_changed: number;
+  results_changed: number;
+  seats_flipped: number;
+  parties: PartyChangeSummary[];
+  constituencies: ConstituencyDiff[];
 }
 
 export interface UploadListResponse {
@@ -190,8 +241,64 @@ export type DeleteSSEEvent =
   | DeleteSSECompleteEvent
   | DeleteSSEErrorEvent;
 
+export interface RestoreSSECompleteEvent {
+  event: "complete";
+  upload_id: number;
+  message: string;
+  restored: number;
+}
+
+export type RestoreSSEEvent =
+  | DeleteSSEStartedEvent
+  | DeleteSSEProgressEvent
+  | RestoreSSECompleteEvent
+  | DeleteSSEErrorEvent;
+
+export interface BatchDeleteSSEStartedEvent {
+  event: "started";
+  upload_ids: number[];
+  total_affected: number;
+}
+
+export interface BatchDeleteSSECompleteEvent {
+  event: "complete";
+  upload_ids: number[];
+  message: string;
+  rolled_back: number;
+}
+
+export interface BatchDeleteSSEErrorEvent {
+  event: "error";
+  upload_ids: number[];
+  detail: string;
+}
+
+export type BatchDeleteSSEEvent =
+  | BatchDeleteSSEStartedEvent
+  | DeleteSSEProgressEvent
+  | BatchDeleteSSECompleteEvent
+  | BatchDeleteSSEErrorEvent;
+
 export interface DeleteProgress {
   stage: "deleting" | "rolling_back" | "complete" | "error";
   percentage: number;
   uploadId?: number;
 }
+
+export interface LiveConstituencyChange {
+  id: number;
+  pcon24_code: string;
+  winning_party_code: string | null;
+  total_votes: number;
+}
+
+export interface LiveResultsEvent {
+  version: number;
+  since: number;
+  constituencies: LiveConstituencyChange[];
+  totals: TotalResultsResponse;
+}
+
+export interface AssetManifestResponse {
+  assets: Record<string, string>;
+}
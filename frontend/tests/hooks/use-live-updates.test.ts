@@ -0,0 +1,101 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+import { renderHook } from "@testing-library/react";
+
+const mockMutate = vi.fn();
+
+vi.mock("@/lib/api", () => ({
+  LIVE_URL: "http://test/api/live",
+}));
+
+vi.mock("swr", async () => {
+  const actual = await vi.importActual("swr");
+  return {
+    ...actual,
+    useSWRConfig: () => ({ mutate: mockMutate }),
+  };
+});
+
+import { useLiveUpdates } from "@/hooks/use-live-updates";
+
+class MockEventSource {
+  static instances: MockEventSource[] = [];
+  listeners: Record<string, (e: MessageEvent) => void> = {};
+  closed = false;
+
+  constructor(public url: string) {
+    MockEventSource.instances.push(this);
+  }
+
+  addEventListener(type: string, listener: (e: MessageEvent) => void) {
+    this.listeners[type] = listener;
+  }
+
+  removeEventListener(type: string) {
+    delete this.listeners[type];
+  }
+
+  close() {
+    this.closed = true;
+  }
+
+  emit(type: string, data: unknown) {
+    this.listeners[type]?.(
+      new MessageEvent(type, { data: JSON.stringify(data) }),
+    );
+  }
+}
+
+beforeEach(() => {
+  vi.clearAllMocks();
+  MockEventSource.instances = [];
+  vi.stubGlobal("EventSource", MockEventSource);
+});
+
+afterEach(() => {
+  vi.unstubAllGlobals();
+});
+
+describe("useLiveUpdates", () => {
+  it("connects to the live endpoint", () => {
+    renderHook(() => useLiveUpdates());
+    expect(MockEventSource.instances).toHaveLength(1);
+    expect(MockEventSource.instances[0].url).toBe("http://test/api/live");
+  });
+
+  it("applies pushed totals and revalidates other keys", () => {
+    renderHook(() => useLiveUpdates());
+    const totals = { total_constituencies: 650, total_votes: 10, parties: [] };
+
+    MockEventSource.instances[0].emit("results", {
+      version: 2,
+      since: 1,
+      constituencies: [],
+      totals,
+    });
+
+    expect(mockMutate).toHaveBeenCalledWith("totals", totals, {
+      revalidate: false,
+    });
+    const [matcher] = mockMutate.mock.calls[1];
+    expect(matcher("totals")).toBe(false);
+    expect(matcher("constituencies-summary")).toBe(true);
+  });
+
+  it("revalidates everything on resync", () => {
+    renderHook(() => useLiveUpdates());
+
+    MockEventSource.instances[0].emit("resync", { version: 5 });
+
+    expect(mockMutate).toHaveBeenCalledWith(
+      expect.any(Function),
+      undefined,
+      { revalidate: true },
+    );
+  });
+
+  it("closes the connection on unmount", () => {
+    const { unmount } = renderHook(() => useLiveUpdates());
+    unmount();
+    expect(MockEventSource.instances[0].closed).toBe(true);
+  });
+});
@@ -20,6 +20,8 @@ import {
   fetchHealth,
   fetchRegions,
   fetchRegionDetail,
+  fetchRegionResults,
+  regionTopologyUrl,
 } from "@/lib/api";
 import { apiFetch } from "@/lib/api-client";
 
@@ -180,3 +182,25 @@ describe("fetchRegionDetail", () => {
     expect(mockApiFetch).toHaveBeenCalledWith("/api/geography/regions/3");
   });
 });
+
+describe("fetchRegionResults", () => {
+  it("calls correct endpoint", async () => {
+    mockApiFetch.mockResolvedValue({ regions: [] });
+    await fetchRegionResults();
+    expect(mockApiFetch).toHaveBeenCalledWith(
+      "/api/geography/regions/results",
+    );
+  });
+});
+
+describe("regionTopologyUrl", () => {
+  it("defaults to medium resolution", () => {
+    expect(regionTopologyUrl(3)).toBe(
+      "http://localhost:8000/api/geography/regions/3/topojson?resolution=medium",
+    );
+  });
+
+  it("passes the requested resolution", () => {
+    expect(regionTopologyUrl(3, "low")).toMatch(/resolution=low$/);
+  });
+});
@@ -0,0 +1,51 @@
+import { describe, it, expect, vi, beforeEach } from "vitest";
+
+vi.mock("@/lib/api", () => ({
+  fetchAssetManifest: vi.fn(),
+}));
+
+import { resolveAssetUrl, resetAssetManifest } from "@/lib/assets";
+import { fetchAssetManifest } from "@/lib/api";
+
+const mockFetchManifest = vi.mocked(fetchAssetManifest);
+
+beforeEach(() => {
+  vi.clearAllMocks();
+  resetAssetManifest();
+});
+
+describe("resolveAssetUrl", () => {
+  it("returns the fingerprinted URL from the manifest", async () => {
+    mockFetchManifest.mockResolvedValue({
+      assets: { "map.topojson": "/assets/map.0123456789ab.topojson" },
+    });
+    const url = await resolveAssetUrl("map.topojson");
+    expect(url).toBe("http://localhost:8000/assets/map.0123456789ab.topojson");
+  });
+
+  it("fetches the manifest once", async () => {
+    mockFetchManifest.mockResolvedValue({ assets: {} });
+    await resolveAssetUrl("a.json");
+    await resolveAssetUrl("b.json");
+    expect(mockFetchManifest).toHaveBeenCalledTimes(1);
+  });
+
+  it("falls back to /static for unknown assets", async () => {
+    mockFetchManifest.mockResolvedValue({ assets: {} });
+    const url = await resolveAssetUrl("map.topojson");
+    expect(url).toBe("http://localhost:8000/static/map.topojson");
+  });
+
+  it("falls back to /static and retries when the manifest fails", async () => {
+    mockFetchManifest.mockRejectedValueOnce(new Error("offline"));
+    expect(await resolveAssetUrl("map.topojson")).toBe(
+      "http://localhost:8000/static/map.topojson",
+    );
+    mockFetchManifest.mockResolvedValue({
+      assets: { "map.topojson": "/assets/map.abc.topojson" },
+    });
+    expect(await resolveAssetUrl("map.topojson")).toBe(
+      "http://localhost:8000/assets/map.abc.topojson",
+    );
+  });
+});